@@ -1,4 +1,12 @@
 from .config import *
+from .engine_pool import *   # Shared engine registry with connection pooling
+from .bulk_load import *   # COPY-based bulk loading
 from .Backup import *
 from .get_data_from_Database import *   # Alle Funktionen/Variablen aus get_data_from_Database.py
 from .load_data_from_Database import *   # Alle Funktionen/Variablen aus load_data_from_Database.py
+from .parquet_cache import *   # Local Parquet cache for time range queries
+from .query_builder import *   # Parameterized time range queries
+from .downsample import *   # Time-bucket downsampling in SQL
+from .schema import *   # Table declarations, indexes and partitions
+from .ingestion_manifest import *   # Tracks loaded files for incremental ingestion
+from .parallel_ingest import *   # Parallel parsing and writing of many files
@@ -0,0 +1,92 @@
+import time
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from engine_pool import begin
+from bulk_load import copy_dataframe, quote_identifier
+from schema import SCHEMA, create_table, create_indexes, ensure_partitions
+
+# ======================== Configuration ========================
+SECTION = 'postgresql'
+START = pd.Timestamp('2025-03-03')
+DAYS = 7
+ROWS_PER_SECOND = 5           # 5 Hz -> about 3 million rows per week
+QUERY_COUNT = 20              # Random range queries per table
+QUERY_WINDOW = pd.Timedelta(hours=1)
+
+PLAIN_TABLE = 'Energy Benchmark Plain'      # Layout as created by to_sql: no index, no partitions
+SCHEMA_TABLE = 'Energy Benchmark Schema'    # Layout of "Energy" from schema.py
+
+# ======================== Helper Functions ========================
+def generate_energy_week():
+    """Synthetic energy measurements for one week."""
+    periods = DAYS * 24 * 3600 * ROWS_PER_SECOND
+    rng = np.random.default_rng(42)
+    return pd.DataFrame({
+        'Timestamp': pd.date_range(START, periods=periods, freq=pd.Timedelta(seconds=1 / ROWS_PER_SECOND)),
+        'Power (W)': rng.normal(5000, 800, periods),
+        'Current (A)': rng.normal(12, 2, periods),
+        'Voltage (V)': rng.normal(400, 3, periods),
+    })
+
+def time_range_queries(table_name, windows):
+    """Runs one aggregate range query per window and returns the latencies in ms."""
+    statement = text(
+        f'SELECT COUNT(*), AVG("Power (W)") FROM {quote_identifier(table_name)} '
+        f'WHERE "Timestamp" >= :range_start AND "Timestamp" < :range_end'
+    )
+    latencies = []
+    with begin(SECTION) as connection:
+        for window_start in windows:
+            start = time.perf_counter()
+            connection.execute(statement, {
+                'range_start': window_start.to_pydatetime(),
+                'range_end': (window_start + QUERY_WINDOW).to_pydatetime(),
+            }).one()
+            latencies.append((time.perf_counter() - start) * 1000)
+    return np.array(latencies)
+
+# ======================== Main Function ========================
+def main():
+    print(f"[BENCH] Generating {DAYS} days at {ROWS_PER_SECOND} Hz ...")
+    df = generate_energy_week()
+    print(f"[BENCH] {len(df):,} rows")
+
+    with begin(SECTION) as connection:
+        for table_name in (PLAIN_TABLE, SCHEMA_TABLE):
+            connection.execute(text(f"DROP TABLE IF EXISTS {quote_identifier(table_name)} CASCADE"))
+
+        print(f"[BENCH] Loading '{PLAIN_TABLE}' ...")
+        copy_dataframe(df, PLAIN_TABLE, connection)
+
+        print(f"[BENCH] Loading '{SCHEMA_TABLE}' ...")
+        create_table(connection, SCHEMA_TABLE, SCHEMA['Energy'])
+        ensure_partitions(connection, SCHEMA_TABLE, df['Timestamp'].min(), df['Timestamp'].max())
+        copy_dataframe(df, SCHEMA_TABLE, connection)
+        create_indexes(connection, SCHEMA_TABLE, SCHEMA['Energy'])
+
+        for table_name in (PLAIN_TABLE, SCHEMA_TABLE):
+            connection.execute(text(f"ANALYZE {quote_identifier(table_name)}"))
+
+    rng = np.random.default_rng(7)
+    offsets = rng.uniform(0, (pd.Timedelta(days=DAYS) - QUERY_WINDOW).total_seconds(), QUERY_COUNT)
+    windows = [START + pd.Timedelta(seconds=int(offset)) for offset in offsets]
+
+    results = {}
+    for table_name in (PLAIN_TABLE, SCHEMA_TABLE):
+        time_range_queries(table_name, windows[:2])  # Warm-up
+        results[table_name] = time_range_queries(table_name, windows)
+
+    print(f"\n[BENCH] {QUERY_COUNT} range queries over {QUERY_WINDOW} windows:")
+    for table_name, latencies in results.items():
+        print(f"  {table_name:<28} median {np.median(latencies):8.2f} ms | p95 {np.percentile(latencies, 95):8.2f} ms")
+    speedup = np.median(results[PLAIN_TABLE]) / np.median(results[SCHEMA_TABLE])
+    print(f"  Speed-up (median): {speedup:.1f}x")
+
+    with begin(SECTION) as connection:
+        for table_name in (PLAIN_TABLE, SCHEMA_TABLE):
+            connection.execute(text(f"DROP TABLE IF EXISTS {quote_identifier(table_name)} CASCADE"))
+
+# ======================== Execution ========================
+if __name__ == "__main__":
+    main()
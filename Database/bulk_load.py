@@ -0,0 +1,140 @@
+import io
+import inspect
+import numpy as np
+import pandas as pd
+
+# ======================== Configuration ========================
+DEFAULT_CHUNK_SIZE = 100000  # Rows per COPY statement / INSERT batch
+
+# PostgreSQL binary COPY header: signature, flags field, header extension length
+PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + np.array([0, 0], dtype=">i4").tobytes()
+PGCOPY_TRAILER = np.array([-1], dtype=">i2").tobytes()
+
+# Microseconds between the Unix epoch and the PostgreSQL epoch (2000-01-01)
+PG_EPOCH_OFFSET_US = 946684800 * 1000000
+
+# pandas dtype -> big-endian binary representation of the column type created by to_sql
+BINARY_TYPES = {
+    "float64": ">f8",   # DOUBLE PRECISION
+    "float32": ">f4",   # REAL
+    "int64": ">i8",     # BIGINT
+    "int32": ">i4",     # INTEGER
+    "int16": ">i2",     # SMALLINT
+    "bool": "u1",       # BOOLEAN
+}
+
+# ======================== Exceptions ========================
+class CopyNotSupported(Exception):
+    """Raised if the connection cannot stream data via COPY FROM STDIN."""
+
+# ======================== Helper Functions ========================
+def quote_identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+def _copy_statement(table_name, columns, fmt):
+    column_list = ", ".join(quote_identifier(col) for col in columns)
+    return f"COPY {quote_identifier(table_name)} ({column_list}) FROM STDIN WITH (FORMAT {fmt})"
+
+def _get_copy_function(connection):
+    """
+    Returns a function copy(sql, stream) for the DBAPI driver behind the
+    SQLAlchemy connection (pg8000: execute(..., stream=...), psycopg2: copy_expert).
+    """
+    if connection.dialect.name != "postgresql":
+        raise CopyNotSupported(f"COPY is not available for dialect '{connection.dialect.name}'")
+
+    cursor = connection.connection.cursor()
+
+    if hasattr(cursor, "copy_expert"):
+        return lambda sql, stream: cursor.copy_expert(sql, stream)
+
+    try:
+        supports_stream = "stream" in inspect.signature(cursor.execute).parameters
+    except (TypeError, ValueError):
+        supports_stream = False
+
+    if supports_stream:
+        return lambda sql, stream: cursor.execute(sql, stream=stream)
+
+    raise CopyNotSupported(f"Driver '{connection.dialect.driver}' does not support COPY FROM STDIN")
+
+def _binary_dtype(df):
+    """Returns the structured NumPy dtype for one binary COPY tuple, or None if a column is not supported."""
+    fields = [("field_count", ">i2")]
+    for i, col in enumerate(df.columns):
+        dtype = df[col].dtype
+        if pd.api.types.is_datetime64_dtype(dtype):
+            fmt = ">i8"  # TIMESTAMP WITHOUT TIME ZONE, microseconds since 2000-01-01
+        elif str(dtype) in BINARY_TYPES:
+            fmt = BINARY_TYPES[str(dtype)]
+        else:
+            return None
+        fields.append((f"len_{i}", ">i4"))
+        fields.append((f"val_{i}", fmt))
+    return np.dtype(fields)
+
+def _encode_binary_chunk(chunk, dtype):
+    """Encodes a DataFrame chunk without NULLs as PostgreSQL binary COPY data."""
+    records = np.empty(len(chunk), dtype=dtype)
+    records["field_count"] = len(chunk.columns)
+
+    for i, col in enumerate(chunk.columns):
+        values = chunk[col].to_numpy()
+        if np.issubdtype(values.dtype, np.datetime64):
+            values = values.astype("datetime64[us]").astype(np.int64) - PG_EPOCH_OFFSET_US
+        records[f"len_{i}"] = dtype[f"val_{i}"].itemsize
+        records[f"val_{i}"] = values
+
+    return PGCOPY_HEADER + records.tobytes() + PGCOPY_TRAILER
+
+def _encode_csv_chunk(chunk):
+    buffer = io.StringIO()
+    chunk.to_csv(buffer, index=False, header=False, na_rep="")
+    return buffer.getvalue()
+
+# ======================== Public Functions ========================
+def copy_dataframe(df, table_name, connection, fmt="csv", chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Streams the DataFrame into <table_name> via COPY FROM STDIN in chunks of
+    chunk_size rows. The table is created with the to_sql types if it does not exist.
+
+    fmt='binary' is used for chunks with only numeric/bool/datetime columns and
+    no NULLs (the column types of the table must match the pandas dtypes);
+    all other chunks are sent as CSV.
+
+    :return: Number of inserted rows.
+    :raises CopyNotSupported: if the connection cannot use COPY.
+    """
+    copy = _get_copy_function(connection)
+
+    # Creates the table if necessary, does nothing otherwise
+    df.head(0).to_sql(table_name, con=connection, index=False, if_exists="append")
+
+    binary_dtype = _binary_dtype(df) if fmt == "binary" else None
+    csv_statement = _copy_statement(table_name, df.columns, "csv")
+    binary_statement = _copy_statement(table_name, df.columns, "binary")
+
+    rows = 0
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+
+        if binary_dtype is not None and not chunk.isna().any().any():
+            copy(binary_statement, io.BytesIO(_encode_binary_chunk(chunk, binary_dtype)))
+        else:
+            copy(csv_statement, io.StringIO(_encode_csv_chunk(chunk)))
+
+        rows += len(chunk)
+
+    return rows
+
+def insert_dataframe_batched(df, table_name, connection, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Fallback without COPY: inserts the DataFrame with multi-row INSERT
+    statements in batches of chunk_size rows.
+
+    :return: Number of inserted rows.
+    """
+    # Keep the number of bind parameters per statement below the PostgreSQL limit (65535)
+    batch_size = max(1, min(chunk_size, 65535 // max(1, len(df.columns))))
+    df.to_sql(table_name, con=connection, index=False, if_exists="append", chunksize=batch_size, method="multi")
+    return len(df)
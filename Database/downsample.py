@@ -0,0 +1,103 @@
+import pandas as pd
+from sqlalchemy import text
+from get_data_from_Database import read_from_database
+from bulk_load import quote_identifier
+from query_builder import build_conditions, bind_expanding, TIME_COLUMN
+
+# ======================== Configuration ========================
+DEFAULT_TARGET_POINTS = 2000
+DEFAULT_AGGREGATES = ('min', 'max', 'mean', 'last')
+BUCKET_ORIGIN = pd.Timestamp('2000-01-01')  # Fixed origin so buckets line up across queries
+
+# ======================== Helper Functions ========================
+def _aggregate_expression(column, aggregate, time_column):
+    col = quote_identifier(column)
+    if aggregate == 'min':
+        return f"MIN({col})"
+    if aggregate == 'max':
+        return f"MAX({col})"
+    if aggregate == 'mean':
+        return f"AVG({col})"
+    if aggregate == 'first':
+        return f"(ARRAY_AGG({col} ORDER BY {quote_identifier(time_column)} ASC))[1]"
+    if aggregate == 'last':
+        return f"(ARRAY_AGG({col} ORDER BY {quote_identifier(time_column)} DESC))[1]"
+    raise ValueError(f"Unsupported aggregate '{aggregate}'")
+
+def _bucket_expression(time_column, use_date_bin):
+    col = quote_identifier(time_column)
+    seconds = "CAST(:bucket_seconds AS DOUBLE PRECISION)"
+    origin = "CAST(:bucket_origin AS TIMESTAMP)"
+    if use_date_bin:
+        # PostgreSQL 14+
+        return f"DATE_BIN(MAKE_INTERVAL(secs => {seconds}), {col}, {origin})"
+    # Equivalent for older PostgreSQL versions
+    return (
+        f"({origin} + MAKE_INTERVAL(secs => FLOOR(EXTRACT(EPOCH FROM ({col} - {origin})) / {seconds}) * {seconds}))"
+    )
+
+def _time_bounds(table, start, end, filters, time_column, section):
+    """Looks up the first/last timestamp of the selection if start or end is open."""
+    conditions, params, expanding = build_conditions(start, end, filters, 'both', time_column)
+    col = quote_identifier(time_column)
+    query = f"SELECT MIN({col}) AS range_start, MAX({col}) AS range_end FROM {quote_identifier(table)}"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+
+    bounds = read_from_database(bind_expanding(text(query), expanding), section=section, params=params)
+    if bounds is None or bounds.empty or pd.isna(bounds.loc[0, 'range_start']):
+        return None, None
+    return pd.Timestamp(bounds.loc[0, 'range_start']), pd.Timestamp(bounds.loc[0, 'range_end'])
+
+# ======================== Public Functions ========================
+def bucket_seconds_for(start, end, target_points=DEFAULT_TARGET_POINTS):
+    """Bucket width in seconds so that [start, end] is covered by about target_points buckets."""
+    span = (pd.Timestamp(end) - pd.Timestamp(start)).total_seconds()
+    return max(span / max(target_points, 1), 0.001)
+
+def read_downsampled(table, columns, start=None, end=None, target_points=DEFAULT_TARGET_POINTS,
+                     aggregates=DEFAULT_AGGREGATES, filters=None, time_column=TIME_COLUMN,
+                     use_date_bin=True, section='postgresql'):
+    """
+    Reads a time-bucketed version of <table>, aggregated in the database.
+
+    The range [start, end] is split into about target_points equally wide
+    buckets and every column is aggregated per bucket with the given
+    aggregates ('min', 'max', 'mean', 'first', 'last'). Unlike stride
+    sampling (df.iloc[::n]), min/max keep short spikes in the reduced series.
+
+    Result columns: time_column (bucket start), 'Count' and '<column> <aggregate>'
+    for every column/aggregate, e.g. 'Power (W) max'. Returns None on errors.
+    """
+    if start is None or end is None:
+        first, last = _time_bounds(table, start, end, filters, time_column, section)
+        if first is None:
+            return pd.DataFrame(columns=[time_column, 'Count'])
+        start = first if start is None else start
+        end = last if end is None else end
+
+    conditions, params, expanding = build_conditions(start, end, filters, 'both', time_column)
+    params['bucket_seconds'] = bucket_seconds_for(start, end, target_points)
+    params['bucket_origin'] = BUCKET_ORIGIN.to_pydatetime()
+
+    select = [f"{_bucket_expression(time_column, use_date_bin)} AS {quote_identifier(time_column)}", 'COUNT(*) AS "Count"']
+    for column in columns:
+        for aggregate in aggregates:
+            select.append(f"{_aggregate_expression(column, aggregate, time_column)} AS {quote_identifier(f'{column} {aggregate}')}")
+
+    query = f"SELECT {', '.join(select)} FROM {quote_identifier(table)}"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " GROUP BY 1 ORDER BY 1"
+
+    df = read_from_database(bind_expanding(text(query), expanding), section=section, params=params)
+    if df is not None:
+        df[time_column] = pd.to_datetime(df[time_column])
+    return df
+
+# ======================== Example Call ========================
+if __name__ == "__main__":
+    energy = read_downsampled('Energy', ['Power (W)'], '2024-11-05', '2024-11-07', target_points=1000)
+
+    if energy is not None:
+        print(energy.head())
@@ -0,0 +1,143 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event
+from config.config_json import load_config
+
+# ======================== Configuration ========================
+# Default pool settings; can be overridden per config section with a
+# "pool" entry in config.json, e.g.
+#   "postgresql": {..., "pool": {"pool_size": 10, "pool_recycle": 900}}
+DEFAULT_POOL_SETTINGS = {
+    "pool_size": 5,          # Connections kept open in the pool
+    "max_overflow": 10,      # Additional connections allowed under load
+    "pool_pre_ping": True,   # Test connections before handing them out
+    "pool_recycle": 1800,    # Reconnect after n seconds (avoids stale TCP sessions)
+}
+
+# ======================== Registry State ========================
+_engines = {}
+_lock = threading.Lock()
+
+_stats = {
+    "engine_hits": 0,         # get_engine() calls served from the registry
+    "engine_misses": 0,       # get_engine() calls that had to build a new engine
+    "pool_hits": 0,           # Checkouts served by an already open connection
+    "pool_misses": 0,         # Checkouts that opened a new DBAPI connection
+    "checkouts": 0,           # Timed checkouts via connect()/begin()
+    "checkout_time_total": 0.0,
+    "checkout_time_max": 0.0,
+}
+
+# ======================== Helper Functions ========================
+def _build_connection_url(config):
+    return f"postgresql+pg8000://{config['user']}:{config['password']}@{config['host']}:{config['port']}/{config['database']}"
+
+def _register_pool_events(engine):
+    """Count new DBAPI connections vs. reused ones on every pool checkout."""
+    def on_connect(dbapi_connection, connection_record):
+        connection_record.info["fresh"] = True
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        with _lock:
+            if connection_record.info.pop("fresh", False):
+                _stats["pool_misses"] += 1
+            else:
+                _stats["pool_hits"] += 1
+
+    event.listen(engine, "connect", on_connect)
+    event.listen(engine, "checkout", on_checkout)
+
+def _record_checkout(duration):
+    with _lock:
+        _stats["checkouts"] += 1
+        _stats["checkout_time_total"] += duration
+        _stats["checkout_time_max"] = max(_stats["checkout_time_max"], duration)
+
+# ======================== Public Functions ========================
+def get_engine(section='postgresql', filename='config.json', **pool_overrides):
+    """
+    Returns the shared SQLAlchemy engine for the given config section.
+
+    The engine (and therefore its connection pool) is created once per
+    process and section and reused by all later calls. Pool settings are
+    taken from DEFAULT_POOL_SETTINGS, the optional "pool" entry of the
+    config section and finally from pool_overrides (first call only).
+    """
+    # Engines must not be shared across forked processes, so the PID is part of the key
+    key = (filename, section, os.getpid())
+
+    with _lock:
+        engine = _engines.get(key)
+        if engine is not None:
+            _stats["engine_hits"] += 1
+            return engine
+
+        config = load_config(filename=filename, section=section)
+
+        pool_settings = dict(DEFAULT_POOL_SETTINGS)
+        pool_settings.update(config.get("pool", {}))
+        pool_settings.update(pool_overrides)
+
+        engine = create_engine(_build_connection_url(config), **pool_settings)
+        _register_pool_events(engine)
+
+        _engines[key] = engine
+        _stats["engine_misses"] += 1
+        return engine
+
+@contextmanager
+def connect(section='postgresql'):
+    """Checks out a pooled connection (no transaction) and records the checkout latency."""
+    engine = get_engine(section)
+    start = time.perf_counter()
+    with engine.connect() as connection:
+        _record_checkout(time.perf_counter() - start)
+        yield connection
+
+@contextmanager
+def begin(section='postgresql'):
+    """Checks out a pooled connection inside a transaction and records the checkout latency."""
+    engine = get_engine(section)
+    start = time.perf_counter()
+    with engine.begin() as connection:
+        _record_checkout(time.perf_counter() - start)
+        yield connection
+
+def dispose_engines():
+    """Closes all pooled connections and empties the registry."""
+    with _lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+def get_pool_stats():
+    """Returns a copy of the registry and pool counters, including the mean checkout latency."""
+    with _lock:
+        stats = dict(_stats)
+    stats["checkout_time_mean"] = stats["checkout_time_total"] / stats["checkouts"] if stats["checkouts"] else 0.0
+    return stats
+
+def reset_pool_stats():
+    with _lock:
+        for name in _stats:
+            _stats[name] = 0.0 if name.startswith("checkout_time") else 0
+
+def format_pool_stats():
+    """Formats the counters as a single log line."""
+    stats = get_pool_stats()
+    return (
+        f"[POOL] engines: {stats['engine_hits']} hits / {stats['engine_misses']} misses | "
+        f"connections: {stats['pool_hits']} reused / {stats['pool_misses']} new | "
+        f"checkout: {stats['checkouts']}x, mean {stats['checkout_time_mean'] * 1000:.2f} ms, "
+        f"max {stats['checkout_time_max'] * 1000:.2f} ms"
+    )
+
+# ======================== Example Call ========================
+if __name__ == "__main__":
+    for _ in range(3):
+        with begin() as connection:
+            pass
+
+    print(format_pool_stats())
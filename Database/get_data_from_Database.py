@@ -1,33 +1,104 @@
-from sqlalchemy import create_engine
 import pandas as pd
-from config.config_json import load_config
+from engine_pool import begin
 
-def read_from_database(query):
+DEFAULT_CHUNK_SIZE = 50000  # Rows per DataFrame chunk for streaming reads
+
+def read_from_database(query, section='postgresql', params=None):
     """ 
     Reads data from the PostgreSQL table based on the provided SQL query 
     and returns it as a pandas DataFrame.
+    Optional bind parameters can be passed via params.
     """
-    config = load_config()  # Assumes config contains database access credentials
-
-    # Connect to the database using SQLAlchemy and pg8000
-    connection_url = f"postgresql+pg8000://{config['user']}:{config['password']}@{config['host']}:{config['port']}/{config['database']}"
-    engine = create_engine(connection_url)
-
-    # Execute the query and load the result into a DataFrame
+    # Execute the query on a pooled connection and load the result into a DataFrame
     try:
-        with engine.begin() as connection:  # Use engine.begin() for atomic transactions
-            df = pd.read_sql(query, con=connection)
+        with begin(section) as connection:  # Use begin() for atomic transactions
+            df = pd.read_sql(query, con=connection, params=params)
             print("Data successfully retrieved from the database.")
             return df
     except Exception as e:
         print("Error while retrieving data from the database:", e)
         return None
 
+def read_from_database_chunked(query, chunk_size=DEFAULT_CHUNK_SIZE, section='postgresql'):
+    """
+    Generator variant of read_from_database: executes the query with a
+    server-side cursor and yields DataFrames of at most chunk_size rows, so
+    only one chunk is held in memory at a time.
+    """
+    with begin(section) as connection:
+        # stream_results=True opens a server-side cursor instead of fetching all rows
+        connection = connection.execution_options(stream_results=True, max_row_buffer=chunk_size)
+        for chunk in pd.read_sql(query, con=connection, chunksize=chunk_size):
+            yield chunk
+
+def reduce_chunks(chunks, reducer, initial=None, finalize=None):
+    """
+    Folds an iterable of DataFrame chunks into a single result:
+    result = reducer(result, chunk) for every chunk, starting with initial,
+    then result = finalize(result) if finalize is given.
+    """
+    result = initial
+    for chunk in chunks:
+        result = reducer(result, chunk)
+    return result if finalize is None else finalize(result)
+
+def read_from_database_reduced(query, reducer, initial=None, chunk_size=DEFAULT_CHUNK_SIZE, section='postgresql', finalize=None):
+    """
+    Streams the query result chunk by chunk and folds it with reducer
+    (see reduce_chunks). Peak memory is one chunk plus the reduced result.
+    Without finalize, the finalize attribute of the reducer is used (set by
+    the reducers below). Returns None if the query fails.
+    """
+    finalize = getattr(reducer, 'finalize', None) if finalize is None else finalize
+    try:
+        result = reduce_chunks(read_from_database_chunked(query, chunk_size, section), reducer, initial, finalize)
+        print("Data successfully retrieved from the database.")
+        return result
+    except Exception as e:
+        print("Error while retrieving data from the database:", e)
+        return None
+
+# ======================== Reducers ========================
+# The reducers keep their state in the result (None at the start of every read), so one reducer
+# can be used for many reads. Chunks are collected in a list and concatenated once by finalize.
+
+def concat_chunks(result):
+    """Finalizer of the reducers below: one DataFrame of the collected chunks, None if there were none."""
+    if result is None or not result['chunks']:
+        return None
+    return pd.concat(result['chunks'], ignore_index=True)
+
+def concat_reducer(columns=None):
+    """Reducer that concatenates all chunks, optionally keeping only the given columns."""
+    def reducer(result, chunk):
+        result = {'chunks': [], 'rows_seen': 0} if result is None else result
+        result['chunks'].append(chunk if columns is None else chunk[columns])
+        return result
+    reducer.finalize = concat_chunks
+    return reducer
+
+def stride_reducer(step):
+    """Reducer that keeps every <step>-th row of the full result, like df.iloc[::step]."""
+    def reducer(result, chunk):
+        result = {'chunks': [], 'rows_seen': 0} if result is None else result
+        first = (-result['rows_seen']) % step  # Continue the stride across chunk boundaries
+        result['rows_seen'] += len(chunk)
+        result['chunks'].append(chunk.iloc[first::step])
+        return result
+    reducer.finalize = concat_chunks
+    return reducer
+
 # Example usage
 if __name__ == "__main__":
-    query = 'SELECT * FROM "Achse" WHERE "Timestamp"::timestamp BETWEEN \'2024-11-04\' AND \'2024-11-12\';'
+    query = 'SELECT * FROM "Achse" WHERE "Timestamp" BETWEEN \'2024-11-04\' AND \'2024-11-12\';'
 
     df = read_from_database(query)
 
     if df is not None:
         print(df.head())  # Displays the first few rows of the DataFrame
+
+    # Streaming read: keep every 1000th row without loading the full table
+    energy = read_from_database_reduced('SELECT * FROM "Energy" ORDER BY "Timestamp";', stride_reducer(1000))
+
+    if energy is not None:
+        print(energy.head())
@@ -0,0 +1,244 @@
+import os
+import hashlib
+import threading
+from datetime import datetime
+from sqlalchemy import text
+from engine_pool import begin
+from bulk_load import quote_identifier
+
+# ======================== Configuration ========================
+MANIFEST_TABLE = 'Ingestion Manifest'
+HASH_BLOCK_SIZE = 1024 * 1024
+# Rewritten files are not loaded again by default: the target tables do not record the source file of a row,
+# so the rows of the previous version cannot be removed. Set to True (or pass reload_rewritten=True) after
+# deleting those rows to load the new version.
+RELOAD_REWRITTEN = False
+
+# File states returned by check_file()
+SKIP = 'skip'        # Already loaded, unchanged
+LOAD = 'load'        # New file (or rewritten with reload_rewritten), load everything
+APPEND = 'append'    # File was extended, load only rows after the previously loaded ones
+CONFLICT = 'conflict'  # File was rewritten after loading, not loaded again without reload_rewritten
+
+# ======================== State ========================
+_manifest = {}       # (section, file path, target table) -> manifest row as dict
+_loaded_sections = set()
+_lock = threading.Lock()
+
+_report = {
+    "skipped_files": 0, "skipped_bytes": 0,
+    "loaded_files": 0, "loaded_bytes": 0, "loaded_rows": 0,
+    "failed_files": 0, "conflict_files": 0,
+}
+
+# ======================== Helper Functions ========================
+def _create_manifest_table(connection):
+    connection.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {quote_identifier(MANIFEST_TABLE)} (
+            "File Path" TEXT NOT NULL,
+            "Target Table" TEXT NOT NULL,
+            "Size" BIGINT,
+            "Mtime" DOUBLE PRECISION,
+            "Hash" TEXT,
+            "Rows" BIGINT,
+            "Status" TEXT,
+            "Updated" TIMESTAMP,
+            PRIMARY KEY ("File Path", "Target Table")
+        )
+    """))
+
+def _load_manifest(section):
+    """Reads the whole manifest once per process and section."""
+    if section in _loaded_sections:
+        return
+
+    with begin(section) as connection:
+        _create_manifest_table(connection)
+        rows = connection.execute(text(f"SELECT * FROM {quote_identifier(MANIFEST_TABLE)}")).mappings().all()
+
+    with _lock:
+        for row in rows:
+            _manifest[(section, row["File Path"], row["Target Table"])] = dict(row)
+        _loaded_sections.add(section)
+
+def file_hashes(file_path, prefix_size=None, size=None):
+    """
+    SHA-256 of the file content in one pass, of only the first size bytes if
+    given (e.g. the size of a stat snapshot of a file that is still growing).
+    If prefix_size is given, the hash of the first prefix_size bytes is
+    returned as well (None otherwise).
+    """
+    full_hash = hashlib.sha256()
+    prefix_hash = None
+    read_bytes = 0
+
+    with open(file_path, 'rb') as file:
+        while True:
+            block = file.read(HASH_BLOCK_SIZE if size is None else min(HASH_BLOCK_SIZE, size - read_bytes))
+            if not block:
+                break
+            if prefix_size is not None and prefix_hash is None and read_bytes + len(block) >= prefix_size:
+                full_hash.update(block[:prefix_size - read_bytes])
+                prefix_hash = full_hash.hexdigest()
+                full_hash.update(block[prefix_size - read_bytes:])
+            else:
+                full_hash.update(block)
+            read_bytes += len(block)
+
+    if prefix_size == 0:
+        prefix_hash = hashlib.sha256().hexdigest()
+    return full_hash.hexdigest(), prefix_hash
+
+# ======================== Public Functions ========================
+def check_file(file_path, target_table, section='postgresql', reload_rewritten=None):
+    """
+    Compares a file with its manifest entry for <target_table>. A rewritten
+    file (content changed, not only extended) is reported as CONFLICT, or as
+    LOAD with reload_rewritten (None = RELOAD_REWRITTEN).
+
+    :return: (state, skip_rows, file_info) with state SKIP, LOAD, APPEND or CONFLICT.
+             skip_rows is the number of already loaded rows for APPEND,
+             file_info has to be passed to record_file() after loading.
+    """
+    _load_manifest(section)
+    file_path = os.path.abspath(file_path)
+    stat = os.stat(file_path)
+    entry = _manifest.get((section, file_path, target_table))
+
+    file_info = {"path": file_path, "size": stat.st_size, "mtime": stat.st_mtime, "hash": None}
+
+    # Fast path: size and mtime unchanged -> no need to hash the content
+    if entry is not None and entry["Status"] == 'loaded' and entry["Size"] == stat.st_size and entry["Mtime"] == stat.st_mtime:
+        return SKIP, 0, file_info
+
+    # The hash covers exactly the stat.st_size bytes recorded as Size, even if the file grows meanwhile
+    # (e.g. the alarm log); a later run then finds these bytes as prefix and appends the rest
+    loaded = entry is not None and entry["Status"] == 'loaded'
+    prefix_size = entry["Size"] if loaded and entry["Size"] is not None and entry["Size"] <= stat.st_size else None
+    full_hash, prefix_hash = file_hashes(file_path, prefix_size, size=stat.st_size)
+    file_info["hash"] = full_hash
+
+    if not loaded:
+        return LOAD, 0, file_info
+
+    if full_hash == entry["Hash"]:
+        # Only touched: remember the new mtime so the next run takes the fast path
+        record_file(file_info, target_table, entry["Rows"], section=section, count=False)
+        return SKIP, 0, file_info
+    if prefix_hash is not None and prefix_hash == entry["Hash"]:
+        return APPEND, entry["Rows"] or 0, file_info
+
+    if RELOAD_REWRITTEN if reload_rewritten is None else reload_rewritten:
+        print(f"[MANIFEST] {file_path} was rewritten, loading it again.")
+        return LOAD, 0, file_info
+
+    print(f"[MANIFEST] {file_path} was rewritten after loading {entry['Rows']} rows into '{target_table}' and is not "
+          f"loaded again. Delete the rows of the previous version and re-run with reload_rewritten=True.")
+    with _lock:
+        _report["conflict_files"] += 1
+    return CONFLICT, 0, file_info
+
+def record_file(file_info, target_table, rows, status='loaded', section='postgresql', count=True, written_rows=None):
+    """
+    Stores the result of loading a file in the manifest (upsert). rows is the
+    total number of rows loaded from the file so far, written_rows the number
+    written in this run (defaults to rows) and only used for the report.
+    file_info comes from check_file(): size, mtime and hash describe the same
+    snapshot, the file is not hashed again here.
+    """
+    row = {
+        "File Path": file_info["path"], "Target Table": target_table,
+        "Size": file_info["size"], "Mtime": file_info["mtime"], "Hash": file_info["hash"],
+        "Rows": rows, "Status": status, "Updated": datetime.now(),
+    }
+
+    columns = list(row)
+    names = {col: f"p{i}" for i, col in enumerate(columns)}
+    with begin(section) as connection:
+        connection.execute(text(
+            f"INSERT INTO {quote_identifier(MANIFEST_TABLE)} ({', '.join(quote_identifier(col) for col in columns)}) "
+            f"VALUES ({', '.join(':' + names[col] for col in columns)}) "
+            f'ON CONFLICT ("File Path", "Target Table") DO UPDATE SET '
+            + ', '.join(f"{quote_identifier(col)} = EXCLUDED.{quote_identifier(col)}" for col in columns[2:])
+        ), {names[col]: value for col, value in row.items()})
+
+    with _lock:
+        _manifest[(section, row["File Path"], target_table)] = row
+        if count and status == 'loaded':
+            _report["loaded_files"] += 1
+            _report["loaded_bytes"] += file_info["size"]
+            _report["loaded_rows"] += rows if written_rows is None else written_rows
+    if count and status != 'loaded':
+        _count_failure()
+
+def _count_failure():
+    with _lock:
+        _report["failed_files"] += 1
+
+def record_skip(file_info):
+    with _lock:
+        _report["skipped_files"] += 1
+        _report["skipped_bytes"] += file_info["size"]
+
+def ingest_file(file_path, target_table, parse_function, write_function, section='postgresql', reload_rewritten=None):
+    """
+    Loads a file only if it is new or changed since the last run:
+    parse_function(file_path) -> DataFrame, write_function(df, target_table) -> True on success.
+    For files that were only extended, the already loaded leading rows are dropped before writing.
+    Rewritten files are only loaded again with reload_rewritten (see check_file).
+
+    :return: Number of written rows (0 if skipped), None on failure or conflict.
+    """
+    state, skip_rows, file_info = check_file(file_path, target_table, section, reload_rewritten)
+    if state == CONFLICT:
+        return None
+    if state == SKIP:
+        record_skip(file_info)
+        print(f"[MANIFEST] Skipping unchanged file: {file_path}")
+        return 0
+
+    try:
+        df = parse_function(file_path)
+    except Exception as e:
+        print(f"[MANIFEST] Error parsing {file_path}: {e}")
+        record_result(file_info, state, target_table, 0, 0, False, section)
+        return None
+
+    total_rows = len(df)
+    if state == APPEND:
+        print(f"[MANIFEST] {file_path} was extended, loading rows after {skip_rows}.")
+        df = df.iloc[skip_rows:]
+
+    success = len(df) == 0 or write_function(df, target_table)
+    record_result(file_info, state, target_table, total_rows, len(df), success, section)
+    return len(df) if success else None
+
+def record_result(file_info, state, target_table, total_rows, written_rows, success, section='postgresql'):
+    """Records the outcome of writing a file that check_file() reported as LOAD or APPEND."""
+    if success:
+        record_file(file_info, target_table, total_rows, section=section, written_rows=written_rows)
+    elif state == APPEND:
+        # Keep the previous 'loaded' entry, so the next run retries only the new rows
+        _count_failure()
+    else:
+        record_file(file_info, target_table, 0, status='failed', section=section)
+
+def get_ingestion_report():
+    with _lock:
+        return dict(_report)
+
+def format_ingestion_report():
+    report = get_ingestion_report()
+    return (
+        f"[MANIFEST] loaded: {report['loaded_files']} files, {report['loaded_bytes'] / 1e6:.1f} MB, {report['loaded_rows']} rows | "
+        f"skipped: {report['skipped_files']} files, {report['skipped_bytes'] / 1e6:.1f} MB | "
+        f"failed: {report['failed_files']} files | rewritten (not loaded): {report['conflict_files']} files"
+    )
+
+# ======================== Example Call ========================
+if __name__ == "__main__":
+    import pandas as pd
+    from load_data_into_Database import write_to_database
+
+    ingest_file("./Testdaten/KW12/Achsverstellung.TXT", "Achse", lambda path: pd.read_csv(path, sep=';'), write_to_database)
+    print(format_ingestion_report())
@@ -1,22 +1,59 @@
 import os
+import time
 import pandas as pd
-from sqlalchemy import create_engine
-from config.config_json import load_config
-
-def write_to_database(df, table_name):
-    """ Write the DataFrame to the PostgreSQL table <table_name> """
-    config = load_config()
-    
-    # Connect to the database using SQLAlchemy
-    connection_url = f"postgresql+pg8000://{config['user']}:{config['password']}@{config['host']}:{config['port']}/{config['database']}"
-    engine = create_engine(connection_url)
-    
-    # Write the DataFrame to the specified table
+from engine_pool import begin
+from bulk_load import copy_dataframe, insert_dataframe_batched, CopyNotSupported, DEFAULT_CHUNK_SIZE
+from parquet_cache import invalidate
+from schema import prepare_table
+
+def write_to_database(df, table_name, section='postgresql', method='to_sql', copy_format='csv', chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Write the DataFrame to the PostgreSQL table <table_name>
+    Tables declared in schema.py are created with their indexes/partitions on first write.
+
+    method:
+        'to_sql'      - pandas to_sql with row-wise INSERTs (default)
+        'copy'        - bulk load via COPY FROM STDIN (copy_format 'csv' or 'binary'),
+                        falls back to 'executemany' if COPY is not available
+        'executemany' - multi-row INSERT batches of chunk_size rows
+
+    Returns True if the DataFrame was written, False otherwise.
+    """
+    start = time.perf_counter()
+
+    # Write the DataFrame to the specified table using a pooled connection
     try:
-        df.to_sql(table_name, con=engine, index=False, if_exists='append')
-        print(f"DataFrame successfully inserted into the table '{table_name}'.")
+        if method == 'copy':
+            try:
+                with begin(section) as connection:
+                    prepare_table(connection, table_name, df)
+                    copy_dataframe(df, table_name, connection, fmt=copy_format, chunk_size=chunk_size)
+            except CopyNotSupported as e:
+                print(f"COPY not available ({e}), falling back to batched INSERTs.")
+                method = 'executemany'
+
+        if method == 'executemany':
+            with begin(section) as connection:
+                prepare_table(connection, table_name, df)
+                insert_dataframe_batched(df, table_name, connection, chunk_size=chunk_size)
+        elif method == 'to_sql':
+            with begin(section) as connection:
+                prepare_table(connection, table_name, df)
+                df.to_sql(table_name, con=connection, index=False, if_exists='append')
+        elif method != 'copy':
+            raise ValueError(f"Unknown write method '{method}'")
+
+        duration = time.perf_counter() - start
+        rows_per_sec = len(df) / duration if duration > 0 else float('inf')
+        print(f"DataFrame successfully inserted into the table '{table_name}' "
+              f"({len(df)} rows via {method}, {rows_per_sec:,.0f} rows/s).")
+
+        # Cached partitions of the written days are outdated now
+        invalidate(table_name, df)
+        return True
     except Exception as e:
         print("Error while inserting the DataFrame:", e)
+        return False
 
 
 if __name__ == "__main__":
@@ -0,0 +1,193 @@
+import os
+import time
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from load_data_into_Database import write_to_database
+from ingestion_manifest import check_file, record_result, record_skip, SKIP, LOAD, APPEND, CONFLICT
+
+# ======================== Configuration ========================
+DEFAULT_PARSE_WORKERS = max((os.cpu_count() or 2) - 1, 1)
+DEFAULT_WRITE_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 4     # Parsed DataFrames waiting for a writer, bounds the memory use
+
+_STOP = object()           # Tells a writer thread to finish
+
+# ======================== Helper Functions ========================
+def _parse_results(jobs, parse_function, parse_workers):
+    """
+    Yields (job, df, error) for every job. With parse_workers > 0 the files are
+    parsed in a process pool; a new file is only submitted after the caller
+    took the previous result, so a slow consumer throttles the parsing.
+    """
+    if parse_workers == 0:
+        for job in jobs:
+            try:
+                yield job, parse_function(job["path"]), None
+            except Exception as e:
+                yield job, None, e
+        return
+
+    jobs = iter(jobs)
+    with ProcessPoolExecutor(max_workers=parse_workers) as pool:
+        pending = {}
+
+        def submit_next():
+            job = next(jobs, None)
+            if job is not None:
+                pending[pool.submit(parse_function, job["path"])] = job
+
+        for _ in range(parse_workers):
+            submit_next()
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = pending.pop(future)
+                try:
+                    yield job, future.result(), None
+                except Exception as e:
+                    yield job, None, e
+                submit_next()
+
+def format_ingestion_stats(stats):
+    seconds = max(stats["seconds"], 1e-9)
+    return (
+        f"[INGEST] {stats['files']} files, {stats['rows']} rows, {stats['bytes'] / 1e6:.1f} MB in {stats['seconds']:.1f} s "
+        f"({stats['files'] / seconds:.2f} files/s, {stats['rows'] / seconds:,.0f} rows/s) | "
+        f"skipped: {stats['skipped_files']} | failed: {stats['failed_files']} | rewritten (not loaded): {stats.get('conflict_files', 0)}"
+    )
+
+# ======================== Main Function ========================
+def ingest_files(file_paths, target_table, parse_function, write_function=write_to_database,
+                 parse_workers=DEFAULT_PARSE_WORKERS, write_workers=DEFAULT_WRITE_WORKERS,
+                 queue_size=DEFAULT_QUEUE_SIZE, use_manifest=True, section='postgresql', reload_rewritten=None):
+    """
+    Loads many files into <target_table> in parallel.
+
+    Files are parsed with parse_function(file_path) -> DataFrame in a pool of
+    parse_workers processes (0 = parse in this process). The parsed frames go
+    through a queue of queue_size entries to write_workers threads, which call
+    write_function(df, target_table) -> True on success. If the writers fall
+    behind, the queue fills up and no further files are parsed until there is
+    room again. A file that fails to parse or write is reported and does not
+    stop the other files.
+
+    parse_function is sent to the worker processes and therefore has to be a
+    module-level function (or a functools.partial of one).
+    With use_manifest, files are checked against the ingestion manifest first
+    (see ingestion_manifest.py), so unchanged files are skipped; rewritten
+    files are only loaded again with reload_rewritten and count as conflicts.
+
+    :return: Dict with files, rows, bytes, skipped_files, failed_files, conflict_files and seconds.
+    """
+    start = time.perf_counter()
+    stats = {"files": 0, "rows": 0, "bytes": 0, "skipped_files": 0, "failed_files": 0, "conflict_files": 0, "seconds": 0.0}
+    stats_lock = threading.Lock()
+
+    jobs = []
+    for file_path in file_paths:
+        if use_manifest:
+            state, skip_rows, file_info = check_file(file_path, target_table, section, reload_rewritten)
+            if state == SKIP:
+                record_skip(file_info)
+                stats["skipped_files"] += 1
+                continue
+            if state == CONFLICT:
+                stats["conflict_files"] += 1
+                continue
+        else:
+            state, skip_rows = LOAD, 0
+            file_info = {"path": os.path.abspath(file_path), "size": os.path.getsize(file_path)}
+        jobs.append({"path": file_path, "state": state, "skip_rows": skip_rows, "file_info": file_info})
+
+    if not jobs:
+        stats["seconds"] = time.perf_counter() - start
+        return stats
+
+    parse_workers = min(parse_workers, len(jobs))
+    write_workers = max(min(write_workers, len(jobs)), 1)
+
+    # The first write may create the table (to_sql or schema.py). Until it is committed the other
+    # writers wait; afterwards write_function prepares the table (partitions) itself.
+    table_lock = threading.Lock()
+    table_created = threading.Event()
+
+    def write(job, df):
+        total_rows = len(df)
+        if job["state"] == APPEND:
+            df = df.iloc[job["skip_rows"]:]
+        if len(df) == 0:
+            return True, total_rows, 0
+
+        if not table_created.is_set():
+            with table_lock:
+                if not table_created.is_set():
+                    success = write_function(df, target_table)
+                    if success:
+                        table_created.set()
+                    return success, total_rows, len(df)
+
+        return write_function(df, target_table), total_rows, len(df)
+
+    def handle(item):
+        job, df, error = item
+        success, total_rows, written_rows = False, 0, 0
+        if error is not None:
+            print(f"[INGEST] Error parsing {job['path']}: {error}")
+        else:
+            try:
+                success, total_rows, written_rows = write(job, df)
+            except Exception as e:
+                print(f"[INGEST] Error writing {job['path']}: {e}")
+
+        if use_manifest:
+            record_result(job["file_info"], job["state"], target_table, total_rows, written_rows, success, section)
+
+        with stats_lock:
+            if success:
+                stats["files"] += 1
+                stats["rows"] += written_rows
+                stats["bytes"] += job["file_info"]["size"]
+            else:
+                stats["failed_files"] += 1
+
+    def writer():
+        # A writer never dies before _STOP: otherwise the producer would block on the full queue forever
+        while True:
+            item = parsed.get()
+            if item is _STOP:
+                return
+            try:
+                handle(item)
+            except Exception as e:
+                print(f"[INGEST] Error recording {item[0]['path']}: {e}")
+                with stats_lock:
+                    stats["failed_files"] += 1
+
+    parsed = queue.Queue(maxsize=queue_size)
+    writers = [threading.Thread(target=writer, daemon=True) for _ in range(write_workers)]
+    for thread in writers:
+        thread.start()
+
+    try:
+        for item in _parse_results(jobs, parse_function, parse_workers):
+            parsed.put(item)  # Blocks while the queue is full (back-pressure)
+    finally:
+        for _ in writers:
+            parsed.put(_STOP)
+        for thread in writers:
+            thread.join()
+
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+# ======================== Example Call ========================
+if __name__ == "__main__":
+    import pandas as pd
+
+    folder = './Testdaten/KW12/EEnergy/'
+    files = [os.path.join(folder, name) for name in sorted(os.listdir(folder)) if name.endswith('.csv')]
+
+    stats = ingest_files(files, 'Energy Test', pd.read_csv)
+    print(format_ingestion_stats(stats))
@@ -0,0 +1,126 @@
+import os
+import json
+import shutil
+import hashlib
+import pandas as pd
+from query_builder import read_time_range, INCLUSIVE
+
+# ======================== Configuration ========================
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+TIME_COLUMN = 'Timestamp'
+PARTITION_FREQ = 'D'  # One Parquet file per table, column set and day
+
+# ======================== Helper Functions ========================
+def _table_dir(table_name, cache_dir):
+    safe_name = str(table_name).replace(os.sep, '_').replace('/', '_')
+    return os.path.join(cache_dir, safe_name)
+
+def _column_set_key(columns, filters, section):
+    """Short, stable key for the database section, the cached column set and server-side filters."""
+    key = json.dumps({'section': section, 'columns': sorted(columns) if columns else None, 'filters': filters}, default=str)
+    return hashlib.md5(key.encode('utf-8')).hexdigest()[:12]
+
+def _partition_path(set_dir, day):
+    return os.path.join(set_dir, f"{day.strftime('%Y-%m-%d')}.parquet")
+
+def _partition_days(start, end):
+    """All day partitions that overlap the half-open range [start, end)."""
+    first = start.floor(PARTITION_FREQ)
+    last = (end - pd.Timedelta(1, 'ns')).floor(PARTITION_FREQ)
+    return list(pd.date_range(first, last, freq=PARTITION_FREQ))
+
+def _contiguous_ranges(days):
+    """Groups sorted partition days into contiguous [start, end) ranges."""
+    ranges = []
+    for day in days:
+        if ranges and ranges[-1][1] == day:
+            ranges[-1][1] = day + pd.Timedelta(1, PARTITION_FREQ)
+        else:
+            ranges.append([day, day + pd.Timedelta(1, PARTITION_FREQ)])
+    return ranges
+
+def _write_partition(path, df):
+    """Writes a partition atomically so that readers never see half-written files."""
+    tmp_path = path + '.tmp'
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+# ======================== Public Functions ========================
+def read_cached(table_name, start, end, columns=None, filters=None, time_column=TIME_COLUMN,
+                section='postgresql', cache_dir=CACHE_DIR, inclusive='left'):
+    """
+    Read-through cache for time range queries: returns all rows of <table_name>
+    with start <= time_column < end (bounds as in query_builder, e.g.
+    inclusive='neither' for start < time_column < end).
+
+    Results are stored as one Parquet file per day, keyed by table, database
+    section, column set and optional server-side filters (see
+    query_builder.build_query). Only days
+    that are not cached yet are loaded from the database, in one query per
+    contiguous block of missing days. Returns None if a database read fails.
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    if columns is not None and time_column not in columns:
+        columns = [time_column] + list(columns)
+
+    start_op, end_op = INCLUSIVE[inclusive]
+    set_dir = os.path.join(_table_dir(table_name, cache_dir), _column_set_key(columns, filters, section))
+    os.makedirs(set_dir, exist_ok=True)
+
+    # An inclusive end needs the partition of the end itself
+    days = _partition_days(start, end + pd.Timedelta(1, 'ns') if end_op == '<=' else end)
+    missing = [day for day in days if not os.path.exists(_partition_path(set_dir, day))]
+
+    for range_start, range_end in _contiguous_ranges(missing):
+        print(f"[CACHE] Loading {table_name} {range_start:%Y-%m-%d} - {range_end:%Y-%m-%d} from the database ...")
+        df = read_time_range(
+            table_name, start=range_start, end=range_end, columns=columns, filters=filters,
+            time_column=time_column, section=section
+        )
+        if df is None:
+            return None
+
+        partition_keys = df[time_column].dt.floor(PARTITION_FREQ)
+        for day in pd.date_range(range_start, range_end, freq=PARTITION_FREQ, inclusive='left'):
+            # Empty days are stored as well, so they are not queried again
+            _write_partition(_partition_path(set_dir, day), df[partition_keys == day])
+
+    frames = [pd.read_parquet(_partition_path(set_dir, day)) for day in days]
+    result = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+    if result.empty:
+        return result
+
+    after_start = result[time_column] >= start if start_op == '>=' else result[time_column] > start
+    before_end = result[time_column] <= end if end_op == '<=' else result[time_column] < end
+    result = result[after_start & before_end].reset_index(drop=True)
+    return result[columns] if columns else result
+
+def invalidate(table_name, df=None, time_column=TIME_COLUMN, cache_dir=CACHE_DIR):
+    """
+    Removes cached partitions of <table_name> for all column sets. If df is
+    given, only the days covered by its time_column are removed; otherwise
+    the whole table cache is cleared.
+    """
+    table_dir = _table_dir(table_name, cache_dir)
+    if not os.path.isdir(table_dir):
+        return
+
+    if df is None or time_column not in df.columns:
+        shutil.rmtree(table_dir, ignore_errors=True)
+        return
+
+    days = pd.to_datetime(df[time_column], errors='coerce').dropna().dt.floor(PARTITION_FREQ).unique()
+    for set_name in os.listdir(table_dir):
+        for day in days:
+            path = _partition_path(os.path.join(table_dir, set_name), pd.Timestamp(day))
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Not cached or removed by a concurrent writer
+
+# ======================== Example Call ========================
+if __name__ == "__main__":
+    energy = read_cached('Energy', '2025-02-24', '2025-03-12', columns=['Power (W)', 'Current (A)'])
+
+    if energy is not None:
+        print(energy.head())
@@ -0,0 +1,131 @@
+import pandas as pd
+from sqlalchemy import text, bindparam
+from get_data_from_Database import read_from_database
+from bulk_load import quote_identifier
+
+# ======================== Configuration ========================
+TIME_COLUMN = 'Timestamp'
+OPERATORS = ('=', '!=', '<>', '<', '<=', '>', '>=', 'IN', 'NOT IN')
+
+# pandas-style range bounds -> (start operator, end operator)
+INCLUSIVE = {
+    'both': ('>=', '<='),
+    'neither': ('>', '<'),
+    'left': ('>=', '<'),
+    'right': ('>', '<='),
+}
+
+# ======================== Helper Functions ========================
+def _normalize_filters(filters):
+    """
+    Accepts filters as dict {column: value} (lists/tuples become IN) or as a
+    list of (column, operator, value) tuples and returns the tuple form.
+    """
+    if not filters:
+        return []
+    if isinstance(filters, dict):
+        return [(col, 'IN' if isinstance(value, (list, tuple, set)) else '=', value) for col, value in filters.items()]
+    return list(filters)
+
+# ======================== Public Functions ========================
+def build_conditions(start=None, end=None, filters=None, inclusive='left', time_column=TIME_COLUMN):
+    """
+    Builds the WHERE conditions for a time range and filters. Like the pandas
+    comparisons they replace, '!='/'<>' and 'NOT IN' keep rows where the
+    column is NULL (IS DISTINCT FROM / IS NULL OR ... NOT IN).
+
+    :return: (list of SQL conditions, params dict, names of expanding IN parameters)
+    """
+    conditions = []
+    params = {}
+    expanding = []
+
+    start_op, end_op = INCLUSIVE[inclusive]
+    if start is not None:
+        conditions.append(f"{quote_identifier(time_column)} {start_op} :range_start")
+        params['range_start'] = pd.Timestamp(start).to_pydatetime()
+    if end is not None:
+        conditions.append(f"{quote_identifier(time_column)} {end_op} :range_end")
+        params['range_end'] = pd.Timestamp(end).to_pydatetime()
+
+    for i, (col, op, value) in enumerate(_normalize_filters(filters)):
+        op = op.upper()
+        if op not in OPERATORS:
+            raise ValueError(f"Unsupported filter operator '{op}'")
+        name = f"filter_{i}"
+        if op in ('!=', '<>'):
+            conditions.append(f"{quote_identifier(col)} IS DISTINCT FROM :{name}")
+        elif op == 'NOT IN':
+            conditions.append(f"({quote_identifier(col)} IS NULL OR {quote_identifier(col)} NOT IN :{name})")
+        else:
+            conditions.append(f"{quote_identifier(col)} {op} :{name}")
+        if op in ('IN', 'NOT IN'):
+            params[name] = list(value)
+            expanding.append(name)  # Expanded to one bind parameter per value
+        else:
+            params[name] = value
+
+    return conditions, params, expanding
+
+def bind_expanding(statement, expanding):
+    """Marks IN parameters as expanding so that lists are bound as one parameter per value."""
+    if expanding:
+        statement = statement.bindparams(*[bindparam(name, expanding=True) for name in expanding])
+    return statement
+
+def build_query(table, start=None, end=None, columns=None, filters=None, order='asc', limit=None,
+                distinct=False, inclusive='left', time_column=TIME_COLUMN):
+    """
+    Builds a parameterized SELECT for a time range of <table>.
+
+    :param start, end: Range limits for time_column (None = open), bounds as in pandas ('left' = start <= t < end).
+    :param columns: Projected columns (None = all). time_column is always included.
+    :param filters: {column: value} or [(column, operator, value)], evaluated in the database.
+    :param order: 'asc', 'desc' or None for the time_column ordering.
+    :param limit: Maximum number of rows.
+    :return: (sqlalchemy TextClause, params dict)
+    """
+    if columns:
+        columns = list(columns) if time_column in columns else [time_column] + list(columns)
+        select = ', '.join(quote_identifier(col) for col in columns)
+    else:
+        select = '*'
+
+    conditions, params, expanding = build_conditions(start, end, filters, inclusive, time_column)
+
+    query = f"SELECT {'DISTINCT ' if distinct else ''}{select} FROM {quote_identifier(table)}"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    if order:
+        query += f" ORDER BY {quote_identifier(time_column)} {'DESC' if order.lower() == 'desc' else 'ASC'}"
+    if limit is not None:
+        query += f" LIMIT {int(limit)}"
+
+    return bind_expanding(text(query), expanding), params
+
+def read_time_range(table, start=None, end=None, columns=None, filters=None, order='asc', limit=None,
+                    distinct=False, inclusive='left', time_column=TIME_COLUMN, parse_dates=None, section='postgresql'):
+    """
+    Reads a time range of <table> with column projection and server-side
+    filters (see build_query). time_column and the columns in parse_dates
+    are returned as datetime64 columns. Returns None if the query fails.
+    """
+    statement, params = build_query(table, start, end, columns, filters, order, limit, distinct, inclusive, time_column)
+    df = read_from_database(statement, section=section, params=params)
+
+    if df is not None:
+        for col in [time_column] + list(parse_dates or []):
+            if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = pd.to_datetime(df[col], errors='coerce')
+    return df
+
+# ======================== Example Call ========================
+if __name__ == "__main__":
+    axis = read_time_range(
+        'Achse', start='2024-11-28',
+        columns=['Neue Achseneinstellung'],
+        filters={'TD': '3211', 'Achse': 'X'}
+    )
+
+    if axis is not None:
+        print(axis.head())
@@ -0,0 +1,314 @@
+import re
+import argparse
+import pandas as pd
+from sqlalchemy import text
+from engine_pool import begin
+from bulk_load import quote_identifier
+
+# ======================== Configuration ========================
+TIMESTAMP = 'TIMESTAMP'
+DOUBLE = 'DOUBLE PRECISION'
+TEXT = 'TEXT'
+
+KEYENCE_TOOL_IDS = [200, 202, 203, 204, 205, 206, 208, 209]
+
+# Declared tables. Only known columns are declared; other columns of the
+# written DataFrames (e.g. the anonymised temperature channels) are added
+# with the type derived from their dtype when the table is created.
+#   partition: 'month' = monthly range partitions on time_column
+#   indexes:   (method, [columns]) with method 'btree' or 'brin'
+SCHEMA = {
+    'Energy': {
+        'columns': {'Timestamp': TIMESTAMP, 'Power (W)': DOUBLE, 'Current (A)': DOUBLE, 'Voltage (V)': DOUBLE},
+        'partition': 'month',
+        'indexes': [('brin', ['Timestamp'])],
+    },
+    'Temperatur Lang': {
+        'columns': {'Timestamp': TIMESTAMP},
+        'partition': 'month',
+        'indexes': [('brin', ['Timestamp'])],
+    },
+    'Keyence': {
+        'columns': dict(
+            [('Timestamp', TIMESTAMP), ('Measurement Start Time', TEXT)]
+            + [(f'Measurement ToolID.{tool_id}', DOUBLE) for tool_id in KEYENCE_TOOL_IDS]
+        ),
+        'indexes': [('btree', ['Timestamp'])],
+    },
+    'Achse': {
+        'columns': {
+            'Timestamp': TIMESTAMP, 'TD': TEXT, 'Achse': TEXT,
+            'Ursprüngliche Achseneinstellung': TEXT, 'Neue Achseneinstellung': TEXT,
+        },
+        'indexes': [('btree', ['Timestamp']), ('btree', ['TD', 'Achse', 'Timestamp'])],
+    },
+    'Alarm': {
+        'columns': {'Timestamp': TIMESTAMP, 'Timestamp End': TIMESTAMP, 'Error Code': TEXT, 'NCU Message': TEXT},
+        'indexes': [('btree', ['Timestamp']), ('btree', ['Error Code', 'Timestamp'])],
+    },
+    'Produktionszeiten': {
+        'columns': {'Timestamp': TIMESTAMP},
+        'indexes': [('btree', ['Timestamp'])],
+    },
+}
+
+TIME_COLUMN = 'Timestamp'
+
+# Declared type -> name reported by information_schema.columns.data_type
+PG_TYPE_NAMES = {
+    TIMESTAMP: 'timestamp without time zone',
+    DOUBLE: 'double precision',
+    TEXT: 'text',
+    'BIGINT': 'bigint',
+    'BOOLEAN': 'boolean',
+}
+
+# Partitioning state of existing tables, to avoid a catalog lookup on every write
+_partitioned_tables = {}  # (database url, table) -> bool
+
+# ======================== Helper Functions ========================
+def _slug(name):
+    return re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_')
+
+def _index_name(table_name, method, columns):
+    # PostgreSQL truncates identifiers to 63 characters
+    return f"idx_{_slug(table_name)}_{'_'.join(_slug(col) for col in columns)}_{method}"[:63]
+
+def _partition_name(table_name, month):
+    return f"{table_name} {month:%Y-%m}"
+
+def _execute(connection, statement, params=None):
+    return connection.execute(text(statement), params or {})
+
+def sql_type_for(dtype):
+    """PostgreSQL column type for a pandas dtype (same mapping as to_sql)."""
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'BOOLEAN'
+    if pd.api.types.is_integer_dtype(dtype):
+        return 'BIGINT'
+    if pd.api.types.is_float_dtype(dtype):
+        return DOUBLE
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return TIMESTAMP
+    return TEXT
+
+def existing_columns(connection, table_name):
+    """Returns {column: data_type} of an existing table, empty if the table does not exist."""
+    rows = _execute(connection, """
+        SELECT column_name, data_type FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = :table_name
+        ORDER BY ordinal_position
+    """, {'table_name': table_name})
+    return {name: data_type for name, data_type in rows}
+
+def is_partitioned(connection, table_name):
+    return bool(_execute(connection, """
+        SELECT EXISTS (
+            SELECT 1 FROM pg_partitioned_table p
+            JOIN pg_class c ON c.oid = p.partrelid
+            WHERE c.relname = :table_name AND c.relnamespace = current_schema()::regnamespace
+        )
+    """, {'table_name': table_name}).scalar())
+
+def _cast_expression(column, source_type, target_type):
+    """Expression converting an existing column to the declared type ('N/A' and '' become NULL)."""
+    col = quote_identifier(column)
+    if PG_TYPE_NAMES.get(target_type, target_type.lower()) == source_type:
+        return col
+    if source_type in ('text', 'character varying'):
+        col = f"NULLIF(NULLIF(TRIM({col}), ''), 'N/A')"
+    return f"CAST({col} AS {target_type})"
+
+# ======================== Schema Functions ========================
+def create_table(connection, table_name, definition=None, extra_columns=None):
+    """
+    Creates a declared table (if it does not exist) with its DEFAULT partition.
+    extra_columns ({column: type}) are added after the declared columns.
+    """
+    definition = definition or SCHEMA[table_name]
+    columns = dict(definition['columns'])
+    for col, sql_type in (extra_columns or {}).items():
+        columns.setdefault(col, sql_type)
+
+    column_sql = ', '.join(f"{quote_identifier(col)} {sql_type}" for col, sql_type in columns.items())
+    statement = f"CREATE TABLE IF NOT EXISTS {quote_identifier(table_name)} ({column_sql})"
+    if definition.get('partition'):
+        statement += f" PARTITION BY RANGE ({quote_identifier(TIME_COLUMN)})"
+    _execute(connection, statement)
+
+    if definition.get('partition'):
+        # Catches rows outside of all monthly partitions
+        _execute(connection, f"CREATE TABLE IF NOT EXISTS {quote_identifier(table_name + ' default')} "
+                             f"PARTITION OF {quote_identifier(table_name)} DEFAULT")
+
+def create_indexes(connection, table_name, definition=None):
+    """Creates the declared B-tree/BRIN indexes (on partitioned tables they are created on every partition)."""
+    definition = definition or SCHEMA[table_name]
+    for method, columns in definition.get('indexes', []):
+        column_sql = ', '.join(quote_identifier(col) for col in columns)
+        _execute(connection, f"CREATE INDEX IF NOT EXISTS {quote_identifier(_index_name(table_name, method, columns))} "
+                             f"ON {quote_identifier(table_name)} USING {method} ({column_sql})")
+
+def rename_indexes(connection, table_name, new_table_name, definition=None):
+    """
+    Renames the declared indexes of a table that was renamed to new_table_name,
+    so their names match the new table and are free again for <table_name>
+    (CREATE INDEX IF NOT EXISTS would otherwise skip them).
+    """
+    definition = definition or SCHEMA[table_name]
+    for method, columns in definition.get('indexes', []):
+        _execute(connection, f"ALTER INDEX IF EXISTS {quote_identifier(_index_name(table_name, method, columns))} "
+                             f"RENAME TO {quote_identifier(_index_name(new_table_name, method, columns))}")
+
+def existing_partitions(connection, table_name):
+    """Names of the partitions attached to <table_name>."""
+    rows = _execute(connection, """
+        SELECT child.relname FROM pg_inherits i
+        JOIN pg_class parent ON parent.oid = i.inhparent
+        JOIN pg_class child ON child.oid = i.inhrelid
+        WHERE parent.relname = :table_name AND parent.relnamespace = current_schema()::regnamespace
+    """, {'table_name': table_name})
+    return {name for (name,) in rows}
+
+def ensure_partitions(connection, table_name, start, end):
+    """
+    Creates the monthly partitions covering [start, end] that do not exist yet.
+    Only if one is missing, a transaction-level advisory lock per table is
+    taken and the partitions are read again, so concurrent writers do not
+    create the same partition twice.
+    """
+    first_month = pd.Timestamp(start).to_period('M').to_timestamp()
+    months = pd.date_range(first_month, pd.Timestamp(end), freq='MS')
+    partitions = existing_partitions(connection, table_name)
+    if all(_partition_name(table_name, month) in partitions for month in months):
+        return
+
+    _execute(connection, "SELECT pg_advisory_xact_lock(hashtext(:table_name))", {'table_name': table_name})
+    partitions = existing_partitions(connection, table_name)
+    for month in months:
+        partition_name = _partition_name(table_name, month)
+        if partition_name in partitions:
+            continue
+
+        next_month = month + pd.DateOffset(months=1)
+        # Literal bounds: DDL statements do not accept bind parameters
+        _execute(connection, f"CREATE TABLE {quote_identifier(partition_name)} "
+                             f"PARTITION OF {quote_identifier(table_name)} "
+                             f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{next_month:%Y-%m-%d}')")
+
+def prepare_table(connection, table_name, df):
+    """
+    Called before writing df into <table_name>: creates declared tables with
+    their indexes on first use and the monthly partitions for the rows of df.
+    Tables that are not declared in SCHEMA are left to to_sql.
+    """
+    if table_name not in SCHEMA or connection.dialect.name != 'postgresql':
+        return
+
+    url = str(connection.engine.url)
+    definition = SCHEMA[table_name]
+
+    partitioned = _partitioned_tables.get((url, table_name))
+    if partitioned is None:
+        if existing_columns(connection, table_name):
+            # Tables that were not migrated yet are still plain tables without partitions
+            partitioned = is_partitioned(connection, table_name)
+            _partitioned_tables[(url, table_name)] = partitioned
+        else:
+            # Not cached: the new table only exists once this transaction commits
+            extra_columns = {col: sql_type_for(df[col].dtype) for col in df.columns}
+            create_table(connection, table_name, definition, extra_columns)
+            create_indexes(connection, table_name, definition)
+            partitioned = bool(definition.get('partition'))
+
+    if partitioned and TIME_COLUMN in df.columns:
+        timestamps = pd.to_datetime(df[TIME_COLUMN], errors='coerce').dropna()
+        if not timestamps.empty:
+            ensure_partitions(connection, table_name, timestamps.min(), timestamps.max())
+
+def migrate_table(connection, table_name, keep_old=False):
+    """
+    Converts an existing table to its declared layout:
+      - partitioned tables are rebuilt (old table renamed, data copied into monthly partitions)
+      - other tables get their declared column types via ALTER COLUMN ... TYPE
+      - declared indexes are created and the table is analyzed
+    """
+    definition = SCHEMA[table_name]
+    declared = definition['columns']
+    existing = existing_columns(connection, table_name)
+
+    if not existing:
+        print(f"[SCHEMA] {table_name}: does not exist, creating it.")
+        create_table(connection, table_name, definition)
+    elif definition.get('partition') and not is_partitioned(connection, table_name):
+        print(f"[SCHEMA] {table_name}: rebuilding as partitioned table ...")
+        old_name = f"{table_name} old"
+        _execute(connection, f"ALTER TABLE {quote_identifier(table_name)} RENAME TO {quote_identifier(old_name)}")
+        rename_indexes(connection, table_name, old_name, definition)
+
+        extra_columns = {col: data_type for col, data_type in existing.items() if col not in declared}
+        create_table(connection, table_name, definition, extra_columns)
+
+        time_cast = _cast_expression(TIME_COLUMN, existing.get(TIME_COLUMN, 'text'), TIMESTAMP)
+        bounds = _execute(connection, f"SELECT MIN({time_cast}), MAX({time_cast}) FROM {quote_identifier(old_name)}").one()
+        if bounds[0] is not None:
+            ensure_partitions(connection, table_name, bounds[0], bounds[1])
+
+        columns = list(existing)
+        target_sql = ', '.join(quote_identifier(col) for col in columns)
+        source_sql = ', '.join(
+            _cast_expression(col, existing[col], declared[col]) if col in declared else quote_identifier(col)
+            for col in columns
+        )
+        _execute(connection, f"INSERT INTO {quote_identifier(table_name)} ({target_sql}) "
+                             f"SELECT {source_sql} FROM {quote_identifier(old_name)}")
+
+        if not keep_old:
+            _execute(connection, f"DROP TABLE {quote_identifier(old_name)}")
+    else:
+        for col, sql_type in declared.items():
+            if col in existing and existing[col] != PG_TYPE_NAMES.get(sql_type, sql_type.lower()):
+                print(f"[SCHEMA] {table_name}: converting column '{col}' from {existing[col]} to {sql_type}")
+                _execute(connection, f"ALTER TABLE {quote_identifier(table_name)} ALTER COLUMN {quote_identifier(col)} "
+                                     f"TYPE {sql_type} USING {_cast_expression(col, existing[col], sql_type)}")
+
+    create_indexes(connection, table_name, definition)
+    _execute(connection, f"ANALYZE {quote_identifier(table_name)}")
+    print(f"[SCHEMA] {table_name}: done.")
+
+# ======================== Commands ========================
+def main():
+    parser = argparse.ArgumentParser(description="Create or migrate the sensor tables (types, indexes, partitions).")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    create_parser = subparsers.add_parser('create', help="Create missing tables and indexes")
+    create_parser.add_argument('tables', nargs='*', default=list(SCHEMA))
+
+    migrate_parser = subparsers.add_parser('migrate', help="Convert existing tables to the declared layout")
+    migrate_parser.add_argument('tables', nargs='*', default=list(SCHEMA))
+    migrate_parser.add_argument('--keep-old', action='store_true', help="Keep '<table> old' after rebuilding")
+
+    partition_parser = subparsers.add_parser('partitions', help="Create monthly partitions in advance")
+    partition_parser.add_argument('--start', required=True)
+    partition_parser.add_argument('--end', required=True)
+    partition_parser.add_argument('tables', nargs='*', default=[name for name, d in SCHEMA.items() if d.get('partition')])
+
+    parser.add_argument('--section', default='postgresql', help="Config section of the database")
+    args = parser.parse_args()
+
+    for table_name in args.tables:
+        # One transaction per table, so a failing migration leaves the other tables untouched
+        with begin(args.section) as connection:
+            if args.command == 'create':
+                create_table(connection, table_name)
+                create_indexes(connection, table_name)
+                print(f"[SCHEMA] {table_name}: created.")
+            elif args.command == 'migrate':
+                migrate_table(connection, table_name, keep_old=args.keep_old)
+            else:
+                ensure_partitions(connection, table_name, args.start, args.end)
+                print(f"[SCHEMA] {table_name}: partitions {args.start} - {args.end} ready.")
+
+# ======================== Execution ========================
+if __name__ == "__main__":
+    main()
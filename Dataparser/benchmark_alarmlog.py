@@ -0,0 +1,106 @@
+import os
+import time
+import tempfile
+import numpy as np
+import pandas as pd
+from insert_alarmlog import parse_alarm_log
+
+# ======================== Configuration ========================
+LINE_COUNT = 1_000_000
+START = pd.Timestamp('2022-01-01')
+STREAM_CHUNK_SIZE = 1024 * 1024  # Small chunks to check that streaming gives the same result
+
+# ======================== Reference Implementation ========================
+def parse_alarm_log_reference(file_path):
+    """Previous line-by-line parser of insert_alarmlog.py, kept as reference."""
+    with open(file_path, 'r') as file:
+        lines = file.readlines()
+
+    cleaned_data = []
+
+    for i in range(len(lines) - 1):
+        line = lines[i]
+        if "NCU_" in line:
+            try:
+                date_start = line[7:16].strip()
+                date_end = line[23:32].strip()
+                error_code = line[39:45].strip()
+                ncu_info = line[52:].strip()
+
+                time_line = lines[i + 1].strip().split()
+                time_start = time_line[0] if len(time_line) > 0 else None
+                time_end = time_line[1] if len(time_line) > 1 else None
+
+                cleaned_data.append([date_start, date_end, error_code, ncu_info, time_start, time_end])
+            except Exception as e:
+                print(f"[WARN] Line {i} could not be processed: {e}")
+
+    df = pd.DataFrame(cleaned_data, columns=["Date Start", "Date End", "Error Code", "NCU Message", "Time Start", "Time End"])
+    df = df[(df['Date Start'] != "---") & (df['Date End'] != "---")]
+    df['Timestamp'] = pd.to_datetime(df['Date Start'] + ' ' + df['Time Start'], format='%d.%m.%y %H:%M:%S.%f', errors='coerce')
+    df['Timestamp End'] = pd.to_datetime(df['Date End'] + ' ' + df['Time End'], format='%d.%m.%y %H:%M:%S.%f', errors='coerce')
+    df = df[df['Timestamp'].notna() & df['Timestamp End'].notna()]
+    df.drop(columns=['Date Start', 'Time Start', 'Date End', 'Time End'], inplace=True)
+    return df
+
+# ======================== Helper Functions ========================
+def generate_alarm_log(file_path, line_count=LINE_COUNT):
+    """
+    Writes a synthetic alarm log: pairs of alarm line + time line, mixed with
+    header/other lines, uncleared alarms ('---') and broken time lines.
+    """
+    rng = np.random.default_rng(42)
+    pairs = line_count * 9 // 20
+    other = line_count - 2 * pairs
+
+    starts = START + pd.to_timedelta(np.sort(rng.uniform(0, 3 * 365 * 86400, pairs)), unit='s')
+    ends = starts + pd.to_timedelta(rng.exponential(60, pairs), unit='s')
+    codes = rng.choice([700015, 77334, 27001, 10208, 3000], pairs)
+    tools = rng.integers(1, 250, pairs)
+    uncleared = rng.random(pairs) < 0.01
+    broken = rng.random(pairs) < 0.005
+    other_after = rng.multinomial(other, np.full(pairs, 1 / pairs))
+
+    with open(file_path, 'w') as file:
+        for i in range(pairs):
+            date_end = '---' if uncleared[i] else f"{ends[i]:%d.%m.%y}"
+            file.write(f"{'':7}{starts[i]:%d.%m.%y} {'':7}{date_end:<9}{'':7}{codes[i]:<6}{'':7}"
+                       f"NCU_1 Kanal 1 Werkzeug NR. {tools[i]} Standzeit abgelaufen\n")
+            if broken[i]:
+                file.write("       --:--:--\n")
+            else:
+                file.write(f"       {starts[i]:%H:%M:%S}.{starts[i].microsecond // 1000:03d}"
+                           f"       {ends[i]:%H:%M:%S}.{ends[i].microsecond // 1000:03d}\n")
+            for _ in range(other_after[i]):
+                file.write(f"{'':7}{starts[i]:%d.%m.%y} PLC  Meldung {codes[i]} quittiert\n")
+
+# ======================== Main Function ========================
+def main():
+    with tempfile.TemporaryDirectory() as folder:
+        file_path = os.path.join(folder, 'alarmlog.txt')
+        print(f"[BENCH] Generating {LINE_COUNT:,} lines ...")
+        generate_alarm_log(file_path)
+        print(f"[BENCH] {os.path.getsize(file_path) / 1e6:.1f} MB")
+
+        start = time.perf_counter()
+        reference = parse_alarm_log_reference(file_path)
+        reference_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        vectorized = parse_alarm_log(file_path)
+        vectorized_seconds = time.perf_counter() - start
+
+        streamed = parse_alarm_log(file_path, chunk_size=STREAM_CHUNK_SIZE)
+
+    reference = reference.reset_index(drop=True)
+    pd.testing.assert_frame_equal(vectorized, reference, check_dtype=False)
+    pd.testing.assert_frame_equal(streamed, reference, check_dtype=False)
+
+    print(f"[BENCH] {len(reference):,} alarms, results identical")
+    print(f"  Line-by-line: {reference_seconds:6.2f} s")
+    print(f"  Vectorized:   {vectorized_seconds:6.2f} s")
+    print(f"  Speed-up:     {reference_seconds / vectorized_seconds:.1f}x")
+
+# ======================== Execution ========================
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+# ======================== Configuration ========================
+DEBUG = True
+HEADER_ROWS = 3                              # Recorder numbers, timestamps, curve names
+TIMESTAMP_FORMAT = '%d.%m.%Y %H:%M:%S'
+ENCODING = 'latin-1'
+
+# ======================== Logging ========================
+def log(msg):
+    if DEBUG:
+        print(msg)
+
+# ======================== Helper Functions ========================
+def _read_header(file_path):
+    """Returns the header lines and the number of lines before the numeric block."""
+    with open(file_path, 'rb') as f:
+        lines = [f.readline() for _ in range(HEADER_ROWS + 1)]
+
+    skip = 0
+    # Skip first line if it only contains a single entry (e.g., metadata)
+    if len(lines[0].split()) == 1:
+        skip = 1
+
+    header = [line.rstrip(b'\r\n').decode(ENCODING) for line in lines[skip:skip + HEADER_ROWS]]
+    return header, skip + HEADER_ROWS
+
+def _recorder_array(values):
+    """Recorder numbers as int32 array, or as string array if they are not numeric."""
+    values = [value.strip() for value in values]
+    try:
+        return np.array(values, dtype=np.int32)
+    except ValueError:
+        return np.array(values)
+
+def _read_numeric_block(file_path, skiprows, column_count):
+    """Reads the tab-separated numeric block with decimal commas as float32 columns."""
+    options = dict(sep='\t', header=None, decimal=',', skiprows=skiprows, usecols=range(column_count),
+                   names=range(column_count), index_col=False)
+    try:
+        return pd.read_csv(file_path, dtype=np.float32, **options)
+    except ValueError:
+        # Non-numeric cells: parse as text and turn them into NaN like pd.to_numeric(errors='coerce')
+        df = pd.read_csv(file_path, dtype=str, **options)
+        return df.apply(lambda col: pd.to_numeric(col.str.replace(',', '.'), errors='coerce')).astype(np.float32)
+
+# ======================== Main Function ========================
+def parse_ctm_file(file_path, learning_curves=False):
+    """
+    Parses a tab-separated CTM export of the tool breakage monitoring.
+
+    Layout: row 0 holds the recorder numbers, row 1 the timestamps, row 2 the
+    curve names; from row 3 on, column 0 is the time axis and every further
+    column one curve (decimal commas). With learning_curves=True the columns
+    come in pairs of process and learning curve per recorder.
+
+    Returns a dict of NumPy arrays:
+        'Time':            float32 (samples,)
+        'Recorder Number': int32 (recorders,), strings if not numeric
+        'Timestamp':       datetime64[ns] (recorders,), NaT if not parsable
+        'Prozesskurve':    float32 (samples, recorders)
+        'Lernkurve':       float32 (samples, recorders), only with learning_curves=True
+    """
+    header, skiprows = _read_header(file_path)
+
+    # Trailing tabs produce empty header cells, they do not count as columns
+    header = [line.rstrip('\t ').split('\t') for line in header]
+    column_count = max(len(row) for row in header[:2])
+    values = _read_numeric_block(file_path, skiprows, column_count)
+    log(f"[INFO] {file_path}: {len(values)} samples x {column_count - 1} curves")
+
+    step = 2 if learning_curves else 1
+    curve_columns = slice(1, column_count, step)
+    recorder_numbers = (header[0] + [''] * column_count)[curve_columns]
+    timestamps = (header[1] + [''] * column_count)[curve_columns]
+
+    curves = {
+        'Time': values[0].to_numpy(dtype=np.float32),
+        'Recorder Number': _recorder_array(recorder_numbers),
+        'Timestamp': pd.to_datetime(pd.Series(timestamps, dtype=str).str.strip(), format=TIMESTAMP_FORMAT,
+                                    errors='coerce').to_numpy(dtype='datetime64[ns]'),
+        'Prozesskurve': np.ascontiguousarray(values.iloc[:, curve_columns].to_numpy(dtype=np.float32)),
+    }
+    if learning_curves:
+        learning = values.iloc[:, 2::2].to_numpy(dtype=np.float32)
+        if learning.shape[1] < curves['Prozesskurve'].shape[1]:
+            # Last recorder without learning curve column
+            learning = np.pad(learning, ((0, 0), (0, 1)), constant_values=np.nan)
+        curves['Lernkurve'] = np.ascontiguousarray(learning)
+    return curves
+
+# ======================== Example Call ========================
+if __name__ == "__main__":
+    curves = parse_ctm_file('./Beispieldaten/CTM-Data KN2 PN4 TN0 DN0 BN1.txt')
+
+    print(curves['Recorder Number'][:5], curves['Timestamp'][:5])
+    print(curves['Prozesskurve'].shape, curves['Prozesskurve'].dtype)
@@ -0,0 +1,225 @@
+import os
+import glob
+import hashlib
+import argparse
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from ctm_parser import parse_ctm_file
+
+# ======================== Configuration ========================
+DEBUG = True
+STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ctm_store')
+INDEX_FILE = 'index.parquet'
+CURVE_COLUMNS = ('Prozesskurve', 'Lernkurve')
+
+# ======================== Logging ========================
+def log(msg):
+    if DEBUG:
+        print(msg)
+
+# ======================== Helper Functions ========================
+def _store_file_name(source_path):
+    """Store file of an export: file name plus a short hash of the absolute path, so same-named exports of different folders do not overwrite each other."""
+    source_path = os.path.abspath(source_path)
+    path_hash = hashlib.sha1(source_path.encode()).hexdigest()[:10]
+    return f"{os.path.splitext(os.path.basename(source_path))[0]}_{path_hash}.arrow"
+
+def _remove_unused_files(store_dir, dropped, index):
+    """Deletes store files of replaced index entries that no entry refers to any more (e.g. names of older versions)."""
+    for file_name in set(dropped['File']) - set(index['File']):
+        path = os.path.join(store_dir, file_name)
+        if os.path.exists(path):
+            os.remove(path)
+
+def _curve_table(curves, source_path):
+    """One row per recorder; curves as fixed-size list columns, time axis as schema metadata."""
+    samples = len(curves['Time'])
+    columns = {
+        'Recorder Number': pa.array(curves['Recorder Number']),
+        'Timestamp': pa.array(curves['Timestamp']),
+    }
+    for name in CURVE_COLUMNS:
+        if name in curves:
+            values = pa.array(np.ascontiguousarray(curves[name].T).ravel())
+            columns[name] = pa.FixedSizeListArray.from_arrays(values, samples)
+
+    metadata = {b'Source File': os.path.abspath(source_path).encode(), b'Time': curves['Time'].astype(np.float32).tobytes()}
+    return pa.table(columns).replace_schema_metadata(metadata)
+
+def _write_table(table, path, compression):
+    """Writes an Arrow IPC file atomically. Uncompressed files can be memory-mapped without copying."""
+    tmp_path = path + '.tmp'
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, path)
+
+def _open_table(path):
+    return pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+
+def _curve_matrix(table, name):
+    """(curves, samples) float32 view of a fixed-size list column, or None if not stored."""
+    if name not in table.column_names:
+        return None
+    column = table.column(name).combine_chunks()
+    values = column.flatten().to_numpy(zero_copy_only=False)
+    return values.reshape(len(column), column.type.list_size)
+
+def _recorder_mask(index, recorder_numbers):
+    if recorder_numbers is None:
+        return np.ones(len(index), dtype=bool)
+    wanted = {str(number) for number in np.atleast_1d(recorder_numbers)}
+    return index['Recorder Number'].astype(str).isin(wanted).to_numpy()
+
+# ======================== Public Functions ========================
+def load_index(store_dir=STORE_DIR):
+    """Index of all stored curves (Recorder Number, Timestamp, File, Row, Samples), sorted by Timestamp."""
+    path = os.path.join(store_dir, INDEX_FILE)
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=['Recorder Number', 'Timestamp', 'File', 'Row', 'Samples',
+                                     'Source File', 'Source Size', 'Source Mtime'])
+    return pd.read_parquet(path)
+
+def import_ctm_files(file_paths, store_dir=STORE_DIR, learning_curves=False, compression=None):
+    """
+    Converts CTM text files into the curve store: one Arrow IPC file per
+    export plus a common index. Files that were imported before and did not
+    change (size, mtime) are skipped.
+
+    compression: None (memory-mappable, default), 'lz4' or 'zstd'
+
+    :return: Number of imported files.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    index = load_index(store_dir)
+    known = index.drop_duplicates('Source File', keep='last').set_index('Source File')[['Source Size', 'Source Mtime']]
+
+    new_entries = {}
+    for source_path in file_paths:
+        source_path = os.path.abspath(source_path)
+        stat = os.stat(source_path)
+        if source_path in known.index and tuple(known.loc[source_path]) == (stat.st_size, stat.st_mtime):
+            continue
+
+        try:
+            curves = parse_ctm_file(source_path, learning_curves=learning_curves)
+        except Exception as e:
+            log(f"[ERROR] {source_path} could not be parsed: {e}")
+            continue
+
+        file_name = _store_file_name(source_path)
+        _write_table(_curve_table(curves, source_path), os.path.join(store_dir, file_name), compression)
+
+        count = len(curves['Recorder Number'])
+        new_entries[source_path] = pd.DataFrame({
+            'Recorder Number': curves['Recorder Number'],
+            'Timestamp': curves['Timestamp'],
+            'File': file_name,
+            'Row': np.arange(count, dtype=np.int32),
+            'Samples': np.full(count, len(curves['Time']), dtype=np.int32),
+            'Source File': source_path,
+            'Source Size': stat.st_size,
+            'Source Mtime': stat.st_mtime,
+        })
+        log(f"[INFO] Imported {count} curves from {os.path.basename(source_path)}")
+
+    if not new_entries:
+        return 0
+
+    # Re-imported files replace the previous index entries of the same source file
+    replaced = index['Source File'].isin(new_entries.keys())
+    dropped, kept = index[replaced], index[~replaced]
+    index = pd.concat(([kept] if len(kept) else []) + list(new_entries.values()), ignore_index=True)
+    if index['Recorder Number'].dtype == object:
+        index['Recorder Number'] = index['Recorder Number'].astype(str)
+    index = index.sort_values(['Timestamp', 'Recorder Number'], kind='stable').reset_index(drop=True)
+
+    tmp_path = os.path.join(store_dir, INDEX_FILE + '.tmp')
+    index.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, os.path.join(store_dir, INDEX_FILE))
+    _remove_unused_files(store_dir, dropped, index)
+    return len(new_entries)
+
+def import_ctm_directory(source_dir, store_dir=STORE_DIR, learning_curves=False, pattern='*.txt', compression=None):
+    """Imports all CTM text files in source_dir matching pattern with import_ctm_files()."""
+    file_paths = sorted(glob.glob(os.path.join(source_dir, pattern)))
+    return import_ctm_files(file_paths, store_dir, learning_curves, compression)
+
+def read_curve(recorder_number, timestamp, store_dir=STORE_DIR, index=None):
+    """
+    Reads a single curve. Returns a dict with 'Time', 'Prozesskurve' and (if
+    stored) 'Lernkurve' as float32 arrays, or None if the curve is not stored.
+    """
+    index = load_index(store_dir) if index is None else index
+    match = index[_recorder_mask(index, recorder_number) & (index['Timestamp'] == pd.Timestamp(timestamp)).to_numpy()]
+    if match.empty:
+        return None
+
+    entry = match.iloc[0]
+    table = _open_table(os.path.join(store_dir, entry['File']))
+    curve = {'Time': np.frombuffer(table.schema.metadata[b'Time'], dtype=np.float32)}
+    for name in CURVE_COLUMNS:
+        matrix = _curve_matrix(table, name)
+        if matrix is not None:
+            curve[name] = matrix[entry['Row']]
+    return curve
+
+def read_curves(start=None, end=None, recorder_numbers=None, store_dir=STORE_DIR, index=None):
+    """
+    Reads all curves with start <= Timestamp < end (open if None), optionally
+    only for the given recorder numbers. Every store file is memory-mapped
+    once and the selected rows are copied into one matrix.
+
+    Returns a dict with 'Recorder Number', 'Timestamp', 'Time' and the curve
+    matrices (curves x samples, float32). Curves with fewer samples than the
+    longest one are padded with NaN.
+    """
+    index = load_index(store_dir) if index is None else index
+    timestamps = index['Timestamp'].to_numpy(dtype='datetime64[ns]')
+    first = 0 if start is None else np.searchsorted(timestamps, np.datetime64(pd.Timestamp(start), 'ns'), side='left')
+    last = len(index) if end is None else np.searchsorted(timestamps, np.datetime64(pd.Timestamp(end), 'ns'), side='left')
+
+    selection = index.iloc[first:last]
+    selection = selection[_recorder_mask(selection, recorder_numbers)].reset_index(drop=True)
+
+    samples = int(selection['Samples'].max()) if len(selection) else 0
+    result = {
+        'Recorder Number': selection['Recorder Number'].to_numpy(),
+        'Timestamp': selection['Timestamp'].to_numpy(dtype='datetime64[ns]'),
+        'Time': np.empty(0, dtype=np.float32),
+    }
+
+    for file_name, rows in selection.groupby('File', sort=False).indices.items():
+        table = _open_table(os.path.join(store_dir, file_name))
+        time = np.frombuffer(table.schema.metadata[b'Time'], dtype=np.float32)
+        if len(time) > len(result['Time']):
+            result['Time'] = time
+
+        for name in CURVE_COLUMNS:
+            matrix = _curve_matrix(table, name)
+            if matrix is None:
+                continue
+            if name not in result:
+                result[name] = np.full((len(selection), samples), np.nan, dtype=np.float32)
+            result[name][rows, :matrix.shape[1]] = matrix[selection['Row'].to_numpy()[rows]]
+    return result
+
+# ======================== Main Function ========================
+def main():
+    parser = argparse.ArgumentParser(description="Converts CTM text exports into the compact curve store.")
+    parser.add_argument('source_dir', help="Folder with CTM text files")
+    parser.add_argument('--store', default=STORE_DIR, help="Target folder of the curve store")
+    parser.add_argument('--pattern', default='*.txt', help="File pattern of the CTM exports")
+    parser.add_argument('--learning-curves', action='store_true', help="Files contain process/learning curve pairs")
+    parser.add_argument('--compression', choices=['lz4', 'zstd'], default=None,
+                        help="Compress the store files (they can then no longer be memory-mapped without copying)")
+    args = parser.parse_args()
+
+    count = import_ctm_directory(args.source_dir, args.store, args.learning_curves, args.pattern, args.compression)
+    index = load_index(args.store)
+    log(f"[INFO] {count} files imported, {len(index)} curves in the store")
+
+# ======================== Execution ========================
+if __name__ == "__main__":
+    main()
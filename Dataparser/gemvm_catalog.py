@@ -0,0 +1,155 @@
+import os
+import numpy as np
+import pandas as pd
+
+from production_intervals import scan_folders, FILE_PATTERN as TRACE_FILE_PATTERN
+from gemvm_fft import FILE_PATTERN as FFT_FILE_PATTERN
+
+# ======================== Configuration ========================
+DEBUG = True
+# GEMVM exports in the catalog, by kind; "..._S1_2025-03-20_10-15-30E.csv" files are excluded by the patterns
+FILE_PATTERNS = {
+    'Trace': TRACE_FILE_PATTERN,
+    'Fft': FFT_FILE_PATTERN,
+}
+CATALOG_COLUMNS = ['Kind', 'Timestamp', 'File', 'Folder']
+NAT = np.iinfo(np.int64).min
+
+# ======================== Logging ========================
+def log(msg):
+    if DEBUG:
+        print(msg)
+
+# ======================== Helper Functions ========================
+def _empty_catalog():
+    return pd.DataFrame({
+        'Kind': pd.Series(dtype=str), 'Timestamp': pd.Series(dtype='datetime64[ns]'),
+        'File': pd.Series(dtype=str), 'Folder': pd.Series(dtype=str),
+    })
+
+def _list_folders(roots, recursive):
+    """The roots and, if recursive, all folders below them (in os.walk order)."""
+    if not recursive:
+        return list(roots)
+    return [folder for root in roots for folder, _, _ in os.walk(root)]
+
+def _sort_catalog(catalog):
+    return catalog.sort_values(['Kind', 'Timestamp', 'File'], kind='stable').reset_index(drop=True)[CATALOG_COLUMNS]
+
+def _save_catalog(catalog, catalog_file):
+    """Writes the catalog atomically, so a crashed run never leaves a broken file."""
+    tmp_path = catalog_file + '.tmp'
+    catalog.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, catalog_file)
+
+# ======================== Catalog ========================
+def load_catalog(catalog_file=None):
+    """Persisted catalog (Kind, Timestamp, File, Folder), empty if catalog_file is None or does not exist."""
+    if catalog_file is None or not os.path.exists(catalog_file):
+        return _empty_catalog()
+    return pd.read_parquet(catalog_file)
+
+def update_catalog(roots, catalog_file=None, recursive=True):
+    """
+    Catalog of all GEMVM trace and FFT exports in the roots (and, if
+    recursive, all folders below them), built from the timestamps in the
+    file names without opening any file and sorted by Kind and Timestamp.
+
+    With catalog_file, the catalog of earlier runs is loaded first: only new
+    file names are parsed, entries of deleted files are dropped and the
+    result is written back. The file may hold entries of other roots; they
+    are kept in the file but not returned.
+    """
+    stored = load_catalog(catalog_file)
+    folders = _list_folders(roots, recursive)
+
+    # Entries of the scanned folders whose files still exist; the rest of the file is kept as it is
+    in_scope = stored['Folder'].isin(folders)
+    known = stored[in_scope]
+    known = known[np.array([os.path.exists(path) for path in known['File']], dtype=bool)]
+    if len(known) < in_scope.sum():
+        log(f"[INFO] {in_scope.sum() - len(known)} deleted files removed from the catalog")
+
+    parts = []
+    for kind, pattern in FILE_PATTERNS.items():
+        file_index = known.loc[known['Kind'] == kind, ['Timestamp', 'File', 'Folder']]
+        file_index = scan_folders(folders, file_index if len(file_index) else None, pattern, label=kind)
+        parts.append(file_index.assign(Kind=kind))
+    catalog = _sort_catalog(pd.concat(parts, ignore_index=True))
+    log("[INFO] Catalog: " + ", ".join(f"{(catalog['Kind'] == kind).sum()} {kind}" for kind in FILE_PATTERNS)
+        + f" files in {len(folders)} folders")
+
+    if catalog_file is not None:
+        kept = stored[~in_scope]
+        _save_catalog(_sort_catalog(pd.concat([kept, catalog], ignore_index=True)) if len(kept) else catalog, catalog_file)
+    return catalog
+
+def file_index_of(catalog, kind):
+    """File index (Timestamp, File, Folder) of one kind, as returned by production_intervals.scan_folders()."""
+    return catalog.loc[catalog['Kind'] == kind, ['Timestamp', 'File', 'Folder']].reset_index(drop=True)
+
+# ======================== Lookup ========================
+def find_files(catalog, kind, timestamps, tolerance=pd.Timedelta(0), direction='nearest'):
+    """
+    File of the given kind for every timestamp, with two binary searches on
+    the sorted file timestamps for all timestamps at once.
+
+    tolerance: maximum distance between timestamp and file timestamp;
+               Timedelta(0) = exact match (default), a few seconds absorb clock
+               drift between machine and GEMVM, None = no limit
+    direction: 'nearest', 'backward' (file timestamp <= timestamp) or
+               'forward' (file timestamp >= timestamp); on equal distance the
+               earlier file wins, among files with the same timestamp the
+               first by path
+
+    :return: DataFrame with File (None if no match), File Timestamp and
+             Distance (absolute), indexed like timestamps if it is a Series.
+    """
+    if direction not in ('backward', 'forward', 'nearest'):
+        raise ValueError("direction must be 'backward', 'forward' or 'nearest'")
+    entries = catalog[catalog['Kind'] == kind]
+    values = entries['Timestamp'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+    files = entries['File'].to_numpy(dtype=object)
+    keys = pd.DatetimeIndex(pd.Series(timestamps).to_numpy()).as_unit('ns').asi8
+    count, valid = len(values), keys != NAT
+
+    # backward: first file with the last timestamp <= key; forward: first file with timestamp >= key
+    last = np.searchsorted(values, keys, side='right') - 1
+    backward = np.where(last >= 0, np.searchsorted(values, values[np.maximum(last, 0)], side='left') if count else -1, -1)
+    forward = np.searchsorted(values, keys, side='left')
+    has_backward = valid & (backward >= 0)
+    has_forward = valid & (forward < count)
+    backward_distance = np.where(has_backward, keys - values[np.clip(backward, 0, max(count - 1, 0))] if count else 0, NAT)
+    forward_distance = np.where(has_forward, values[np.clip(forward, 0, max(count - 1, 0))] - keys if count else 0, NAT)
+
+    if direction == 'backward':
+        positions, distances, found = backward, backward_distance, has_backward
+    elif direction == 'forward':
+        positions, distances, found = forward, forward_distance, has_forward
+    else:
+        use_forward = has_forward & (~has_backward | (forward_distance < backward_distance))
+        positions = np.where(use_forward, forward, backward)
+        distances = np.where(use_forward, forward_distance, backward_distance)
+        found = has_backward | has_forward
+
+    if tolerance is not None:
+        found &= distances <= pd.Timedelta(tolerance).value
+    positions = np.where(found, positions, 0)
+
+    index = timestamps.index if isinstance(timestamps, pd.Series) else None
+    result = pd.DataFrame({
+        'File': pd.Series(np.where(found, files[positions] if count else None, None), index=index, dtype=object),
+        'File Timestamp': np.where(found, values[positions] if count else NAT, NAT).view('datetime64[ns]'),
+        'Distance': np.where(found, distances, NAT).view('timedelta64[ns]'),
+    }, index=index)
+    log(f"[INFO] {found.sum()} of {len(keys)} timestamps matched to {kind} files")
+    return result
+
+def find_file(catalog, kind, timestamp, tolerance=pd.Timedelta(0), direction='nearest'):
+    """File of the given kind for a single timestamp (see find_files()), None if there is none."""
+    return find_files(catalog, kind, [pd.Timestamp(timestamp)], tolerance, direction)['File'].iat[0]
+
+# ======================== Example Call ========================
+if __name__ == "__main__":
+    catalog = update_catalog(["training_folder"], "gemvm_catalog.parquet")
+    print(find_files(catalog, 'Trace', pd.to_datetime(['2025-03-20 10:15:30']), tolerance=pd.Timedelta(seconds=2)))
@@ -0,0 +1,238 @@
+import os
+import re
+import hashlib
+import argparse
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+# ======================== Configuration ========================
+DEBUG = True
+SKIP_ROWS = 4                        # Lines before the header of a GEMVM_Export_Fft_S1_* file
+DELIMITER = ';'
+META_COLUMNS = 15                    # 'Version:1.3' and 14 measurement columns before the spectral bins
+FILE_PATTERN = re.compile(r'GEMVM_Export_Fft_S1_(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})\.csv')
+TIMESTAMP_FORMAT = '%Y-%m-%d_%H-%M-%S'
+STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fft_store')
+INDEX_FILE = 'index.parquet'
+
+# ======================== Logging ========================
+def log(msg):
+    if DEBUG:
+        print(msg)
+
+# ======================== Helper Functions ========================
+def _bin_frequencies(labels):
+    """Frequencies of the bin labels as float64, NaN where a label is not numeric."""
+    return pd.to_numeric(pd.Series(labels, dtype=str).str.replace(',', '.').str.strip(), errors='coerce').to_numpy()
+
+def _spectrum_table(spectra, labels, source_path):
+    """One row per spectrum as fixed-size list column, bin labels as schema metadata."""
+    values = pa.array(np.ascontiguousarray(spectra).ravel())
+    table = pa.table({'Spectrum': pa.FixedSizeListArray.from_arrays(values, spectra.shape[1])})
+    metadata = {b'Source File': os.path.abspath(source_path).encode(), b'Bins': '\t'.join(labels).encode()}
+    return table.replace_schema_metadata(metadata)
+
+def _write_table(table, path, compression):
+    """Writes an Arrow IPC file atomically. Uncompressed files can be memory-mapped without copying."""
+    tmp_path = path + '.tmp'
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, path)
+
+def _read_table(path):
+    """(spectra matrix, bin labels) of a store file; the matrix is a view on the memory-mapped file."""
+    table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    column = table.column('Spectrum').combine_chunks()
+    spectra = column.flatten().to_numpy(zero_copy_only=False).reshape(len(column), column.type.list_size)
+    return spectra, table.schema.metadata[b'Bins'].decode().split('\t')
+
+def _store_file_name(source_path):
+    """Store file of an export: file name plus a short hash of the absolute path, so same-named exports of different folders do not overwrite each other."""
+    source_path = os.path.abspath(source_path)
+    path_hash = hashlib.sha1(source_path.encode()).hexdigest()[:10]
+    return f"{os.path.splitext(os.path.basename(source_path))[0]}_{path_hash}.arrow"
+
+def _file_timestamp(file_name):
+    match = FILE_PATTERN.fullmatch(file_name)
+    return pd.to_datetime(match.group(1), format=TIMESTAMP_FORMAT) if match else None
+
+# ======================== Parsing ========================
+def read_fft_file(file_path, dtype=np.float32):
+    """
+    Reads the spectra of a GEMVM FFT export. Only the spectral bins (all
+    columns after the first META_COLUMNS) are parsed, directly as dtype.
+
+    :return: (spectra (rows x bins) matrix, bin labels as list of str)
+    """
+    header = pd.read_csv(file_path, skiprows=SKIP_ROWS, delimiter=DELIMITER, nrows=0).columns
+    labels = [str(label) for label in header[META_COLUMNS:]]
+    bins = range(META_COLUMNS, len(header))
+
+    options = dict(skiprows=SKIP_ROWS + 1, delimiter=DELIMITER, header=None, usecols=bins)
+    try:
+        df = pd.read_csv(file_path, dtype=np.float32, **options)
+    except ValueError:
+        # Non-numeric cells become NaN
+        df = pd.read_csv(file_path, dtype=str, **options).apply(pd.to_numeric, errors='coerce')
+    spectra = df.to_numpy(dtype=np.float32)
+
+    if np.dtype(dtype) == np.float16:
+        overflow = np.abs(spectra) > np.finfo(np.float16).max
+        if overflow.any():
+            log(f"[WARN] {file_path}: {overflow.sum()} values exceed the float16 range and become inf")
+    return spectra.astype(dtype, copy=False), labels
+
+# ======================== Band Features ========================
+def band_energy(spectra, frequencies, bands, squared=True):
+    """
+    Energy per frequency band for every spectrum: sum of the squared (or,
+    with squared=False, plain) bin values with low <= frequency < high.
+    Computed with one cumulative sum and np.searchsorted, so the cost does
+    not depend on the number of bands.
+
+    spectra: (spectra x bins) or (bins,) array, frequencies: (bins,) ascending
+    bands: {name: (low, high)}
+    :return: DataFrame with one column per band (float64)
+    """
+    spectra = np.atleast_2d(np.asarray(spectra, dtype=np.float64))
+    frequencies = np.asarray(frequencies, dtype=np.float64)
+    values = np.square(spectra) if squared else spectra
+    cumulative = np.concatenate((np.zeros((len(values), 1)), np.nancumsum(values, axis=1)), axis=1)
+
+    edges = np.array([band for band in bands.values()], dtype=np.float64).reshape(-1, 2)
+    low = np.searchsorted(frequencies, edges[:, 0], side='left')
+    high = np.searchsorted(frequencies, edges[:, 1], side='left')
+    return pd.DataFrame(cumulative[:, high] - cumulative[:, low], columns=list(bands))
+
+def band_energy_from_store(timestamps, bands, store_dir=STORE_DIR, index=None, squared=True):
+    """Mean band energy per recording (rows = timestamps, NaN if not stored), without reading any CSV."""
+    index = load_index(store_dir) if index is None else index
+    rows = []
+    for timestamp in timestamps:
+        recording = read_spectra(timestamp, store_dir, index)
+        if recording is None:
+            rows.append(pd.Series(np.nan, index=list(bands)))
+        else:
+            rows.append(band_energy(recording['Spectra'], recording['Frequency'], bands, squared).mean())
+    return pd.DataFrame(rows, index=pd.DatetimeIndex(timestamps, name='Timestamp'))
+
+# ======================== Store ========================
+def load_index(store_dir=STORE_DIR):
+    """Index of all stored recordings (Timestamp, File, Rows, Bins, Source File/Size/Mtime), sorted by Timestamp."""
+    path = os.path.join(store_dir, INDEX_FILE)
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=['Timestamp', 'File', 'Rows', 'Bins', 'Source File', 'Source Size', 'Source Mtime'])
+    return pd.read_parquet(path)
+
+def import_fft_files(file_paths, store_dir=STORE_DIR, dtype=np.float32, compression=None):
+    """
+    Converts GEMVM FFT exports into the spectrum store: one Arrow IPC file
+    per recording (spectra as dtype, float32 or float16) plus a common index
+    keyed by the timestamp of the file name. Files that were imported before
+    and did not change (size, mtime) are skipped, other file names are ignored.
+
+    compression: None (memory-mappable, default), 'lz4' or 'zstd'
+
+    :return: Number of imported files.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    index = load_index(store_dir)
+    known = index.drop_duplicates('Source File', keep='last').set_index('Source File')[['Source Size', 'Source Mtime']]
+
+    new_entries = {}
+    for source_path in file_paths:
+        file_name = os.path.basename(source_path)
+        timestamp = _file_timestamp(file_name)
+        if timestamp is None:
+            continue
+        source_path = os.path.abspath(source_path)
+        stat = os.stat(source_path)
+        if source_path in known.index and tuple(known.loc[source_path]) == (stat.st_size, stat.st_mtime):
+            continue
+
+        try:
+            spectra, labels = read_fft_file(source_path, dtype)
+        except Exception as e:
+            log(f"[ERROR] {source_path} could not be parsed: {e}")
+            continue
+
+        store_file = _store_file_name(source_path)
+        _write_table(_spectrum_table(spectra, labels, source_path), os.path.join(store_dir, store_file), compression)
+        new_entries[source_path] = {
+            'Timestamp': timestamp, 'File': store_file, 'Rows': spectra.shape[0], 'Bins': spectra.shape[1],
+            'Source File': source_path, 'Source Size': stat.st_size, 'Source Mtime': stat.st_mtime,
+        }
+        log(f"[INFO] Imported {spectra.shape[0]} x {spectra.shape[1]} spectrum from {file_name}")
+
+    if not new_entries:
+        return 0
+
+    # Re-imported files replace the previous index entries of the same source file
+    new_index = pd.DataFrame(list(new_entries.values()))
+    replaced = index['Source File'].isin(new_index['Source File'])
+    dropped, kept = index[replaced], index[~replaced]
+    index = pd.concat(([kept] if len(kept) else []) + [new_index], ignore_index=True)
+    index = index.sort_values(['Timestamp', 'Source File'], kind='stable').reset_index(drop=True)  # Ties: first by path, like gemvm_catalog
+
+    tmp_path = os.path.join(store_dir, INDEX_FILE + '.tmp')
+    index.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, os.path.join(store_dir, INDEX_FILE))
+
+    # Store files of older versions (e.g. named without the path hash) that no entry refers to any more
+    for old_file in set(dropped['File']) - set(index['File']):
+        if os.path.exists(os.path.join(store_dir, old_file)):
+            os.remove(os.path.join(store_dir, old_file))
+    return len(new_entries)
+
+def import_fft_directory(source_dir, store_dir=STORE_DIR, dtype=np.float32, compression=None):
+    """Imports all GEMVM FFT exports below source_dir with import_fft_files()."""
+    file_paths = [
+        os.path.join(root, file_name)
+        for root, _, files in os.walk(source_dir) for file_name in sorted(files)
+    ]
+    return import_fft_files(file_paths, store_dir, dtype, compression)
+
+def read_spectra(timestamp, store_dir=STORE_DIR, index=None, source_file=None):
+    """
+    Spectra of the recording with the given timestamp, or None if not stored.
+    Returns a dict with 'Spectra' (rows x bins, as stored), 'Bins' (labels)
+    and 'Frequency' (float64, NaN for non-numeric labels).
+
+    Same-named exports of different folders can share a timestamp; pass
+    source_file (e.g. the file found by gemvm_catalog.find_files) to select
+    the recording imported from that file instead of by timestamp. Without
+    it, the first of several recordings is used and a warning is logged.
+    """
+    index = load_index(store_dir) if index is None else index
+    if source_file is not None:
+        match = index[index['Source File'] == os.path.abspath(source_file)]
+    else:
+        match = index[index['Timestamp'] == pd.Timestamp(timestamp)]
+    if source_file is None and len(match) > 1:
+        log(f"[WARN] {len(match)} recordings at {pd.Timestamp(timestamp)} ({', '.join(match['Source File'])}), "
+            f"using {match['Source File'].iat[0]}")
+    if match.empty:
+        return None
+
+    spectra, labels = _read_table(os.path.join(store_dir, match['File'].iat[0]))
+    return {'Spectra': spectra, 'Bins': labels, 'Frequency': _bin_frequencies(labels)}
+
+# ======================== Main Function ========================
+def main():
+    parser = argparse.ArgumentParser(description="Converts GEMVM FFT exports into the compact spectrum store.")
+    parser.add_argument('source_dir', help="Folder with GEMVM_Export_Fft_S1_* files (searched recursively)")
+    parser.add_argument('--store', default=STORE_DIR, help="Target folder of the spectrum store")
+    parser.add_argument('--float16', action='store_true', help="Store spectra as float16 instead of float32")
+    parser.add_argument('--compression', choices=['lz4', 'zstd'], default=None,
+                        help="Compress the store files (they can then no longer be memory-mapped without copying)")
+    args = parser.parse_args()
+
+    dtype = np.float16 if args.float16 else np.float32
+    count = import_fft_directory(args.source_dir, args.store, dtype, args.compression)
+    log(f"[INFO] {count} files imported, {len(load_index(args.store))} recordings in the store")
+
+# ======================== Execution ========================
+if __name__ == "__main__":
+    main()
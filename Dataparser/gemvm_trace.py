@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+
+# ======================== Configuration ========================
+DEBUG = True
+SKIP_ROWS = 5                        # Header lines of a GEMVM_Export_Trace_S1_* file
+DELIMITER = ';'
+TIME_COLUMN = 'LocalTime UTC'
+TIMESTAMP_FORMAT = None              # strptime format for TIME_COLUMN values that are not ISO 8601 (None = inferred)
+ISO_WIDTH = 35                       # Longest ISO timestamp: date, time, 9 fraction digits, '+HH:MM'
+CHUNK_SIZE = 200_000                 # Rows per chunk
+
+# ======================== Logging ========================
+def log(msg):
+    if DEBUG:
+        print(msg)
+
+# ======================== Helper Functions ========================
+def _read_chunks(file_path, all_columns, usecols, value_columns, chunk_size, skiprows, dtype):
+    """Chunk reader for the projected columns; dtype=None reads the value columns as text."""
+    return pd.read_csv(
+        file_path, skiprows=skiprows, delimiter=DELIMITER, header=None, names=all_columns, usecols=usecols,
+        dtype={**{col: dtype or str for col in value_columns}, TIME_COLUMN: str}, chunksize=chunk_size,
+    )
+
+DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+def _digits(digits, columns):
+    """Integer value of the given columns of a digit matrix (characters minus '0')."""
+    value = np.zeros(len(digits), dtype=np.int64)
+    for column in columns:
+        value = value * 10 + digits[:, column]
+    return value
+
+def _days_since_epoch(year, month, day):
+    """Days since 1970-01-01 for proleptic Gregorian dates (integer arithmetic, no datetime64 conversions)."""
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * np.where(month > 2, month - 3, month + 9) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+def _parse_iso_timestamps(values):
+    """
+    Vectorized parser for 'YYYY-MM-DD[T ]HH:MM:SS[.f]' with 1-9 fraction digits
+    and an optional 'Z' or '+HH:MM' suffix, converted to naive UTC.
+
+    :return: (datetime64[ns] array, mask of the values in this layout)
+    """
+    try:
+        raw = values.to_numpy(dtype=object).astype(f'S{ISO_WIDTH + 1}')
+    except (UnicodeEncodeError, TypeError):
+        return np.full(len(values), np.datetime64('NaT'), dtype='datetime64[ns]'), np.zeros(len(values), dtype=bool)
+    chars = raw.view(np.uint8).reshape(-1, ISO_WIDTH + 1)
+    digits = chars - np.uint8(ord('0'))  # Non-digits wrap around to values > 9
+    is_digit = digits < 10
+
+    length = np.char.str_len(raw)
+    has_fraction = chars[:, 19] == ord('.')
+    fraction_mask = np.logical_and.accumulate(is_digit[:, 20:29], axis=1) & has_fraction[:, None]
+    fraction_digits = fraction_mask.sum(axis=1)
+
+    suffix_start = 19 + np.where(has_fraction, fraction_digits + 1, 0)
+    suffix_length = length - suffix_start
+    suffix_index = np.minimum(suffix_start[:, None] + np.arange(6), ISO_WIDTH)
+    suffix = np.take_along_axis(chars, suffix_index, axis=1)
+    suffix_digits = np.take_along_axis(digits, suffix_index, axis=1)
+    is_utc = (suffix_length == 1) & (suffix[:, 0] == ord('Z'))
+    has_offset = (
+        (suffix_length == 6) & ((suffix[:, 0] == ord('+')) | (suffix[:, 0] == ord('-'))) & (suffix[:, 3] == ord(':'))
+        & (suffix_digits[:, [1, 2, 4, 5]] < 10).all(axis=1)
+    )
+
+    valid = (
+        (length <= ISO_WIDTH) & (chars[:, 4] == ord('-')) & (chars[:, 7] == ord('-'))
+        & ((chars[:, 10] == ord('T')) | (chars[:, 10] == ord(' '))) & (chars[:, 13] == ord(':')) & (chars[:, 16] == ord(':'))
+        & is_digit[:, [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18]].all(axis=1)
+        & (~has_fraction | (fraction_digits >= 1))
+        & ((suffix_length == 0) | is_utc | has_offset)
+    )
+
+    year, month, day = _digits(digits, range(4)), _digits(digits, [5, 6]), _digits(digits, [8, 9])
+    hour, minute, second = _digits(digits, [11, 12]), _digits(digits, [14, 15]), _digits(digits, [17, 18])
+    nanosecond = _digits(np.where(fraction_mask, digits[:, 20:29], 0), range(9))
+    offset = np.where(has_offset, (_digits(suffix_digits, [1, 2]) * 60 + _digits(suffix_digits, [4, 5]))
+                      * np.where(suffix[:, 0] == ord('-'), -1, 1), 0)
+
+    month_index = np.clip(month, 1, 12) - 1
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    days_in_month = DAYS_IN_MONTH[month_index] + (leap & (month_index == 1))
+    valid &= (month >= 1) & (month <= 12) & (day >= 1) & (day <= days_in_month) & (hour < 24) & (minute < 60) & (second < 60)
+
+    seconds = (_days_since_epoch(year, month, day) * 24 + hour) * 3600 + (minute - offset) * 60 + second
+    stamps = (seconds * 1_000_000_000 + nanosecond).view('datetime64[ns]')
+    stamps[~valid] = np.datetime64('NaT')
+    return stamps, valid
+
+def _parse_timestamps(values, timestamp_format):
+    """
+    Naive UTC timestamps, like pd.to_datetime(values, utc=True).dt.tz_localize(None).
+    ISO values are parsed numerically, all others with timestamp_format (None = inferred).
+    """
+    stamps, valid = _parse_iso_timestamps(values)
+    if not valid.all():
+        fallback = pd.to_datetime(values[~valid], format=timestamp_format, utc=True)
+        stamps[~valid] = fallback.dt.tz_localize(None).to_numpy(dtype='datetime64[ns]')
+    return pd.Series(stamps, index=values.index)
+
+# ======================== Public Functions ========================
+def iter_trace(file_path, all_columns, selected_columns, chunk_size=CHUNK_SIZE, dtype=np.float32,
+               parse_timestamps=True, timestamp_format=TIMESTAMP_FORMAT):
+    """
+    Reads a GEMVM trace export in chunks of chunk_size rows and only parses
+    the selected columns. Yields DataFrames with selected_columns as dtype
+    (TIME_COLUMN stays text) and, with parse_timestamps, a naive UTC
+    'Timestamp' column built from TIME_COLUMN. Memory use does not depend on
+    the file size.
+
+    all_columns are the names of all columns in the file, in file order.
+    Non-numeric cells in the value columns become NaN.
+    """
+    value_columns = [col for col in selected_columns if col != TIME_COLUMN]
+    usecols = value_columns + [TIME_COLUMN] if parse_timestamps or TIME_COLUMN in selected_columns else value_columns
+
+    rows_read = 0
+    chunk_dtype = dtype
+    while True:
+        with _read_chunks(file_path, all_columns, usecols, value_columns, chunk_size, SKIP_ROWS + rows_read, chunk_dtype) as chunks:
+            while True:
+                try:
+                    chunk = next(chunks, None)
+                except ValueError:
+                    if chunk_dtype is None:
+                        raise
+                    # Non-numeric cells: continue after the last complete chunk and coerce the values
+                    log(f"[WARN] {file_path}: non-numeric values after row {rows_read}, converting them to NaN")
+                    chunk_dtype = None
+                    break
+                if chunk is None:
+                    return
+
+                if chunk_dtype is None:
+                    chunk[value_columns] = chunk[value_columns].apply(pd.to_numeric, errors='coerce').astype(dtype)
+                if parse_timestamps:
+                    chunk['Timestamp'] = _parse_timestamps(chunk[TIME_COLUMN], timestamp_format)
+                rows_read += len(chunk)
+                yield chunk[selected_columns + (['Timestamp'] if parse_timestamps else [])]
+
+def read_trace(file_path, all_columns, selected_columns, chunk_size=CHUNK_SIZE, dtype=np.float32,
+               parse_timestamps=True, timestamp_format=TIMESTAMP_FORMAT):
+    """Reads a whole trace file with iter_trace() into one DataFrame."""
+    chunks = list(iter_trace(file_path, all_columns, selected_columns, chunk_size, dtype, parse_timestamps, timestamp_format))
+    if not chunks:
+        empty = {col: pd.Series(dtype=str if col == TIME_COLUMN else dtype) for col in selected_columns}
+        if parse_timestamps:
+            empty['Timestamp'] = pd.Series(dtype='datetime64[ns]')
+        return pd.DataFrame(empty)
+    return pd.concat(chunks, ignore_index=True)
+
+# ======================== Example Call ========================
+if __name__ == "__main__":
+    # WARNING: BECAUSE OF ANONYMISED DATA THIS SECTION IS NOT INCLUDED TO SECURE THE GUIDELINES
+    # PLEASE INSERT YOUR COLUMNS IN HERE
+    all_columns = ['YOUR COLUMNS HERE']
+    selected_columns = ['YOUR COLUMNS HERE']
+
+    for chunk in iter_trace('./2025-03-20_1/GEMVM_Export_Trace_S1_2025-03-20_10-15-30.csv', all_columns, selected_columns):
+        print(len(chunk), chunk['Timestamp'].min(), chunk['Timestamp'].max())
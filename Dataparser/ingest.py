@@ -0,0 +1,44 @@
+import argparse
+
+# parser_registry adds the "Database" folder to sys.path
+from parser_registry import FORMATS, expand_paths, group_by_format, ingest_format, log
+from parallel_ingest import format_ingestion_stats, DEFAULT_PARSE_WORKERS, DEFAULT_WRITE_WORKERS
+from ingestion_manifest import format_ingestion_report
+from engine_pool import format_pool_stats
+
+# ======================== Main Function ========================
+def main():
+    parser = argparse.ArgumentParser(
+        description="Ingests raw files of all formats in one run; the format of every file is detected from its header.")
+    parser.add_argument('paths', nargs='+', help="Files, folders (searched recursively) or glob patterns ('**' for subfolders)")
+    parser.add_argument('--format', choices=list(FORMATS), default=None, help="Skip detection, treat all files as this format")
+    parser.add_argument('--parse-workers', type=int, default=DEFAULT_PARSE_WORKERS, help="Processes parsing files")
+    parser.add_argument('--write-workers', type=int, default=DEFAULT_WRITE_WORKERS, help="Threads writing to the database")
+    parser.add_argument('--dry-run', action='store_true', help="Only print the detected format of every file")
+    args = parser.parse_args()
+
+    file_paths = expand_paths(args.paths)
+    if args.format:
+        groups, unknown = {args.format: file_paths}, []
+    else:
+        groups, unknown = group_by_format(file_paths)
+    log(f"[INFO] {len(file_paths)} files: " + ", ".join(f"{len(paths)} {name}" for name, paths in groups.items())
+        + f", {len(unknown)} unknown")
+    for file_path in unknown:
+        log(f"[WARN] Unknown format, skipped: {file_path}")
+
+    if args.dry_run:
+        for name, paths in groups.items():
+            for file_path in paths:
+                print(f"{name}\t{file_path}")
+        return
+
+    for name, paths in groups.items():
+        stats = ingest_format(name, paths, args.parse_workers, args.write_workers)
+        log(f"[{name}] {format_ingestion_stats(stats)}")
+    log(format_ingestion_report())
+    log(format_pool_stats())
+
+# ======================== Execution ========================
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+import os
+import re
+import sys
+import json
+import time
+import ctypes
+import ctypes.util
+import select
+import struct
+
+# parser_registry adds the "Database" folder to sys.path
+from parser_registry import FORMATS, read_head, detect_format, ingest_format
+
+# ======================== Configuration ========================
+DEBUG = True
+
+# Drop directory -> format of the files written there (see parser_registry.py), None = detect per file
+WATCH_DIRECTORIES = {
+    './drop/energy': 'energy',
+    './drop/trace': 'trace',
+    './drop/fft': 'fft',
+    './drop/alarm': 'alarm',
+    './drop/axis': 'axis',
+    './drop/keyence': 'keyence',
+}
+
+SETTLE_SECONDS = 2.0     # A file is ingested once its size and mtime did not change for this long
+POLL_INTERVAL = 1.0      # Seconds between checks of the pending files (and directory scans without inotify)
+MAX_BATCH_FILES = 32     # Files per ingest call, keeps the latency of large drops bounded
+PARSE_WORKERS = 2        # Processes parsing a batch (batches of one file are parsed in this process)
+MAX_LAG_SECONDS = 60.0   # Files ingested later than this after their last change are reported
+STATS_INTERVAL = 60.0    # Seconds between metric log lines
+STATUS_FILE = None       # If set, the metrics are written there as JSON after every batch (e.g. for monitoring)
+
+IGNORED_NAME = re.compile(r'^[.~]|\.(tmp|part|crdownload)$', re.IGNORECASE)
+
+# inotify (Linux); without it the directories are scanned every POLL_INTERVAL
+IN_MODIFY, IN_CLOSE_WRITE, IN_MOVED_TO, IN_CREATE, IN_Q_OVERFLOW = 0x2, 0x8, 0x80, 0x100, 0x4000
+INOTIFY_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+INOTIFY_EVENT = struct.Struct('iIII')
+
+# ======================== State ========================
+_pending = {}        # path -> {"format", "size", "mtime", "stable_since", "detected"}
+_seen = {}           # path -> (size, mtime) when the file was last handed to an ingest call
+
+_stats = {
+    "files": 0, "rows": 0, "failed_files": 0, "batches": 0,
+    "last_lag": None, "max_lag": 0.0, "lag_total": 0.0, "lag_count": 0, "lagging_files": 0,
+    "started": time.time(),
+}
+
+# ======================== Logging ========================
+def log(msg):
+    if DEBUG:
+        print(msg)
+
+# ======================== File Detection ========================
+def _inotify_open(directories):
+    """inotify descriptor watching the directories plus {watch descriptor: directory}, None if not available."""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        fd = libc.inotify_init()
+        if fd < 0:
+            return None
+        watches = {}
+        for directory in directories:
+            wd = libc.inotify_add_watch(fd, os.fsencode(directory), INOTIFY_MASK)
+            if wd < 0:
+                os.close(fd)
+                return None
+            watches[wd] = directory
+        return fd, watches
+    except (OSError, AttributeError):
+        return None
+
+def _inotify_read(fd, watches, timeout):
+    """Paths with events within timeout seconds. None after a queue overflow (events were lost)."""
+    readable, _, _ = select.select([fd], [], [], timeout)
+    if not readable:
+        return []
+
+    data = os.read(fd, 64 * 1024)
+    paths, offset = set(), 0
+    while offset < len(data):
+        wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+        name = data[offset + INOTIFY_EVENT.size:offset + INOTIFY_EVENT.size + length].rstrip(b'\0')
+        offset += INOTIFY_EVENT.size + length
+        if mask & IN_Q_OVERFLOW:
+            return None
+        if wd in watches and name:
+            paths.add(os.path.join(watches[wd], os.fsdecode(name)))
+    return paths
+
+def _scan(directories):
+    """All files of the directories (used at start, without inotify and after an inotify overflow)."""
+    paths = []
+    for directory in directories:
+        with os.scandir(directory) as it:
+            paths.extend(entry.path for entry in it if entry.is_file())
+    return paths
+
+def _notice(path, formats):
+    """Adds a changed file to the pending files, or restarts its settle time if it changed again."""
+    if IGNORED_NAME.search(os.path.basename(path)):
+        return
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        _pending.pop(path, None)
+        return
+
+    signature = (stat.st_size, stat.st_mtime)
+    entry = _pending.get(path)
+    if entry is None:
+        if _seen.get(path) == signature:
+            return
+        _pending[path] = {"format": formats[os.path.dirname(path)], "size": stat.st_size, "mtime": stat.st_mtime,
+                          "stable_since": time.monotonic(), "detected": time.time()}
+    elif (entry["size"], entry["mtime"]) != signature:
+        entry.update(size=stat.st_size, mtime=stat.st_mtime, stable_since=time.monotonic())
+
+def _file_format(path, expected):
+    """
+    Format of a settled file: the format of its directory if the file matches
+    it, the detected format in directories without one, otherwise None.
+    """
+    try:
+        head = read_head(path)
+    except OSError:
+        return None
+    if expected is None:
+        return detect_format(path, head)
+    return expected if FORMATS[expected]["sniff"](os.path.basename(path), head) else None
+
+def _settled_files():
+    """Pending files whose size and mtime did not change for SETTLE_SECONDS, grouped by format."""
+    now = time.monotonic()
+    ready = {}
+    for path, entry in list(_pending.items()):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            del _pending[path]
+            continue
+        if (stat.st_size, stat.st_mtime) != (entry["size"], entry["mtime"]):
+            entry.update(size=stat.st_size, mtime=stat.st_mtime, stable_since=now)
+        elif now - entry["stable_since"] >= SETTLE_SECONDS:
+            format_name = _file_format(path, entry["format"])
+            if format_name is None:
+                log(f"[WATCH] {path} does not match the format {entry['format'] or 'of any parser'}, skipped")
+                _seen[path] = (entry["size"], entry["mtime"])
+                del _pending[path]
+                continue
+            ready.setdefault(format_name, []).append(path)
+    return ready
+
+# ======================== Metrics ========================
+def _record_batch(paths, files, rows, failed):
+    now = time.time()
+    lags = [now - _pending[path]["mtime"] for path in paths]
+    _stats["batches"] += 1
+    _stats["files"] += files
+    _stats["rows"] += rows
+    _stats["failed_files"] += failed
+    _stats["last_lag"] = max(lags)
+    _stats["max_lag"] = max(_stats["max_lag"], max(lags))
+    _stats["lag_total"] += sum(lags)
+    _stats["lag_count"] += len(lags)
+    _stats["lagging_files"] += sum(lag > MAX_LAG_SECONDS for lag in lags)
+    if max(lags) > MAX_LAG_SECONDS:
+        log(f"[WATCH] Ingest lag {max(lags):.0f} s exceeds {MAX_LAG_SECONDS:.0f} s")
+
+def get_watch_stats():
+    """
+    Current metrics: queue_depth (files waiting to settle or to be ingested),
+    oldest_pending (seconds since the oldest of them changed), last/max/mean
+    lag (seconds from the last change of a file to the end of its ingestion).
+    """
+    now = time.time()
+    stats = dict(_stats)
+    stats["queue_depth"] = len(_pending)
+    stats["oldest_pending"] = max((now - entry["mtime"] for entry in _pending.values()), default=0.0)
+    stats["mean_lag"] = _stats["lag_total"] / _stats["lag_count"] if _stats["lag_count"] else None
+    stats["uptime"] = now - _stats["started"]
+    return stats
+
+def format_watch_stats():
+    stats = get_watch_stats()
+    lag = lambda value: "-" if value is None else f"{value:.1f} s"
+    return (
+        f"[WATCH] queue: {stats['queue_depth']} files (oldest {stats['oldest_pending']:.1f} s) | "
+        f"ingested: {stats['files']} files, {stats['rows']} rows in {stats['batches']} batches, failed: {stats['failed_files']} | "
+        f"lag: last {lag(stats['last_lag'])}, mean {lag(stats['mean_lag'])}, max {lag(stats['max_lag'])}, "
+        f"over {MAX_LAG_SECONDS:.0f} s: {stats['lagging_files']} files"
+    )
+
+def _write_status():
+    if STATUS_FILE:
+        tmp_path = STATUS_FILE + '.tmp'
+        with open(tmp_path, 'w') as file:
+            json.dump(get_watch_stats(), file, indent=2)
+        os.replace(tmp_path, STATUS_FILE)
+
+# ======================== Main Function ========================
+def _ingest_ready():
+    for format_name, paths in _settled_files().items():
+        for start in range(0, len(paths), MAX_BATCH_FILES):
+            batch = sorted(paths[start:start + MAX_BATCH_FILES])
+            try:
+                stats = ingest_format(format_name, batch, parse_workers=PARSE_WORKERS if len(batch) > 1 else 0)
+                files, rows, failed = stats["files"], stats["rows"], stats["failed_files"]
+            except Exception as e:
+                log(f"[WATCH] Error ingesting {len(batch)} {format_name} files: {e}")
+                files, rows, failed = 0, 0, len(batch)
+
+            _record_batch(batch, files, rows, failed)
+            for path in batch:
+                entry = _pending.pop(path)
+                # Failed files are retried once they change again
+                _seen[path] = (entry["size"], entry["mtime"])
+            _write_status()
+
+def watch(directories=None, use_inotify=True, run_seconds=None):
+    """
+    Watches the drop directories ({directory: format or None}, default
+    WATCH_DIRECTORIES) and ingests every new or changed file once it has
+    settled. Files that are already in the ingestion manifest are skipped, so
+    a restart only loads what arrived in the meantime. Runs until interrupted
+    or for run_seconds.
+    """
+    directories = WATCH_DIRECTORIES if directories is None else directories
+    formats = {os.path.normpath(directory): format_name for directory, format_name in directories.items()}
+    for directory in formats:
+        os.makedirs(directory, exist_ok=True)
+
+    inotify = _inotify_open(formats) if use_inotify else None
+    log(f"[WATCH] Watching {len(formats)} directories ({'inotify' if inotify else 'polling'})")
+
+    for path in _scan(formats):
+        _notice(path, formats)
+
+    end = None if run_seconds is None else time.monotonic() + run_seconds
+    next_stats = time.monotonic() + STATS_INTERVAL
+    try:
+        while end is None or time.monotonic() < end:
+            if inotify:
+                paths = _inotify_read(*inotify, POLL_INTERVAL)
+                if paths is None:
+                    log("[WATCH] inotify queue overflow, rescanning the directories")
+                    paths = _scan(formats)
+            else:
+                time.sleep(POLL_INTERVAL)
+                paths = _scan(formats)
+
+            for path in paths:
+                _notice(path, formats)
+            _ingest_ready()
+
+            if time.monotonic() >= next_stats:
+                log(format_watch_stats())
+                next_stats = time.monotonic() + STATS_INTERVAL
+    except KeyboardInterrupt:
+        log("[WATCH] Stopped")
+    finally:
+        if inotify:
+            os.close(inotify[0])
+    log(format_watch_stats())
+
+# ======================== Execution ========================
+if __name__ == "__main__":
+    watch()
@@ -9,6 +9,8 @@ db_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Databas
 sys.path.append(db_path)
 
 from load_data_into_Database import write_to_database 
+from ingestion_manifest import format_ingestion_report
+from parallel_ingest import ingest_files, format_ingestion_stats
 
 # ==================== Configuration ====================
 DEBUG = True
@@ -20,19 +22,25 @@ def log(msg):
     if DEBUG:
         print(msg)
 
-# ==================== Main Function ====================
-def main():
-    log(f"[INFO] Loading file: {TXT_FILE_PATH}")
-    axis_df = axis.parse_txt_file(TXT_FILE_PATH)
+# ==================== Helper Functions ====================
+def parse_axis_file(file_path):
+    log(f"[INFO] Loading file: {file_path}")
+    axis_df = axis.parse_txt_file(file_path)
 
     # Safely parse timestamps
     axis_df['Timestamp'] = pd.to_datetime(axis_df['Timestamp'], errors='coerce')
     axis_df = axis_df[axis_df['Timestamp'].notna()]  # Remove invalid rows
 
     log(f"[INFO] Preview of parsed data:\n{axis_df.head()}")
+    return axis_df
+
+# ==================== Main Function ====================
+def main():
+    # Only parsed and written if the file is new or changed (see Database/ingestion_manifest.py)
+    stats = ingest_files([TXT_FILE_PATH], TARGET_TABLE, parse_axis_file, write_to_database)
 
-    # Write to database using your existing method
-    write_to_database(axis_df, TARGET_TABLE)
+    log(format_ingestion_stats(stats))
+    log(format_ingestion_report())
 
 # ==================== Execution ====================
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 import sys
@@ -8,6 +9,8 @@ db_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Databas
 sys.path.append(db_path)
 
 from load_data_into_Database import write_to_database  
+from ingestion_manifest import format_ingestion_report
+from parallel_ingest import ingest_files, format_ingestion_stats
 
 # ==================== Configuration ====================
 DEBUG = True
@@ -20,51 +23,199 @@ def log(msg):
     if DEBUG:
         print(msg)
 
-# ==================== Main Function ====================
-def parse_alarm_log(file_path):
-    with open(file_path, 'r') as file:
-        lines = file.readlines()
-
-    cleaned_data = []
-
-    for i in range(len(lines) - 1):
-        line = lines[i]
-        if "NCU_" in line:
-            try:
-                date_start = line[7:16].strip()
-                date_end = line[23:32].strip()
-                error_code = line[39:45].strip()
-                ncu_info = line[52:].strip()
-
-                time_line = lines[i + 1].strip().split()
-                time_start = time_line[0] if len(time_line) > 0 else None
-                time_end = time_line[1] if len(time_line) > 1 else None
-
-                cleaned_data.append([date_start, date_end, error_code, ncu_info, time_start, time_end])
-            except Exception as e:
-                log(f"[WARN] Line {i} could not be processed: {e}")
-
-    df = pd.DataFrame(cleaned_data, columns=["Date Start", "Date End", "Error Code", "NCU Message", "Time Start", "Time End"])
-
-    # Filter: Only keep valid date entries
-    df = df[(df['Date Start'] != "---") & (df['Date End'] != "---")]
-
-    # Create timestamp columns
-    df['Timestamp'] = pd.to_datetime(df['Date Start'] + ' ' + df['Time Start'], format='%d.%m.%y %H:%M:%S.%f', errors='coerce')
-    df['Timestamp End'] = pd.to_datetime(df['Date End'] + ' ' + df['Time End'], format='%d.%m.%y %H:%M:%S.%f', errors='coerce')
+# ==================== Helper Functions ====================
+# Fixed-width layout of an alarm line; the line after it holds start and end time
+DATE_START_FIELD = (7, 16)
+DATE_END_FIELD = (23, 32)
+ERROR_CODE_FIELD = (39, 45)
+MESSAGE_START = 52
+TIMESTAMP_FORMAT = '%d.%m.%y %H:%M:%S.%f'
+CHUNK_SIZE = 16 * 1024 * 1024  # Bytes per chunk when streaming large logs
+ENCODING = 'utf-8'
+
+_WHITESPACE = np.zeros(256, dtype=bool)
+_WHITESPACE[list(b' \t\n\r\x0b\x0c')] = True
+
+def _gather(buf, starts, ends):
+    """Copies buf[start:end] for every row into a fixed-width bytes array (NUL padded)."""
+    lengths = np.maximum(ends - starts, 0)
+    width = max(int(lengths.max(initial=0)), 1)
+    positions = starts[:, None] + np.arange(width)
+    chars = np.where(np.arange(width) < lengths[:, None], buf[np.minimum(positions, len(buf) - 1)], 0)
+    return chars.astype(np.uint8).view(f'S{width}').ravel()
+
+def _strip_bounds(space, token_starts, token_ends, lo, hi):
+    """Bounds of buf[lo:hi].strip() for every row, using the token start/end positions of the buffer."""
+    lo_space = space[np.minimum(lo, len(space) - 1)] | (lo >= hi)
+    first = np.where(lo_space, token_starts[np.minimum(np.searchsorted(token_starts, lo), len(token_starts) - 1)], lo)
+    hi_space = space[np.maximum(hi - 1, 0)] | (lo >= hi)
+    last = np.where(hi_space, token_ends[np.maximum(np.searchsorted(token_ends, hi, side='right') - 1, 0)], hi)
+    empty = (first >= last) | (first < lo) | (first >= hi) | (last <= lo)
+    return np.where(empty, lo, first), np.where(empty, lo, last)
+
+def _decode(values):
+    if not len(values) or np.frombuffer(values.tobytes(), dtype=np.uint8).max() < 128:
+        return pd.Series(values.astype(str), dtype=str)  # Pure ASCII: converted in C
+    return pd.Series(values).str.decode(ENCODING, errors='replace').astype(str)
+
+def _digits(chars, columns):
+    """Integer value of the digit columns of a uint8 character matrix."""
+    value = np.zeros(len(chars), dtype=np.int64)
+    for column in columns:
+        value = value * 10 + chars[:, column].astype(np.int64) - ord('0')
+    return value
+
+def _parse_timestamps(dates, times):
+    """
+    Vectorized equivalent of pd.to_datetime(dates + ' ' + times, format=TIMESTAMP_FORMAT,
+    errors='coerce') for dates 'dd.mm.yy' and times 'HH:MM:SS.f' (1-6 fraction digits).
+    Values in any other layout are passed on to pd.to_datetime.
+    """
+    date_chars = np.frombuffer(dates.astype('S9').tobytes(), dtype=np.uint8).reshape(-1, 9)
+    time_chars = np.frombuffer(times.astype('S16').tobytes(), dtype=np.uint8).reshape(-1, 16)
+    is_digit = lambda chars: (chars >= ord('0')) & (chars <= ord('9'))
+
+    time_length = (time_chars != 0).sum(axis=1)
+    fraction_digits = time_length - 9
+    fraction_mask = (np.arange(6) < fraction_digits[:, None])
+    fraction_chars = np.where(fraction_mask, time_chars[:, 9:15], ord('0'))
+
+    valid = (
+        (date_chars[:, 8] == 0) & (date_chars[:, 2] == ord('.')) & (date_chars[:, 5] == ord('.'))
+        & is_digit(date_chars[:, [0, 1, 3, 4, 6, 7]]).all(axis=1)
+        & (fraction_digits >= 1) & (fraction_digits <= 6)
+        & (time_chars[:, 2] == ord(':')) & (time_chars[:, 5] == ord(':')) & (time_chars[:, 8] == ord('.'))
+        & is_digit(time_chars[:, [0, 1, 3, 4, 6, 7]]).all(axis=1)
+        & (is_digit(fraction_chars) | ~fraction_mask).all(axis=1)
+    )
+
+    day, month, year = _digits(date_chars, [0, 1]), _digits(date_chars, [3, 4]), _digits(date_chars, [6, 7])
+    year += np.where(year < 69, 2000, 1900)  # Same pivot as strptime's %y
+    hour, minute, second = _digits(time_chars, [0, 1]), _digits(time_chars, [3, 4]), _digits(time_chars, [6, 7])
+    microsecond = _digits(fraction_chars, range(6))
+
+    month_start = ((year - 1970) * 12 + np.clip(month, 1, 12) - 1).astype('datetime64[M]')
+    days_in_month = ((month_start + 1).astype('datetime64[D]') - month_start.astype('datetime64[D]')).astype(np.int64)
+    valid &= (month >= 1) & (month <= 12) & (day >= 1) & (day <= days_in_month) & (hour < 24) & (minute < 60) & (second < 60)
+
+    stamps = (
+        month_start.astype('datetime64[D]') + (day - 1)
+    ).astype('datetime64[ns]') + (((hour * 60 + minute) * 60 + second) * 1_000_000 + microsecond) * np.timedelta64(1000, 'ns')
+    stamps[~valid] = np.datetime64('NaT')
+
+    if not valid.all():
+        fallback = np.char.add(np.char.add(dates[~valid], b' '), times[~valid])
+        stamps[~valid] = pd.to_datetime(_decode(fallback), format=TIMESTAMP_FORMAT, errors='coerce').to_numpy()
+    return stamps
+
+def _parse_buffer(data, final):
+    """
+    Parses the alarm entries in data. Unless final, the last complete line is
+    kept back, because it may be the alarm line whose time line is not read yet.
+
+    :return: (DataFrame, number of consumed bytes)
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    newlines = np.flatnonzero(buf == ord('\n'))
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [len(buf)]))
+
+    # Line i is an alarm line if it contains "NCU_" and line i + 1 exists (its time line)
+    usable = len(starts) - 1 if final else len(starts) - 2
+    consumed = len(data) if final else int(starts[max(usable, 0)])
+    if usable <= 0:
+        return _empty_frame(), consumed
+
+    candidates = np.flatnonzero(buf[:-3] == ord('N'))
+    candidates = candidates[(buf[candidates + 1] == ord('C')) & (buf[candidates + 2] == ord('U')) & (buf[candidates + 3] == ord('_'))]
+    alarm_lines = np.searchsorted(starts, candidates, side='right') - 1
+    alarm_lines = alarm_lines[np.diff(alarm_lines, prepend=-1) != 0]  # Sorted, drop repeated hits in one line
+    alarm_lines = alarm_lines[alarm_lines < usable]
+
+    # Whitespace tokens of the whole buffer, used for strip() and split() without a Python loop
+    space = _WHITESPACE[buf]
+    padded = np.concatenate(([True], space, [True]))
+    token_starts = np.flatnonzero(padded[:-2] & ~padded[1:-1])
+    token_ends = np.flatnonzero(~padded[1:-1] & padded[2:]) + 1
+    if len(token_starts) == 0:
+        token_starts = token_ends = np.array([len(buf)])
+
+    line_starts, line_ends = starts[alarm_lines], ends[alarm_lines]
+
+    def field(begin, stop):
+        lo = np.minimum(line_starts + begin, line_ends)
+        hi = np.minimum(line_starts + stop, line_ends)
+        return _gather(buf, *_strip_bounds(space, token_starts, token_ends, lo, hi))
+
+    date_start = field(*DATE_START_FIELD)
+    date_end = field(*DATE_END_FIELD)
+    error_code = field(*ERROR_CODE_FIELD)
+    message = _gather(buf, *_strip_bounds(space, token_starts, token_ends,
+                                          np.minimum(line_starts + MESSAGE_START, line_ends), line_ends))
+
+    # Time line = following line (shift by one): its first and second token
+    time_starts, time_ends = starts[alarm_lines + 1], ends[alarm_lines + 1]
+    first_token = np.searchsorted(token_starts, time_starts)
+    times = []
+    for token in (first_token, first_token + 1):
+        token = np.minimum(token, len(token_starts) - 1)
+        valid = (token_starts[token] >= time_starts) & (token_starts[token] < time_ends)
+        times.append(_gather(buf, np.where(valid, token_starts[token], 0), np.where(valid, token_ends[token], 0)))
+
+    return _build_frame(date_start, date_end, error_code, message, *times), consumed
+
+def _empty_frame():
+    return _build_frame(*[np.array([], dtype='S1')] * 6)
+
+def _build_frame(date_start, date_end, error_code, message, time_start, time_end):
+    valid = (date_start != b'---') & (date_end != b'---')
+
+    # Start and end timestamps are parsed together in one call
+    count = int(valid.sum())
+    stamps = _parse_timestamps(
+        np.concatenate((date_start[valid], date_end[valid])),
+        np.concatenate((time_start[valid], time_end[valid])),
+    )
+
+    df = pd.DataFrame({
+        "Error Code": _decode(error_code[valid]),
+        "NCU Message": _decode(message[valid]),
+        "Timestamp": stamps[:count],
+        "Timestamp End": stamps[count:],
+    })
 
     # Remove invalid timestamps
-    df = df[df['Timestamp'].notna() & df['Timestamp End'].notna()]
-
-    # Drop unused columns
-    df.drop(columns=['Date Start', 'Time Start', 'Date End', 'Time End'], inplace=True)
+    return df[df['Timestamp'].notna() & df['Timestamp End'].notna()].reset_index(drop=True)
 
-    return df
-
-# ==================== Execution ====================
-def main():
-    log(f"[INFO] Reading file: {TXT_FILE_PATH}")
-    df_cleaned = parse_alarm_log(TXT_FILE_PATH)
+# ==================== Main Function ====================
+def iter_alarm_log(file_path, chunk_size=CHUNK_SIZE):
+    """Yields the alarm entries of file_path as DataFrames, reading chunk_size bytes at a time."""
+    carry = b''
+    with open(file_path, 'rb') as file:
+        while True:
+            block = file.read(chunk_size)
+            data = carry + block
+            df, consumed = _parse_buffer(data, final=not block)
+            carry = data[consumed:]
+            if len(df):
+                yield df
+            if not block:
+                return
+
+def parse_alarm_log(file_path, chunk_size=CHUNK_SIZE):
+    """
+    Parses a fixed-width alarm log: every line containing "NCU_" is an alarm,
+    the following line holds its start and end time. Field positions are
+    byte offsets, which equal the character positions for ASCII lines.
+    """
+    chunks = list(iter_alarm_log(file_path, chunk_size))
+    if not chunks:
+        return _empty_frame()
+    return pd.concat(chunks, ignore_index=True)
+
+def parse_and_export_alarm_log(file_path):
+    log(f"[INFO] Reading file: {file_path}")
+    df_cleaned = parse_alarm_log(file_path)
 
     log(f"[INFO] Preview of cleaned data:\n{df_cleaned.head()}")
 
@@ -72,8 +223,16 @@ def main():
         df_cleaned.to_csv(EXPORT_CSV_PATH, index=False)
         log(f"[INFO] Export completed: {EXPORT_CSV_PATH}")
 
-    # Write to database using your existing method
-    write_to_database(df_cleaned, TARGET_TABLE)
+    return df_cleaned
+
+# ==================== Execution ====================
+def main():
+    # The alarm log is extended continuously: the manifest makes sure that only
+    # the entries after the already loaded ones are written
+    stats = ingest_files([TXT_FILE_PATH], TARGET_TABLE, parse_and_export_alarm_log, write_to_database)
+
+    log(format_ingestion_stats(stats))
+    log(format_ingestion_report())
 
 if __name__ == "__main__":
-    df = main()
+    main()
@@ -8,45 +8,58 @@ db_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Databas
 sys.path.append(db_path)
 
 from load_data_into_Database import write_to_database
+from engine_pool import format_pool_stats
+from ingestion_manifest import format_ingestion_report
+from parallel_ingest import ingest_files, format_ingestion_stats
 
 # ==================== Configuration ====================
 DEBUG = True
 ENERGY_FOLDER_PATH = './Testdaten/KW12/EEnergy/'
 TABLE_NAME = 'Energy'  # Keep table name as is
+PARSE_WORKERS = 4      # Processes parsing CSV files
+WRITE_WORKERS = 2      # Threads writing to the database
 
 # ==================== Logging ====================
 def log(msg):
     if DEBUG:
         print(msg)
 
+# ==================== Helper Functions ====================
+def parse_energy_file(file_path):
+    df = pd.read_csv(file_path, skiprows=6, names=[
+        "timestamp", "Power (W)", "factor", "apparent", "Current (A)", "Voltage (V)"
+    ])
+
+    # Clean and convert timestamps
+    df['Timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
+    df = df.dropna(subset=['Timestamp'])
+    df['Timestamp'] = df['Timestamp'].dt.tz_localize(None)
+
+    # Drop unnecessary columns
+    df.drop(columns=["timestamp", "factor", "apparent"], inplace=True)
+
+    # Debug output
+    log(df.head())
+    return df
+
+def write_energy(df, table_name):
+    return write_to_database(df, table_name, method='copy')
+
 # ==================== Main Function ====================
 def process_energy_files(folder_path):
-    for filename in os.listdir(folder_path):
-        if filename.endswith('.csv'):
-            file_path = os.path.join(folder_path, filename)
-            log(f"[INFO] Processing file: {filename}")
-            
-            try:
-                df = pd.read_csv(file_path, skiprows=6, names=[
-                    "timestamp", "Power (W)", "factor", "apparent", "Current (A)", "Voltage (V)"
-                ])
-
-                # Clean and convert timestamps
-                df['Timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
-                df = df.dropna(subset=['Timestamp'])
-                df['Timestamp'] = df['Timestamp'].dt.tz_localize(None)
-
-                # Drop unnecessary columns
-                df.drop(columns=["timestamp", "factor", "apparent"], axis=1, inplace=True)
-
-                # Debug output
-                log(df.head())
-
-                # Write data to database
-                write_to_database(df, TABLE_NAME)
-
-            except Exception as e:
-                log(f"[ERROR] Error processing file {filename}: {e}")
+    file_paths = [
+        os.path.join(folder_path, filename)
+        for filename in sorted(os.listdir(folder_path)) if filename.endswith('.csv')
+    ]
+    log(f"[INFO] {len(file_paths)} files found in {folder_path}")
+
+    # Files are parsed in parallel; only new or changed files are parsed and written (see Database/ingestion_manifest.py)
+    stats = ingest_files(file_paths, TABLE_NAME, parse_energy_file, write_energy,
+                         parse_workers=PARSE_WORKERS, write_workers=WRITE_WORKERS)
+
+    log(format_ingestion_stats(stats))
+    log(format_ingestion_report())
+    log(format_pool_stats())
 
 # ==================== Execution ====================
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
 import pandas as pd
+from functools import partial
 
 import sys
 import os
@@ -7,21 +8,88 @@ import os
 db_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Database'))
 sys.path.append(db_path)
 
-from load_data_into_Database import write_to_database 
+from load_data_into_Database import write_to_database
+from engine_pool import format_pool_stats
+from ingestion_manifest import format_ingestion_report
+from parallel_ingest import ingest_files, format_ingestion_stats
+from refactore_keyence_toolid import load_tool_limits, build_interval_table, correct_dataframe, format_correction_report
+from refactore_keyence_sort_toolid import restructure_dataframe, FILL_VALUE
 
 # ==================== Configuration ====================
-CSV_FILE_PATH = "./transformierte_dateien/202512Keyence.csv"
+DEBUG = True
+KEYENCE_FOLDER_PATH = "./Testdaten/KW12/Keyence/"  # Raw Keyence exports
 TABLE_NAME = "Keyence"
+PARSE_WORKERS = 4      # Processes correcting and restructuring files
+WRITE_WORKERS = 2      # Threads writing to the database
 
-# ==================== Main Script ====================
-# Load the CSV file
-data = pd.read_csv(CSV_FILE_PATH)
+# Columns with incorrect measurement values, plus the raw end time (replaced by "Timestamp")
+DROP_COLUMNS = ["Measurement End Time", "Measurement ToolID.207", "Measurement ToolID.201"]
 
-# Convert timestamps to proper datetime format
-data['Timestamp'] = pd.to_datetime(data['Measurement End Time'], errors='coerce')  # Invalid timestamps become NaT
+# Folder for the intermediate CSV files of the former scripts (korrigierte_dateien/,
+# transformierte_dateien/), None = do not write them
+INTERMEDIATE_DIRECTORY = None
 
-# Drop columns with incorrect measurement values
-data.drop(columns=["Measurement End Time", "Measurement ToolID.207", "Measurement ToolID.201"], axis=1, inplace=True)
+# ==================== Logging ====================
+def log(msg):
+    if DEBUG:
+        print(msg)
 
-# Write cleaned data to the database
-write_to_database(data, TABLE_NAME)
+# ==================== Helper Functions ====================
+def _save_intermediate(df, intermediate_directory, folder, file_path):
+    output_directory = os.path.join(intermediate_directory, folder)
+    os.makedirs(output_directory, exist_ok=True)
+    output_path = os.path.join(output_directory, os.path.basename(file_path))
+    df.to_csv(output_path, index=False)
+    log(f"Intermediate file saved to: {output_path}")
+
+def parse_keyence_file(file_path, interval_table, intermediate_directory=None):
+    """
+    Reads a raw Keyence export once and does all steps in memory: ToolID
+    correction (refactore_keyence_toolid.py), one column per tool
+    (refactore_keyence_sort_toolid.py), timestamp parsing and column drops.
+    interval_table comes from build_interval_table().
+    """
+    df = pd.read_csv(file_path)
+
+    corrected_df, counts = correct_dataframe(df, interval_table)
+    log(f"{file_path}: {format_correction_report(counts)}")
+    if intermediate_directory is not None:
+        _save_intermediate(corrected_df, intermediate_directory, "korrigierte_dateien", file_path)
+
+    # Missing measurements stay NaN (the intermediate files use "N/A" like before)
+    data = restructure_dataframe(corrected_df, fill_value=None)
+    if intermediate_directory is not None:
+        _save_intermediate(data.fillna(FILL_VALUE), intermediate_directory, "transformierte_dateien", file_path)
+
+    # Convert timestamps to proper datetime format
+    data['Timestamp'] = pd.to_datetime(data['Measurement End Time'], errors='coerce')  # Invalid timestamps become NaT
+    data.drop(columns=DROP_COLUMNS, errors='ignore', inplace=True)
+    return data
+
+def write_keyence(df, table_name):
+    return write_to_database(df, table_name, method='copy')
+
+# ==================== Main Function ====================
+def process_keyence_files(file_paths, intermediate_directory=INTERMEDIATE_DIRECTORY):
+    # Limits are loaded (and overlaps reported) once, the worker processes get the finished lookup table
+    interval_table = build_interval_table(load_tool_limits())
+    parse_function = partial(parse_keyence_file, interval_table=interval_table,
+                             intermediate_directory=intermediate_directory)
+
+    # Only new or changed files are parsed and written (see Database/ingestion_manifest.py)
+    stats = ingest_files(file_paths, TABLE_NAME, parse_function, write_keyence,
+                         parse_workers=PARSE_WORKERS, write_workers=WRITE_WORKERS)
+
+    log(format_ingestion_stats(stats))
+    log(format_ingestion_report())
+    log(format_pool_stats())
+
+# ==================== Execution ====================
+if __name__ == "__main__":
+    file_paths = [
+        os.path.join(KEYENCE_FOLDER_PATH, filename)
+        for filename in sorted(os.listdir(KEYENCE_FOLDER_PATH)) if filename.endswith('.csv')
+    ]
+    log(f"[INFO] {len(file_paths)} files found in {KEYENCE_FOLDER_PATH}")
+
+    process_keyence_files(file_paths)
@@ -1,7 +1,7 @@
 import os
 import pandas as pd
-from datetime import datetime
 import sys
+from functools import partial
 
 # ===================== Custom Paths & Imports =========================
 # Add relative path to the "Database" folder to import load_data_into_Database
@@ -9,10 +9,28 @@ db_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Databas
 sys.path.append(db_path)
 
 from load_data_into_Database import write_to_database
+from ingestion_manifest import check_file, record_file, record_skip, format_ingestion_report, SKIP, CONFLICT
+from parallel_ingest import ingest_files, format_ingestion_stats
+from gemvm_trace import read_trace
+from production_intervals import detect_intervals
+from gemvm_catalog import update_catalog, file_index_of
 
 # ======================== Configuration ========================
 DEBUG = True  # Set to False to suppress output
 SAVE_TEMPERATURE_DATA = False  # True = save temperature data, False = only production times
+PARSE_WORKERS = 4  # Processes parsing trace files
+WRITE_WORKERS = 2  # Threads writing to the database
+CATALOG_FILE = None  # GEMVM file catalog kept between runs (see gemvm_catalog.py), e.g. 'gemvm_catalog.parquet'; None = scan every run
+
+# WARNING: BECAUSE OF ANONYMISED DATA THIS SECTION IS NOT INCLUDED TO SECURE THE GUIDELINES
+# PLEASE INSERT YOUR COLUMNS IN HERE
+SELECTED_COLUMNS = [
+    'YOUR COLUMNS HERE'
+]
+
+ALL_COLUMNS = [
+    'YOUR COLUMS HERE'
+]
 
 # ======================== Logging ==============================
 def log(message):
@@ -21,70 +39,48 @@ def log(message):
 
 # ======================== Functions ===========================
 
-def extract_timestamp(filename):
-    """Extract the timestamp from the filename."""
-    date_time_str = "_".join(filename.split("_")[-2:]).replace(".csv", "")
-    return datetime.strptime(date_time_str, "%Y-%m-%d_%H-%M-%S")
-
-def process_folder(folder):
-    """Processes all relevant CSV files in a folder."""
-
-    files = sorted([
-        f for f in os.listdir(folder)
-        if f.startswith("GEMVM_Export_Trace_S1_2025") and not f.endswith("E.csv")
-    ])
-
-    log(f"{len(files)} files found in {folder}")
-
-    time_intervals = []
-    prev_timestamp = None
-    start_timestamp = None
-
-    # WARNING: BECAUSE OF ANONYMISED DATA THIS SECTION IS NOT INCLUDED TO SECURE THE GUIDELINES
-    # PLEASE INSERT YOUR COLUMNS IN HERE
-    selected_columns = [
-        'YOUR COLUMNS HERE'
-    ]
-
-    all_columns = [
-        'YOUR COLUMS HERE'
-    ]
-
-    for file in files:
-        filepath = os.path.join(folder, file)
-
-        # Extract timestamp for production interval
-        current_timestamp = extract_timestamp(file)
-
-        # Interval logic
-        if prev_timestamp is None or (current_timestamp - prev_timestamp).seconds > 3:
-            if start_timestamp:
-                time_intervals.append({"Timestamp": start_timestamp})
-            start_timestamp = current_timestamp
-        prev_timestamp = current_timestamp
-
-        # Process temperature data (only if flag is set)
-        if SAVE_TEMPERATURE_DATA:
-            try:
-                df = pd.read_csv(filepath, skiprows=5, delimiter=";", header=None, names=all_columns)
-                df = df[selected_columns]
-                df['Timestamp'] = pd.to_datetime(df['LocalTime UTC'], utc=True).dt.tz_localize(None)
-                write_to_database(df, "Temperatur Lang")
-                log(f"Temperature data saved: {file}")
-            except Exception as e:
-                log(f"Error reading file {file}: {e}")
-
-    # Save last interval
-    if start_timestamp:
-        time_intervals.append({"Timestamp": start_timestamp})
-
-    # Save production times
-    interval_df = pd.DataFrame(time_intervals)
-    interval_df['Timestamp'] = pd.to_datetime(interval_df['Timestamp'])
-    write_to_database(interval_df, "Produktionszeiten")
-
-    log("\nDetected production time intervals:")
+def write_trace(df, table_name):
+    return write_to_database(df, table_name, method='copy')
+
+def write_production_intervals(intervals):
+    """Writes the interval starts, skipping those whose start file was already written in an earlier run."""
+    new_intervals = []
+    for start, start_file in zip(intervals["Start"], intervals["Start File"]):
+        state, _, file_info = check_file(start_file, "Produktionszeiten")
+        if state == SKIP:
+            record_skip(file_info)
+        elif state != CONFLICT:  # A rewritten start file still marks an interval that was written before
+            new_intervals.append((start, file_info))
+
+    interval_df = pd.DataFrame({"Timestamp": pd.to_datetime([timestamp for timestamp, _ in new_intervals])})
+    if new_intervals and write_to_database(interval_df, "Produktionszeiten"):
+        for _, file_info in new_intervals:
+            record_file(file_info, "Produktionszeiten", 1)
+    return interval_df
+
+def process_folders(folders):
+    """Processes all relevant CSV files in the folders."""
+
+    # Production intervals from the file names (see production_intervals.py), via the file catalog
+    file_index = file_index_of(update_catalog(folders, CATALOG_FILE, recursive=False), 'Trace')
+    intervals = detect_intervals(file_index)
+    log(f"[INFO] {len(intervals)} production intervals in {len(file_index)} files")
+
+    # Process temperature data (only if flag is set): parsed in parallel, already loaded files are skipped
+    if SAVE_TEMPERATURE_DATA:
+        stats = ingest_files(
+            file_index["File"].tolist(), "Temperatur Lang",
+            partial(read_trace, all_columns=ALL_COLUMNS, selected_columns=SELECTED_COLUMNS), write_trace,
+            parse_workers=PARSE_WORKERS, write_workers=WRITE_WORKERS
+        )
+        log(format_ingestion_stats(stats))
+
+    # Save production times (only intervals that are not in the database yet)
+    interval_df = write_production_intervals(intervals)
+
+    log("\nNew production time intervals:")
     log(interval_df)
+    log(format_ingestion_report())
 
 # ======================== Execution ===========================
 
@@ -93,5 +89,4 @@ if __name__ == "__main__":
         "2025-03-20_1"
     ]
 
-    for folder in folder_list:
-        process_folder(folder)
+    process_folders(folder_list)
@@ -0,0 +1,239 @@
+import os
+import re
+import sys
+import glob
+import time
+from functools import partial
+
+# ===================== Custom Paths & Imports =========================
+# Add relative path to the "Database" folder to import load_data_into_Database
+db_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Database'))
+sys.path.append(db_path)
+
+from load_data_into_Database import write_to_database
+from parallel_ingest import ingest_files, DEFAULT_PARSE_WORKERS, DEFAULT_WRITE_WORKERS
+import insert_temperature
+from insert_energy import parse_energy_file, write_energy
+from insert_alarmlog import parse_alarm_log
+from insert_achseneinstellung import parse_axis_file
+from insert_refactored_keyence_data import parse_keyence_file, write_keyence
+from refactore_keyence_toolid import load_tool_limits, build_interval_table
+from read_stoerungsgruende import parse_excel_file
+from ctm_parser import parse_ctm_file, HEADER_ROWS as CTM_HEADER_ROWS
+from ctm_store import import_ctm_files
+from gemvm_trace import read_trace
+from gemvm_fft import read_fft_file, import_fft_files, FILE_PATTERN as FFT_FILE_PATTERN
+from production_intervals import detect_production_intervals, FILE_PATTERN as TRACE_FILE_PATTERN
+
+# ======================== Configuration ========================
+DEBUG = True
+SNIFF_BYTES = 4096       # Bytes read from the start of a file to detect its format
+ENERGY_HEADER_ROWS = 6   # Lines before the first measurement (see insert_energy.parse_energy_file)
+
+ENERGY_LINE = re.compile(rb'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}[^,]*(,[^,]*){5}')
+ALARM_LINE = re.compile(rb'^ *\d{2}\.\d{2}\.\d{2} .*NCU_', re.MULTILINE)
+AXIS_LINE = re.compile(rb'\d{2}\.\d{2}\.\d{2} \d{2}:\d{2}:\d{2};[^;]*;[^;]*;[^;]*->[^;]*;')
+CTM_TIMESTAMP = re.compile(rb'\t *\d{2}\.\d{2}\.\d{4} \d{2}:\d{2}:\d{2}')
+EXCEL_MAGIC = (b'PK\x03\x04', b'\xd0\xcf\x11\xe0')  # .xlsx (zip) and .xls (OLE2)
+EXCEL_SUFFIXES = ('.xlsx', '.xlsm', '.xls')
+
+# ======================== State ========================
+# Format name -> {"sniff", "parse", "table", "write", "ingest"}, in detection order
+FORMATS = {}
+
+_interval_table = None  # ToolID lookup table of the Keyence correction, built on first use
+_trace_index = None     # File index of production_intervals.py, updated incrementally
+
+# ======================== Logging ========================
+def log(msg):
+    if DEBUG:
+        print(msg)
+
+# ======================== Registry ========================
+def register_format(name, sniff, parse_function, target_table=None, write_function=write_to_database, ingest_function=None):
+    """
+    Registers a raw file format. Formats are tried in registration order, the
+    first one whose sniff function matches is used.
+
+    sniff(file_name, head) -> bool gets the base name and the first
+    SNIFF_BYTES bytes of the file. parse_function(file_path) returns the parsed
+    data (a DataFrame for formats loaded into target_table with
+    write_function). Formats that are not loaded row by row into a table pass
+    ingest_function(file_paths, parse_workers, write_workers) -> stats, with
+    stats in the layout of parallel_ingest.ingest_files().
+    """
+    FORMATS[name] = {
+        "sniff": sniff, "parse": parse_function, "table": target_table,
+        "write": write_function, "ingest": ingest_function,
+    }
+
+def read_head(file_path, size=SNIFF_BYTES):
+    with open(file_path, 'rb') as f:
+        return f.read(size)
+
+def detect_format(file_path, head=None):
+    """Name of the first registered format matching the file, None if no format matches."""
+    head = read_head(file_path) if head is None else head
+    name = os.path.basename(file_path)
+    for format_name, entry in FORMATS.items():
+        if entry["sniff"](name, head):
+            return format_name
+    return None
+
+def parse_file(file_path, format_name=None):
+    """Parses a file with the parser of its format (detected if not given)."""
+    format_name = format_name or detect_format(file_path)
+    if format_name is None:
+        raise ValueError(f"Unknown file format: {file_path}")
+    return FORMATS[format_name]["parse"](file_path)
+
+def expand_paths(patterns):
+    """Files for a list of paths, glob patterns ('**' matches subfolders) and folders (searched recursively)."""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, _, files in sorted(os.walk(pattern)):
+                paths.extend(os.path.join(root, file_name) for file_name in sorted(files))
+        elif glob.has_magic(pattern):
+            paths.extend(path for path in sorted(glob.glob(pattern, recursive=True)) if os.path.isfile(path))
+        else:
+            paths.append(pattern)
+    return list(dict.fromkeys(paths))
+
+def group_by_format(file_paths):
+    """({format: [paths]} in registration order, [paths of unknown format])."""
+    groups, unknown = {}, []
+    for file_path in file_paths:
+        try:
+            format_name = detect_format(file_path)
+        except OSError as e:
+            log(f"[WARN] {file_path} could not be read: {e}")
+            format_name = None
+        if format_name is None:
+            unknown.append(file_path)
+        else:
+            groups.setdefault(format_name, []).append(file_path)
+    return {name: groups[name] for name in FORMATS if name in groups}, unknown
+
+def ingest_format(format_name, file_paths, parse_workers=DEFAULT_PARSE_WORKERS, write_workers=DEFAULT_WRITE_WORKERS):
+    """Ingests files of one format. :return: stats in the layout of parallel_ingest.ingest_files()."""
+    entry = FORMATS[format_name]
+    if entry["ingest"] is not None:
+        return entry["ingest"](file_paths, parse_workers=parse_workers, write_workers=write_workers)
+    return ingest_files(file_paths, entry["table"], entry["parse"], entry["write"],
+                        parse_workers=parse_workers, write_workers=write_workers)
+
+def ingest_paths(file_paths, parse_workers=DEFAULT_PARSE_WORKERS, write_workers=DEFAULT_WRITE_WORKERS):
+    """
+    Detects the format of every file and ingests each format in one call, so
+    parsers are imported and set up once for all files.
+
+    :return: ({format: stats}, [paths of unknown format])
+    """
+    groups, unknown = group_by_format(file_paths)
+    for file_path in unknown:
+        log(f"[WARN] Unknown format, skipped: {file_path}")
+
+    results = {}
+    for format_name, paths in groups.items():
+        log(f"[INFO] {len(paths)} {format_name} files")
+        results[format_name] = ingest_format(format_name, paths, parse_workers, write_workers)
+    return results, unknown
+
+# ======================== Sniffing Functions ========================
+def _lines(head, count):
+    return head.splitlines()[:count]
+
+def _is_energy(name, head):
+    lines = _lines(head, ENERGY_HEADER_ROWS + 1)
+    return len(lines) > ENERGY_HEADER_ROWS and ENERGY_LINE.fullmatch(lines[ENERGY_HEADER_ROWS].rstrip()) is not None
+
+def _is_alarm_log(name, head):
+    return ALARM_LINE.search(head) is not None
+
+def _is_axis_log(name, head):
+    lines = _lines(head, 1)
+    return bool(lines) and AXIS_LINE.match(lines[0]) is not None
+
+def _is_keyence(name, head):
+    lines = _lines(head, 1)
+    return bool(lines) and b'Measurement End Time' in lines[0] and b'ToolID' in lines[0]
+
+def _is_ctm(name, head):
+    # Recorder numbers, timestamps and curve names, possibly after one metadata line
+    return any(CTM_TIMESTAMP.search(line) for line in _lines(head, CTM_HEADER_ROWS + 1))
+
+def _is_excel(name, head):
+    return name.lower().endswith(EXCEL_SUFFIXES) and head.startswith(EXCEL_MAGIC)
+
+def _name_matches(pattern, name, head):
+    return pattern.fullmatch(name) is not None
+
+# ======================== Parse and Ingest Functions ========================
+def _summary(file_paths, files, rows, start):
+    """Stats in the layout of ingest_files() for formats that are not loaded by it."""
+    return {
+        "files": files, "rows": rows, "bytes": sum(os.path.getsize(path) for path in file_paths),
+        "skipped_files": len(file_paths) - files, "failed_files": 0, "seconds": time.perf_counter() - start,
+    }
+
+def _keyence_interval_table():
+    global _interval_table
+    if _interval_table is None:
+        _interval_table = build_interval_table(load_tool_limits())
+    return _interval_table
+
+def _parse_keyence(file_path):
+    return parse_keyence_file(file_path, _keyence_interval_table())
+
+def _ingest_keyence(file_paths, parse_workers, write_workers):
+    # The worker processes get the finished lookup table instead of loading the limits themselves
+    parse_function = partial(parse_keyence_file, interval_table=_keyence_interval_table())
+    return ingest_files(file_paths, 'Keyence', parse_function, write_keyence,
+                        parse_workers=parse_workers, write_workers=write_workers)
+
+def _parse_stoerungsgruende(file_path):
+    df = parse_excel_file(file_path)
+    if df.empty:
+        raise ValueError(f"{file_path} could not be read or has no rows")
+    return df
+
+def _ingest_traces(file_paths, parse_workers, write_workers):
+    """Updates the production intervals with the folders of the trace files; stores the temperatures if enabled."""
+    global _trace_index
+    start = time.perf_counter()
+    folders = sorted({os.path.dirname(path) for path in file_paths})
+    intervals, _trace_index = detect_production_intervals(folders, file_index=_trace_index)
+    new_intervals = insert_temperature.write_production_intervals(intervals)
+
+    if not insert_temperature.SAVE_TEMPERATURE_DATA:
+        return _summary(file_paths, len(file_paths), len(new_intervals), start)
+    return ingest_files(file_paths, 'Temperatur Lang', FORMATS['trace']["parse"], insert_temperature.write_trace,
+                        parse_workers=parse_workers, write_workers=write_workers)
+
+def _import_fft(file_paths, parse_workers, write_workers):
+    start = time.perf_counter()
+    return _summary(file_paths, import_fft_files(file_paths), 0, start)
+
+def _import_ctm(file_paths, parse_workers, write_workers):
+    start = time.perf_counter()
+    return _summary(file_paths, import_ctm_files(file_paths), 0, start)
+
+# ======================== Formats ========================
+# GEMVM exports are recognized by their file names, which carry the export type and timestamp
+register_format('trace', partial(_name_matches, TRACE_FILE_PATTERN),
+                partial(read_trace, all_columns=insert_temperature.ALL_COLUMNS,
+                        selected_columns=insert_temperature.SELECTED_COLUMNS),
+                ingest_function=_ingest_traces)
+register_format('fft', partial(_name_matches, FFT_FILE_PATTERN), read_fft_file, ingest_function=_import_fft)
+register_format('stoerungsgruende', _is_excel, _parse_stoerungsgruende, 'Stoergruende')
+register_format('keyence', _is_keyence, _parse_keyence, 'Keyence', write_keyence, ingest_function=_ingest_keyence)
+register_format('ctm', _is_ctm, parse_ctm_file, ingest_function=_import_ctm)
+register_format('alarm', _is_alarm_log, parse_alarm_log, 'Alarm')
+register_format('axis', _is_axis_log, parse_axis_file, 'Achse')
+register_format('energy', _is_energy, parse_energy_file, 'Energy', write_energy)
+
+# ======================== Example Call ========================
+if __name__ == "__main__":
+    for file_path in expand_paths(['./Testdaten/KW12']):
+        print(detect_format(file_path), file_path)
@@ -0,0 +1,125 @@
+import os
+import re
+import numpy as np
+import pandas as pd
+
+# ======================== Configuration ========================
+DEBUG = True
+# Trace exports are written every few seconds while the machine is producing.
+# "..._S1_2025-03-20_10-15-30E.csv" files are excluded.
+FILE_PATTERN = re.compile(r'GEMVM_Export_Trace_S1_(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})\.csv')
+TIMESTAMP_FORMAT = '%Y-%m-%d_%H-%M-%S'
+MAX_GAP = pd.Timedelta(seconds=3)  # A larger gap between two files starts a new production interval
+
+INDEX_COLUMNS = ['Timestamp', 'File', 'Folder']
+
+# ======================== Logging ========================
+def log(msg):
+    if DEBUG:
+        print(msg)
+
+# ======================== Helper Functions ========================
+def _list_folder(folder, pattern, known):
+    """(file path, timestamp string) of the trace files in folder that are not in known, without opening them."""
+    entries = []
+    with os.scandir(folder) as it:
+        for entry in it:
+            if entry.path in known:
+                continue
+            match = pattern.fullmatch(entry.name)
+            if match:
+                entries.append((entry.path, match.group(1)))
+    return entries
+
+def _parse_file_timestamps(values, timestamp_format):
+    """
+    Timestamps of the file names. The default layout is rewritten to ISO
+    8601 in a byte matrix and parsed by NumPy; other formats or invalid dates
+    go through pd.to_datetime, and files with invalid dates are dropped.
+    """
+    if timestamp_format == TIMESTAMP_FORMAT and len(values):
+        chars = np.array(values, dtype='S19').view(np.uint8).reshape(-1, 19).copy()
+        chars[:, 10] = ord('T')
+        chars[:, [13, 16]] = ord(':')
+        try:
+            return pd.Series(chars.view('S19').ravel().astype('datetime64[s]').astype('datetime64[ns]'))
+        except ValueError:
+            pass
+
+    timestamps = pd.to_datetime(pd.Series(values, dtype=str), format=timestamp_format, errors='coerce')
+    if timestamps.isna().any():
+        log(f"[WARN] {timestamps.isna().sum()} file names with invalid timestamps are ignored")
+    return timestamps.astype('datetime64[ns]')
+
+# ======================== Public Functions ========================
+def scan_folders(folders, file_index=None, pattern=FILE_PATTERN, timestamp_format=TIMESTAMP_FORMAT, label='trace'):
+    """
+    Builds the file index (Timestamp, File, Folder) of all trace files in the
+    folders from their names, sorted by Timestamp. With the file_index of an
+    earlier scan only files that are not in it yet are parsed and added, so
+    the index can be updated cheaply when new files appear. label names the
+    files in the log (e.g. 'FFT' with the pattern of gemvm_fft.py).
+    """
+    known = set() if file_index is None else set(file_index['File'])
+    new_entries = {'File': [], 'Timestamp': [], 'Folder': []}
+    for folder in folders:
+        for path, timestamp in _list_folder(folder, pattern, known):
+            new_entries['File'].append(path)
+            new_entries['Timestamp'].append(timestamp)
+            new_entries['Folder'].append(folder)
+
+    new_files = pd.DataFrame({
+        'Timestamp': _parse_file_timestamps(new_entries['Timestamp'], timestamp_format),
+        'File': pd.Series(new_entries['File'], dtype=str),
+        'Folder': pd.Series(new_entries['Folder'], dtype=str),
+    })
+    new_files = new_files.dropna(subset=['Timestamp'])
+    log(f"[INFO] {len(new_files)} new {label} files in {len(folders)} folders")
+
+    if file_index is not None and len(file_index):
+        if new_files.empty:
+            return file_index
+        new_files = pd.concat([file_index, new_files], ignore_index=True)
+    return new_files.sort_values(['Timestamp', 'File'], kind='stable').reset_index(drop=True)[INDEX_COLUMNS]
+
+def detect_intervals(file_index, max_gap=MAX_GAP):
+    """
+    Splits the sorted file index into production intervals: a new interval
+    starts wherever two consecutive files are more than max_gap apart.
+
+    :return: DataFrame with Start, End, Start File, End File and Files (number of files) per interval.
+    """
+    if file_index.empty:
+        return pd.DataFrame({
+            'Start': pd.Series(dtype='datetime64[ns]'), 'End': pd.Series(dtype='datetime64[ns]'),
+            'Start File': pd.Series(dtype=str), 'End File': pd.Series(dtype=str), 'Files': pd.Series(dtype=np.int64),
+        })
+
+    timestamps = file_index['Timestamp'].to_numpy(dtype='datetime64[ns]')
+    gaps = np.diff(timestamps) > np.timedelta64(max_gap.value, 'ns')
+    starts = np.concatenate(([0], np.flatnonzero(gaps) + 1))
+    ends = np.concatenate((starts[1:], [len(timestamps)])) - 1
+
+    files = file_index['File'].to_numpy()
+    return pd.DataFrame({
+        'Start': timestamps[starts], 'End': timestamps[ends],
+        'Start File': files[starts], 'End File': files[ends],
+        'Files': ends - starts + 1,
+    })
+
+def detect_production_intervals(folders, max_gap=MAX_GAP, file_index=None):
+    """
+    Scans the folders and detects the production intervals in one call.
+    Pass the returned file index back in to only parse files added since.
+
+    :return: (intervals, file_index)
+    """
+    file_index = scan_folders(folders, file_index)
+    intervals = detect_intervals(file_index, max_gap)
+    log(f"[INFO] {len(intervals)} production intervals in {len(file_index)} files")
+    return intervals, file_index
+
+# ======================== Example Call ========================
+if __name__ == "__main__":
+    intervals, file_index = detect_production_intervals(["2025-03-20_1"])
+    print(intervals)
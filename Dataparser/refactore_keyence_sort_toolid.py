@@ -1,14 +1,102 @@
+import numpy as np
 import pandas as pd
 import os
 
 # ==================== Configuration ====================
 DEBUG = True  # True = with output, False = silent
+TIMESTAMP_COL = "Measurement End Time"
+MEASUREMENT_START_COL = "Measurement Start Time"
+FILL_VALUE = "N/A"
 
 # ==================== Logging Function ====================
 def log(msg):
     if DEBUG:
         print(msg)
 
+# ==================== Helper Functions ====================
+def tool_value_pairs(df):
+    """ToolID columns and their value column (four columns further right)."""
+    return [
+        (col, df.columns[i + 4])
+        for i, col in enumerate(df.columns)
+        if "ToolID" in col and i + 4 < len(df.columns)
+    ]
+
+def _tool_id_values(column):
+    """
+    ToolIDs as int(tool_id) would convert them, as float array (NaN = missing
+    or not convertible), plus the number of values that could not be converted.
+    """
+    if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+        values = np.trunc(column.to_numpy(dtype=np.float64, na_value=np.nan))
+        invalid = np.isinf(values)
+        values[invalid] = np.nan
+        return values, int(invalid.sum())
+
+    present = column.notna().to_numpy()
+    stripped = pd.Series(column.to_numpy(dtype=object)[present]).astype(str).str.strip()
+    is_integer = stripped.str.fullmatch(r'[+-]?\d+').to_numpy(dtype=bool)
+
+    values = np.full(len(column), np.nan)
+    values[np.flatnonzero(present)[is_integer]] = pd.to_numeric(stripped[is_integer]).to_numpy(dtype=np.float64)
+    return values, int((~is_integer).sum())
+
+def restructure_dataframe(df, fill_value=FILL_VALUE):
+    """
+    Moves every measurement into a column per tool: for each (ToolID, value)
+    column pair, the value of a row ends up in "Measurement ToolID.<id>".
+    If a row has the same ToolID in several pairs, the rightmost pair wins.
+    Columns appear in the order their ToolID first occurs (row by row), cells
+    without a measurement are filled with fill_value (None = keep NaN).
+    """
+    new_df = pd.DataFrame(index=df.index)
+    new_df[TIMESTAMP_COL] = df.get(TIMESTAMP_COL, pd.NaT)
+    new_df[MEASUREMENT_START_COL] = df.get(MEASUREMENT_START_COL, pd.NaT)
+
+    pairs = tool_value_pairs(df)
+    log(f"Found tool-value pairs: {pairs}")
+    if not pairs or df.empty:
+        return new_df if fill_value is None else new_df.fillna(fill_value)
+
+    # Long form: one entry per (pair, row), pair by pair
+    row_count, pair_count = len(df), len(pairs)
+    converted = [_tool_id_values(df[tool_col]) for tool_col, _ in pairs]
+    tool_ids = np.concatenate([values for values, _ in converted])
+    invalid_ids = sum(invalid for _, invalid in converted)
+    if invalid_ids:
+        log(f"{invalid_ids} ToolIDs could not be converted to int and were skipped")
+
+    value_columns = [df[value_col] for _, value_col in pairs]
+    numeric = all(pd.api.types.is_numeric_dtype(col) and not pd.api.types.is_bool_dtype(col) for col in value_columns)
+    values = np.concatenate([col.to_numpy(dtype=np.float64 if numeric else object, na_value=np.nan) for col in value_columns])
+
+    rows = np.tile(np.arange(row_count), pair_count)
+    pair_index = np.repeat(np.arange(pair_count), row_count)
+
+    valid = ~np.isnan(tool_ids)
+    rows, pair_index, values = rows[valid], pair_index[valid], values[valid]
+    unique_ids, codes = np.unique(tool_ids[valid].astype(np.int64), return_inverse=True)
+
+    # Column order: first occurrence when walking row by row, pair by pair
+    first_seen = np.full(len(unique_ids), np.iinfo(np.int64).max)
+    np.minimum.at(first_seen, codes, rows * pair_count + pair_index)
+    column_order = np.argsort(first_seen, kind='stable')
+
+    # Same ToolID twice in one row: keep the entry of the later pair (entries are sorted by pair)
+    cells = rows * len(unique_ids) + codes
+    _, last = np.unique(cells[::-1], return_index=True)
+    last = len(cells) - 1 - last
+
+    matrix = np.full((row_count, len(unique_ids)), np.nan, dtype=values.dtype)
+    matrix[rows[last], codes[last]] = values[last]
+
+    measurements = pd.DataFrame(
+        matrix[:, column_order], index=df.index,
+        columns=[f"Measurement ToolID.{tool_id}" for tool_id in unique_ids[column_order]]
+    )
+    new_df = pd.concat([new_df, measurements], axis=1)
+    return new_df if fill_value is None else new_df.fillna(fill_value)
+
 # ==================== Main Function ====================
 def restructure_files(files, output_directory="restructured_files"):
     os.makedirs(output_directory, exist_ok=True)
@@ -23,36 +111,7 @@ def restructure_files(files, output_directory="restructured_files"):
             log(f"Error reading {file_path}: {e}")
             continue
 
-        timestamp_col = "Measurement End Time"
-        measurement_start_col = "Measurement Start Time"
-
-        # Create new DataFrame with base columns
-        new_df = pd.DataFrame()
-        new_df[timestamp_col] = df.get(timestamp_col, pd.NaT)
-        new_df[measurement_start_col] = df.get(measurement_start_col, pd.NaT)
-
-        # Identify ToolID-value column pairs
-        tool_value_pairs = [
-            (col, df.columns[i + 4])
-            for i, col in enumerate(df.columns)
-            if "ToolID" in col and i + 4 < len(df.columns)
-        ]
-
-        log(f"Found tool-value pairs: {tool_value_pairs}")
-
-        # Transform row by row
-        for index, row in df.iterrows():
-            for tool_col, value_col in tool_value_pairs:
-                tool_id = row[tool_col]
-                if pd.notna(tool_id):
-                    try:
-                        tool_id_int = int(tool_id)
-                        col_name = f"Measurement ToolID.{tool_id_int}"
-                        new_df.at[index, col_name] = row[value_col]
-                    except Exception as e:
-                        log(f"Error with ToolID {tool_id} in row {index}: {e}")
-
-        new_df.fillna("N/A", inplace=True)
+        new_df = restructure_dataframe(df)
 
         # Save result
         filename = os.path.basename(file_path)
@@ -61,9 +120,9 @@ def restructure_files(files, output_directory="restructured_files"):
         log(f"Saved to: {new_file_path}")
 
 # ==================== Execution ====================
+if __name__ == "__main__":
+    file_paths = [
+        "1Keyence.csv",
+    ]
 
-file_paths = [
-    "1Keyence.csv",
-]
-
-restructure_files(file_paths, output_directory="transformierte_dateien")
+    restructure_files(file_paths, output_directory="transformierte_dateien")
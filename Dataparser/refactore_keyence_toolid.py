@@ -1,21 +1,25 @@
+import numpy as np
 import pandas as pd
 import os
+import sys
+
+# Add path to the Database folder (for the config loader)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Database')))
+from config.config_json import load_config
 
 # ==================== Configuration ====================
 DEBUG = True  # Set to False to suppress output
 START_INDEX = 1  # Starting number for output files
+LIMITS_SECTION = 'keyence_tool_limits'
 
-# Thresholds for each ToolID (as string keys)
-UPPER_LIMITS = {
-    "200": 9.470, "202": 9.734, "203": 11.410,
-    "204": 15.500, "205": 7.800, "206": 10.020,
-    "208": 2.900, "209": 2.190
-}
-
-LOWER_LIMITS = {
-    "200": 9.000, "202": 9.485, "203": 10.050,
-    "204": 12.000, "205": 7.100, "206": 9.740,
-    "208": 2.200, "209": 1.370
+# Tolerance band [lower, upper] of the measured value for each ToolID (as string keys).
+# Used if config.json has no "keyence_tool_limits" section, e.g.
+#   "keyence_tool_limits": {"200": [9.000, 9.470], "202": [9.485, 9.734]}
+# If bands overlap, the tool listed first wins.
+DEFAULT_TOOL_LIMITS = {
+    "200": (9.000, 9.470), "202": (9.485, 9.734), "203": (10.050, 11.410),
+    "204": (12.000, 15.500), "205": (7.100, 7.800), "206": (9.740, 10.020),
+    "208": (2.200, 2.900), "209": (1.370, 2.190)
 }
 
 # ==================== Logging ====================
@@ -23,43 +27,126 @@ def log(msg):
     if DEBUG:
         print(msg)
 
+# ==================== Limit Tables ====================
+def load_tool_limits(filename='config.json', section=LIMITS_SECTION):
+    """Tolerance bands {tool_id: (lower, upper)} from config.json, or the defaults if not configured."""
+    try:
+        limits = load_config(filename, section)
+    except Exception as e:
+        log(f"No tool limits in {filename} ({e}), using the defaults.")
+        return dict(DEFAULT_TOOL_LIMITS)
+    return {str(tool_id): (float(lower), float(upper)) for tool_id, (lower, upper) in limits.items()}
+
+def find_overlaps(limits):
+    """Pairs of tools whose tolerance bands overlap (boundaries included)."""
+    bands = sorted(limits.items(), key=lambda item: item[1][0])
+    overlaps = []
+    for i, (tool_id, (_, upper)) in enumerate(bands):
+        for other_id, (other_lower, _) in bands[i + 1:]:
+            if other_lower > upper:
+                break
+            overlaps.append((tool_id, other_id))
+    return overlaps
+
+def build_interval_table(limits):
+    """
+    Splits the value axis at all band boundaries. Returns the sorted boundaries,
+    the ToolID at each boundary and the ToolID between neighbouring boundaries
+    (index j = between boundaries j-1 and j), NaN where no band applies. Where
+    bands overlap, the tool listed first in limits wins.
+    """
+    order = list(limits)
+    for tool_id, other_id in find_overlaps(limits):
+        winner = min(tool_id, other_id, key=order.index)
+        log(f"[WARN] Tolerance bands of ToolID {tool_id} and {other_id} overlap, {winner} wins.")
+
+    bands = [(int(tool_id), lower, upper) for tool_id, (lower, upper) in limits.items()]
+    boundaries = np.unique([value for _, lower, upper in bands for value in (lower, upper)])
+
+    def tool_at(value):
+        return next((tool_id for tool_id, lower, upper in bands if lower <= value <= upper), np.nan)
+
+    midpoints = (boundaries[:-1] + boundaries[1:]) / 2
+    at_boundary = np.array([tool_at(value) for value in boundaries], dtype=np.float64)
+    between = np.array([np.nan] + [tool_at(value) for value in midpoints] + [np.nan], dtype=np.float64)
+    return boundaries, at_boundary, between
+
+def lookup_tool_ids(values, table):
+    """ToolID whose tolerance band contains each value (float array, NaN = no band or missing value)."""
+    boundaries, at_boundary, between = table
+    values = np.asarray(values, dtype=np.float64)
+    if len(boundaries) == 0:
+        return np.full(len(values), np.nan)
+
+    position = np.searchsorted(boundaries, values, side='left')
+    on_boundary = (position < len(boundaries)) & (boundaries[np.minimum(position, len(boundaries) - 1)] == values)
+    tool_ids = np.where(on_boundary, at_boundary[np.minimum(position, len(boundaries) - 1)], between[position])
+    tool_ids[np.isnan(values)] = np.nan
+    return tool_ids
+
+# ==================== Correction ====================
+def correct_dataframe(df, table, counts=None):
+    """
+    Replaces the ToolID of every pair whose value (four columns further right)
+    lies in a tolerance band by the ToolID of that band. counts is updated with
+    the number of changed IDs per corrected ToolID.
+    """
+    counts = {} if counts is None else counts
+    corrected_df = df.copy()
+
+    # Identify ToolID and value column pairs
+    tool_value_pairs = [
+        (col, df.columns[i + 4])
+        for i, col in enumerate(df.columns)
+        if "ToolID" in col and i + 4 < len(df.columns)
+    ]
+    log(f"Found tool column pairs: {tool_value_pairs}")
+
+    for tool_col, value_col in tool_value_pairs:
+        values = pd.to_numeric(df[value_col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        tool_ids = lookup_tool_ids(values, table)
+        found = ~np.isnan(tool_ids)
+        if not found.any():
+            continue
+
+        column = df[tool_col]
+        if not pd.api.types.is_numeric_dtype(column) or pd.api.types.is_bool_dtype(column):
+            column = column.astype(object)
+        corrected_df[tool_col] = column.mask(found, np.where(found, tool_ids, 0).astype(np.int64))
+
+        original = pd.to_numeric(df[tool_col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        changed = found & (original != tool_ids)
+        for tool_id, count in zip(*np.unique(tool_ids[changed], return_counts=True)):
+            counts[int(tool_id)] = counts.get(int(tool_id), 0) + int(count)
+    return corrected_df, counts
+
+def format_correction_report(counts):
+    lines = [f"  ToolID {tool_id}: {count} corrected" for tool_id, count in sorted(counts.items())]
+    return "\n".join([f"Corrected ToolIDs: {sum(counts.values())}"] + lines)
+
 # ==================== Main Function ====================
-def correct_tool_ids(files, output_directory="corrected_files"):
+def correct_tool_ids(files, output_directory="corrected_files", limits=None):
+    """
+    Corrects the ToolIDs of all files and writes them as <n><file name> into
+    output_directory. limits defaults to load_tool_limits().
+
+    :return: Number of changed IDs per corrected ToolID.
+    """
     os.makedirs(output_directory, exist_ok=True)
+    table = build_interval_table(load_tool_limits() if limits is None else limits)
+    counts = {}
     file_counter = START_INDEX
 
     for file_path in files:
         log(f"\nProcessing file: {file_path}")
-        
+
         try:
             df = pd.read_csv(file_path)
         except Exception as e:
             log(f"Error reading file {file_path}: {e}")
             continue
 
-        corrected_df = df.copy()
-
-        # Identify ToolID and value column pairs
-        tool_value_pairs = [
-            (col, df.columns[i + 4])
-            for i, col in enumerate(df.columns)
-            if "ToolID" in col and i + 4 < len(df.columns)
-        ]
-
-        log(f"Found tool column pairs: {tool_value_pairs}")
-
-        # Correct ToolIDs based on value ranges
-        for tool_col, value_col in tool_value_pairs:
-            for idx, value in df[value_col].items():
-                corrected_tool_id = None
-                if pd.notna(value):
-                    for tool_id, (lower, upper) in zip(LOWER_LIMITS, zip(LOWER_LIMITS.values(), UPPER_LIMITS.values())):
-                        if lower <= value <= upper:
-                            corrected_tool_id = int(tool_id)
-                            break
-
-                # Update corrected value or keep original
-                corrected_df.at[idx, tool_col] = corrected_tool_id if corrected_tool_id else df.at[idx, tool_col]
+        corrected_df, counts = correct_dataframe(df, table, counts)
 
         # Save the corrected file
         filename = f"{file_counter}{os.path.basename(file_path)}"
@@ -68,9 +155,13 @@ def correct_tool_ids(files, output_directory="corrected_files"):
         log(f"Corrected file saved to: {output_path}")
         file_counter += 1
 
+    log(format_correction_report(counts))
+    return counts
+
 # ==================== Execution ====================
-file_paths = [
-    "Testdaten/KW12/Keyence.csv",
-]
+if __name__ == "__main__":
+    file_paths = [
+        "Testdaten/KW12/Keyence.csv",
+    ]
 
-correct_tool_ids(file_paths, output_directory="korrigierte_dateien")
+    correct_tool_ids(file_paths, output_directory="korrigierte_dateien")
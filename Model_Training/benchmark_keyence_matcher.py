@@ -0,0 +1,136 @@
+import time
+import numpy as np
+import pandas as pd
+import keyence_production_matcher as matcher
+from keyence_production_matcher import assign_timestamps_from_back, STEP, MAX_TIME_DIFF, SOFT_TIME_DIFF, HELP_TIME
+
+# ======================== Configuration ========================
+RANDOM_CASES = 2000                 # Random inputs compared with the reference implementation
+BENCHMARK_DAYS = (7, 28)            # Production periods timed for both implementations
+LARGE_DAYS = 90                     # Only timed for the new implementation
+START = pd.Timestamp('2025-01-06 06:00')
+
+# ======================== Reference Implementation ========================
+def assign_timestamps_reference(prod_ts, key_ts, step, max_td, soft_td, help_time):
+    """Previous loop of preprocces_match_keyence_to_production.py, kept as reference."""
+    result = []
+    current_start_index = 0
+
+    for i, k_time in enumerate(key_ts):
+        k_time = pd.Timestamp(k_time)
+
+        if i > 0 and (k_time - pd.Timestamp(key_ts[i - 1])) > soft_td:
+            if (k_time - pd.Timestamp(key_ts[i - 1])) > max_td:
+                current_start_index = next(
+                    (idx for idx, pt in enumerate(prod_ts) if pd.Timestamp(pt).date() == k_time.date()),
+                    len(prod_ts) - 1
+                )
+            else:
+                current_start_index = next(
+                    (idx for idx, pt in enumerate(prod_ts) if abs(pd.Timestamp(pt) - k_time) < help_time),
+                    len(prod_ts) - 1
+                )
+
+        target_index = min(current_start_index + step, len(prod_ts) - 1)
+
+        while target_index < len(prod_ts):
+            pt = pd.Timestamp(prod_ts[target_index])
+            if pt <= k_time:
+                while target_index > 0 and (k_time - pd.Timestamp(prod_ts[target_index])).days >= 1:
+                    target_index -= 1
+                result.append(prod_ts[target_index])
+                break
+            target_index += 1
+        else:
+            result.append(None)
+
+        current_start_index = target_index
+
+    return result
+
+# ======================== Helper Functions ========================
+def generate_shifts(days, rng, descending=True, mean_interval=4.0):
+    """
+    Production starts every few seconds during two shifts per working day,
+    plus the Keyence measurements. descending=True gives the order of the
+    database queries of the preprocessing (newest first).
+    """
+    production, keyence = [], []
+    for day in range(days):
+        if (START + pd.Timedelta(days=day)).dayofweek >= 5:
+            continue
+        for shift in (0, 8.5):
+            begin = START + pd.Timedelta(days=day, hours=shift + rng.uniform(0, 1))
+            seconds = np.cumsum(rng.exponential(mean_interval, int(6.5 * 3600 / mean_interval)))
+            production.append(begin + pd.to_timedelta(seconds, unit='s'))
+            keyence.append(begin + pd.to_timedelta(np.sort(rng.uniform(0, seconds[-1], len(seconds) // STEP)), unit='s'))
+    production = np.concatenate([p.to_numpy() for p in production]).astype('datetime64[ns]')
+    keyence = np.concatenate([k.to_numpy() for k in keyence]).astype('datetime64[ns]')
+    return (production[::-1], keyence[::-1]) if descending else (production, keyence)
+
+def random_case(rng):
+    """Small random input exercising gaps, duplicates, NaT measurements and both sort orders."""
+    n, m = rng.integers(0, 40), rng.integers(0, 40)
+    scale = rng.choice([60, 3600, 6 * 3600, 30 * 3600])
+    production = np.sort(START.value + (rng.uniform(0, scale, n) * 1e9).astype(np.int64) // 10**9 * 10**9)
+    if rng.random() < 0.3 and n:
+        production = np.sort(rng.choice(production, n))  # Duplicates
+    keys = START.value + (rng.uniform(-scale / 4, scale * 1.25, m) * 1e9).astype(np.int64) // 10**9 * 10**9
+    if rng.random() < 0.7:
+        keys = np.sort(keys)
+    if rng.random() < 0.6:
+        production, keys = production[::-1], keys[::-1]
+    keys = keys.astype('datetime64[ns]')
+    if rng.random() < 0.2 and m:
+        keys[rng.integers(0, m)] = np.datetime64('NaT')
+
+    step = int(rng.choice([0, 1, 3, 63]))
+    max_td = pd.Timedelta(seconds=float(rng.choice([scale / 8, 12 * 3600])))
+    soft_td = pd.Timedelta(seconds=float(rng.choice([scale / 20, 4 * 3600])))
+    help_td = pd.Timedelta(seconds=float(rng.choice([scale / 10, 50 * 60])))
+    return production.astype('datetime64[ns]'), keys, step, max_td, soft_td, help_td
+
+def reference_array(values):
+    return np.array([np.datetime64('NaT', 'ns') if value is None else value for value in values], dtype='datetime64[ns]')
+
+# ======================== Main Function ========================
+def main():
+    matcher.DEBUG = False
+    rng = np.random.default_rng(42)
+
+    for case in range(RANDOM_CASES):
+        production, keys, step, max_td, soft_td, help_td = random_case(rng)
+        if len(production) == 0:
+            continue  # The reference implementation fails without production timestamps
+        expected = reference_array(assign_timestamps_reference(production, keys, step, max_td, soft_td, help_td))
+        result = assign_timestamps_from_back(production, keys, step, max_td, soft_td, help_td)
+        np.testing.assert_array_equal(result, expected, err_msg=f"Random case {case}")
+    print(f"[BENCH] {RANDOM_CASES} random cases identical")
+
+    for days, descending in ((days, descending) for days in BENCHMARK_DAYS for descending in (True, False)):
+        production, keyence = generate_shifts(days, rng, descending)
+        start = time.perf_counter()
+        expected = reference_array(assign_timestamps_reference(production, keyence, STEP, MAX_TIME_DIFF, SOFT_TIME_DIFF, HELP_TIME))
+        reference_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = assign_timestamps_from_back(production, keyence)
+        matcher_seconds = time.perf_counter() - start
+
+        np.testing.assert_array_equal(result, expected)
+        order = 'newest first' if descending else 'oldest first'
+        print(f"[BENCH] {days} days ({order}): {len(production):,} production / {len(keyence):,} Keyence timestamps, "
+              f"results identical")
+        print(f"  Loop:          {reference_seconds:8.3f} s")
+        print(f"  searchsorted:  {matcher_seconds:8.3f} s")
+        print(f"  Speed-up:      {reference_seconds / matcher_seconds:.0f}x")
+
+    production, keyence = generate_shifts(LARGE_DAYS, rng)
+    start = time.perf_counter()
+    assign_timestamps_from_back(production, keyence)
+    print(f"[BENCH] {LARGE_DAYS} days: {len(production):,} production / {len(keyence):,} Keyence timestamps "
+          f"in {time.perf_counter() - start:.3f} s")
+
+# ======================== Execution ========================
+if __name__ == "__main__":
+    main()
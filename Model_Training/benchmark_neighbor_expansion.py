@@ -0,0 +1,70 @@
+import time
+import numpy as np
+import pandas as pd
+import timestamp_alignment
+from timestamp_alignment import expand_with_neighbors
+
+# ======================== Configuration ========================
+ROW_COUNTS = (1_000, 10_000, 100_000, 1_000_000)   # Keyence rows
+REFERENCE_MAX_ROWS = 10_000                        # Larger inputs are only timed for the vectorized version
+PRODUCTION_PER_ROW = 4                             # Production timestamps per Keyence row
+WINDOW = pd.Timedelta(seconds=10)
+START = pd.Timestamp('2025-02-24 06:00')
+
+# ======================== Reference Implementation ========================
+def expand_reference(result_df, production, window):
+    """Previous iterrows() expansion of preprocces_create_pre_training_files.py, kept as reference."""
+    expanded_rows = []
+
+    for _, row in result_df.iterrows():
+        ts = row['Timestamp Prod']
+        neighbors = production[
+            (production['Timestamp'] >= ts - window) &
+            (production['Timestamp'] <= ts + window)
+        ]
+        for _, neighbor in neighbors.iterrows():
+            new_row = row.copy()
+            new_row['Timestamp Prod'] = neighbor['Timestamp']
+            expanded_rows.append(new_row)
+
+    return pd.DataFrame(expanded_rows)
+
+# ======================== Helper Functions ========================
+def generate_data(row_count, rng):
+    """Production timestamps every few seconds (newest first, like the database query) and matched Keyence rows."""
+    seconds = np.cumsum(rng.exponential(4.0, row_count * PRODUCTION_PER_ROW))
+    production = pd.DataFrame({'Timestamp': (START + pd.to_timedelta(seconds, unit='s'))[::-1]})
+    matched = rng.choice(production['Timestamp'].to_numpy(), row_count)
+    keyence = pd.DataFrame({
+        'Timestamp Prod': np.sort(matched),
+        'Measurement ToolID.200': rng.normal(9.2, 0.1, row_count),
+        'Measurement ToolID.205': rng.normal(4.1, 0.1, row_count),
+    })
+    keyence.index = keyence.index * 2  # Non-default labels, they have to be repeated like before
+    return keyence, production
+
+# ======================== Main Function ========================
+def main():
+    timestamp_alignment.DEBUG = False
+    rng = np.random.default_rng(42)
+
+    print(f"[BENCH] Expanding Keyence rows with production timestamps within +-{WINDOW}")
+    for row_count in ROW_COUNTS:
+        keyence, production = generate_data(row_count, rng)
+
+        start = time.perf_counter()
+        expanded = expand_with_neighbors(keyence, production['Timestamp'], WINDOW)
+        vectorized_seconds = time.perf_counter() - start
+        line = f"  {row_count:>9,} rows -> {len(expanded):>10,} rows | vectorized: {vectorized_seconds:7.3f} s"
+
+        if row_count <= REFERENCE_MAX_ROWS:
+            start = time.perf_counter()
+            reference = expand_reference(keyence, production, WINDOW).infer_objects()
+            reference_seconds = time.perf_counter() - start
+            pd.testing.assert_frame_equal(expanded, reference, check_dtype=False)
+            line += f" | iterrows: {reference_seconds:7.2f} s ({reference_seconds / vectorized_seconds:,.0f}x), identical"
+        print(line)
+
+# ======================== Execution ========================
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+# =================== Configuration ===================
+
+DEBUG = True
+DECIMALS = 3
+
+# Keyence measurements checked by the tactile probe of each tool
+TOOL_COLUMNS = {
+    "T321": ['Measurement ToolID.200', 'Measurement ToolID.202',
+             'Measurement ToolID.203', 'Measurement ToolID.204', 'Measurement ToolID.209'],
+    "T521": ['Measurement ToolID.205', 'Measurement ToolID.206',
+             'Measurement ToolID.208', 'Measurement ToolID.209'],
+}
+
+# =================== Logging ===================
+
+def log(msg):
+    if DEBUG:
+        print(msg)
+
+# =================== Helper Functions ===================
+
+def deviation_column(tool, measurement_column):
+    """'T321', 'Measurement ToolID.200' -> 'T321_Dev_200'."""
+    return f"{tool}_Dev_{measurement_column.rsplit('.', 1)[-1]}"
+
+def deviation_columns(tool, tools=TOOL_COLUMNS):
+    return [deviation_column(tool, column) for column in tools[tool]]
+
+def _round(values, decimals):
+    """
+    Like Python's round() for every value: np.round scales before rounding and
+    can round values close to a half the other way, so those few values are
+    rounded with round() itself.
+    """
+    rounded = np.round(values, decimals)
+    scaled = values * 10.0 ** decimals
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    rounded[near_half] = [round(value, decimals) for value in values[near_half].tolist()]
+    return rounded
+
+# =================== Deviations ===================
+
+def compute_deviations(df, upper_limits, lower_limits, tools=TOOL_COLUMNS, decimals=DECIMALS):
+    """
+    Deviation of every measurement from the middle of its tolerance band,
+    one float64 column per tool and measurement (see deviation_column()),
+    computed as one subtraction over the measurement matrix of each tool.
+    Replaces the former T321_Tupel/T521_Tupel tuple columns.
+
+    :return: DataFrame with 'Timestamp Prod' and the deviation columns.
+    """
+    result_df = df[['Timestamp Prod']].copy()
+    for tool, columns in tools.items():
+        means = np.array([(upper_limits[col] + lower_limits[col]) / 2 for col in columns])
+        deviations = _round(df[columns].to_numpy(dtype=np.float64) - means, decimals)
+        for column, values in zip(deviation_columns(tool, tools), deviations.T):
+            result_df[column] = values
+    return result_df
+
+def _parse_tuple_column(values):
+    """Legacy '(0.1, -0.2, ...)' strings (tuples written to CSV) as float matrix, without eval."""
+    if len(values) and not isinstance(values.iloc[0], str):
+        return np.array(values.tolist(), dtype=np.float64)  # Tuples of a DataFrame that was not written to CSV
+    parts = values.astype(str).str.strip().str.strip('()').str.split(',', expand=True)
+    return parts.apply(lambda col: pd.to_numeric(col.str.strip(), errors='coerce')).to_numpy(dtype=np.float64)
+
+def load_targets(df, tool, tools=TOOL_COLUMNS):
+    """
+    Multi-target matrix (rows x measurements, float64) of a tool plus the
+    remaining feature columns. Reads the deviation columns of
+    compute_deviations() or, for older exports, the '<tool>_Tupel' column.
+
+    :return: (features DataFrame, target matrix)
+    """
+    columns = [col for col in deviation_columns(tool, tools) if col in df.columns]
+    if columns:
+        return df.drop(columns=columns), df[columns].to_numpy(dtype=np.float64)
+
+    legacy_column = f"{tool}_Tupel"
+    if legacy_column not in df.columns:
+        raise KeyError(f"Neither deviation columns nor '{legacy_column}' found for {tool}")
+    log(f"[INFO] Reading legacy tuple column {legacy_column}")
+    return df.drop(columns=[legacy_column]), _parse_tuple_column(df[legacy_column])
@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+# =================== Configuration ===================
+
+DEBUG = True
+STEP = 63                                   # Production timestamps skipped ahead per Keyence measurement
+MAX_TIME_DIFF = pd.Timedelta(hours=12)      # Larger measurement gaps re-anchor on the first production of the same day
+SOFT_TIME_DIFF = pd.Timedelta(hours=4)      # Larger measurement gaps re-anchor on a production within HELP_TIME
+HELP_TIME = pd.Timedelta(minutes=50)
+
+DAY = np.int64(86_400 * 10**9)
+NAT = np.iinfo(np.int64).min
+
+# =================== Logging ===================
+
+def log(msg):
+    if DEBUG:
+        print(msg)
+
+# =================== Helper Functions ===================
+
+def _to_ns(values):
+    """Naive timestamps as int64 nanoseconds (NaT = int64 min); tz-aware values keep their wall time."""
+    index = pd.DatetimeIndex(values)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.as_unit('ns').asi8
+
+def _production_order(prod_ns):
+    """True for descending, False for ascending production timestamps."""
+    if (prod_ns == NAT).any():
+        raise ValueError("Production timestamps must not contain NaT")
+    steps = np.diff(prod_ns)
+    if (steps >= 0).all():
+        return False
+    if (steps <= 0).all():
+        return True
+    raise ValueError("Production timestamps must be sorted (ascending or descending)")
+
+def _lookups(prod_ns, key_ns, descending, help_ns):
+    """
+    Per measurement, with searchsorted on the sorted production timestamps:
+    - upper: descending: first index with P <= K; ascending: number of P <= K
+    - recent: descending: number of P > K - 1 day; ascending: first index with P > K - 1 day
+    - same_day / nearby: first index on the day of K / within help_ns of K (n - 1 if none)
+    """
+    n = len(prod_ns)
+    ascending = prod_ns[::-1] if descending else prod_ns
+    day_start = key_ns // DAY * DAY
+
+    def first_index(lo, hi, lo_inclusive):
+        # First index with lo <(=) P < hi in the production order
+        if descending:
+            index = n - np.searchsorted(ascending, hi, side='left')
+        else:
+            index = np.searchsorted(ascending, lo, side='left' if lo_inclusive else 'right')
+        value = prod_ns[np.minimum(index, n - 1)]
+        inside = (index < n) & (value < hi) & ((value >= lo) if lo_inclusive else (value > lo))
+        return np.where(inside, index, n - 1)
+
+    if descending:
+        upper = n - np.searchsorted(ascending, key_ns, side='right')
+        recent = n - np.searchsorted(ascending, key_ns - DAY, side='right')
+    else:
+        upper = np.searchsorted(ascending, key_ns, side='right')
+        recent = np.searchsorted(ascending, key_ns - DAY, side='right')
+
+    same_day = first_index(day_start, day_start + DAY, True)
+    nearby = first_index(key_ns - help_ns, key_ns + help_ns, False)
+    return upper, recent, same_day, nearby
+
+# =================== Timestamp Assignment ===================
+
+def match_indices(prod_ns, key_ns, step=STEP, max_td=MAX_TIME_DIFF, soft_td=SOFT_TIME_DIFF, help_td=HELP_TIME):
+    """
+    Index of the production timestamp assigned to every Keyence measurement
+    (-1 if none), on int64 nanosecond arrays (NaT = int64 min).
+
+    Same rules as the former assign_timestamps_from_back loop: starting step
+    entries after the previous match, take the first production timestamp at
+    or before the measurement, moving back towards the start of the array
+    while it is a day or more older. A measurement gap larger than soft_td
+    restarts at the first production timestamp within help_td of the
+    measurement, a gap larger than max_td at the first one of the same day.
+
+    The production timestamps have to be sorted (ascending or descending);
+    every lookup is a binary search, so the cost is O(n log m).
+    """
+    if step < 0:
+        raise ValueError("step must not be negative")
+    prod_ns = np.asarray(prod_ns, dtype=np.int64)
+    key_ns = np.asarray(key_ns, dtype=np.int64)
+    n, valid = len(prod_ns), key_ns != NAT
+    if n == 0:
+        return np.full(len(key_ns), -1, dtype=np.int64)
+
+    descending = _production_order(prod_ns)
+    upper, recent, same_day, nearby = _lookups(prod_ns, np.where(valid, key_ns, 0), descending, pd.Timedelta(help_td).value)
+    # NaT measurements never find a production timestamp
+    upper = np.where(valid, upper, n if descending else 0)
+
+    gap = np.zeros(len(key_ns), dtype=np.int64)
+    gap[1:] = np.where(valid[1:] & valid[:-1], np.diff(key_ns), NAT)
+    restart = np.where(gap > pd.Timedelta(soft_td).value,
+                       np.where(gap > pd.Timedelta(max_td).value, same_day, nearby), -1)
+
+    # Sequential part: every match starts from the previous one
+    result = np.empty(len(key_ns), dtype=np.int64)
+    start = 0
+    for i, (restart_i, upper_i, recent_i) in enumerate(zip(restart.tolist(), upper.tolist(), recent.tolist())):
+        if restart_i >= 0:
+            start = restart_i
+        target = min(start + step, n - 1)
+        if descending:
+            if upper_i >= n:
+                target = n
+            else:
+                target = max(target, upper_i)
+                if target >= recent_i:
+                    target = max(recent_i - 1, 0)
+        elif target >= upper_i:
+            target = n
+        elif target < recent_i:
+            target = 0
+        result[i] = target
+        start = target
+
+    result[result == n] = -1
+    return result
+
+def assign_timestamps_from_back(prod_ts, key_ts, step=STEP, max_td=MAX_TIME_DIFF, soft_td=SOFT_TIME_DIFF, help_td=HELP_TIME):
+    """Production timestamp (datetime64[ns], NaT if none) for every Keyence timestamp, see match_indices()."""
+    prod_ns = _to_ns(prod_ts)
+    indices = match_indices(prod_ns, _to_ns(key_ts), step, max_td, soft_td, help_td)
+    matched = np.where(indices >= 0, prod_ns[np.maximum(indices, 0)] if len(prod_ns) else NAT, NAT)
+    log(f"{(indices >= 0).sum()} of {len(indices)} Keyence measurements matched to production timestamps")
+    return matched.view('datetime64[ns]')
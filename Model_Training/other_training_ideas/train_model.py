@@ -1,7 +1,6 @@
 import os
+import sys
 import pandas as pd
-from sqlalchemy import create_engine
-from config import load_config  
 
 from sklearn.metrics import r2_score
 from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
@@ -9,25 +8,12 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, classification_report
 from sklearn.preprocessing import StandardScaler
 
-# ======================== Read from Database ========================
-def read_from_database(query):
-    """
-    Reads data from the PostgreSQL table based on the provided SQL query 
-    and returns it as a pandas DataFrame.
-    """
-    config = load_config()  # Assumes config contains database credentials
-    
-    connection_url = f"postgresql+pg8000://{config['user']}:{config['password']}@{config['host']}:{config['port']}/{config['database']}"
-    engine = create_engine(connection_url)
-    
-    try:
-        with engine.begin() as connection:
-            df = pd.read_sql(query, con=connection)
-            print("Data successfully retrieved from the database.")
-            return df
-    except Exception as e:
-        print("Error while retrieving data from the database:", e)
-        return None
+# ===================== Custom Paths & Imports =========================
+# Add relative path to the "Database" folder to reuse the pooled database access
+db_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'Database'))
+sys.path.append(db_path)
+
+from get_data_from_Database import read_from_database, read_from_database_reduced, concat_reducer
 
 
 # ======================== Feature Engineering ========================
@@ -97,10 +83,10 @@ columns_of_interest = [
 
 # ======================== Load Keyence Data ========================
 query = 'SELECT * FROM "Keyence";'
-keyence = read_from_database(query)
+# Stream the table in chunks and keep only the needed columns of each chunk
+keyence = read_from_database_reduced(query, concat_reducer(["Timestamp"] + columns_of_interest))
 
 if keyence is not None:
-    keyence = keyence[["Timestamp"] + columns_of_interest]
     print(keyence.head())
 
 # ======================== Deviation Computation ========================
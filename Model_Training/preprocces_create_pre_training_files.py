@@ -11,10 +11,14 @@ sys.path.append(db_path)
 
 from get_data_from_Database import read_from_database
 from load_data_into_Database import write_to_database
+from parquet_cache import read_cached
+from timestamp_alignment import expand_with_neighbors, merge_nearest
+from deviation_targets import compute_deviations, deviation_columns
 
 # =================== Configuration ===================
 DEBUG = True
 EXPORT_CSV = True
+USE_CACHE = True  # Serve repeated time ranges from the local Parquet cache
 
 start_date = "2025-02-24 14:40:00"
 end_date = "2025-03-12 06:59:59"
@@ -24,34 +28,24 @@ def log(msg):
     if DEBUG:
         print(msg)
 
-# =================== Generate Deviation Tuples ===================
-def generate_tool_tuples_with_deviation(df, upper_limits, lower_limits):
-    result_df = df[['Timestamp Prod']].copy()
-
-    means = {key: (upper_limits[key] + lower_limits[key]) / 2 for key in upper_limits}
-
-    tools = {
-        "T321": ['Measurement ToolID.200', 'Measurement ToolID.202', 
-                 'Measurement ToolID.203', 'Measurement ToolID.204', 'Measurement ToolID.209'],
-        "T521": ['Measurement ToolID.205', 'Measurement ToolID.206', 
-                 'Measurement ToolID.208', 'Measurement ToolID.209']
-    }
-
-    for tool, columns in tools.items():
-        def compute_deviation(row):
-            return tuple(round(row[col] - means[col], 3) for col in columns)
-        result_df[f'{tool}_Tupel'] = df.apply(compute_deviation, axis=1)
-
-    return result_df
-
 # =================== Load Raw Data ===================
 def load_data(start_date, end_date):
-    energy = read_from_database(
-        f"SELECT * FROM \"Energy\" WHERE \"Timestamp\" > '{start_date}' AND \"Timestamp\" < '{end_date}' ORDER BY \"Timestamp\";"
-    )
     axis = read_from_database(
         "SELECT * FROM \"Achse\" WHERE \"TD\" = '3211' AND \"Achse\" = 'X' AND \"Timestamp\" > '2024-11-28' ORDER BY \"Timestamp\";"
     )
+
+    if USE_CACHE:
+        # Same bounds as the queries below: start_date < Timestamp < end_date
+        energy = read_cached("Energy", start_date, end_date, inclusive="neither")
+        keyence = read_cached("Keyence Prod Vfebmar2", start_date, end_date, inclusive="neither")
+        production = read_cached("Produktionszeiten V2", start_date, end_date, inclusive="neither")
+        if production is not None:
+            production = production.sort_values("Timestamp", ascending=False, ignore_index=True)
+        return energy, axis, keyence, production
+
+    energy = read_from_database(
+        f"SELECT * FROM \"Energy\" WHERE \"Timestamp\" > '{start_date}' AND \"Timestamp\" < '{end_date}' ORDER BY \"Timestamp\";"
+    )
     keyence = read_from_database(
         f"SELECT * FROM \"Keyence Prod Vfebmar2\" WHERE \"Timestamp\" > '{start_date}' AND \"Timestamp\" < '{end_date}' ORDER BY \"Timestamp\";"
     )
@@ -62,26 +56,16 @@ def load_data(start_date, end_date):
 
 # =================== Expand Using Production Times ===================
 def expand_with_production_data(result_df, production, window_sec=10):
-    expanded_rows = []
-    time_diff = pd.Timedelta(seconds=window_sec)
-
-    for _, row in result_df.iterrows():
-        ts = row['Timestamp Prod']
-        neighbors = production[
-            (production['Timestamp'] >= ts - time_diff) &
-            (production['Timestamp'] <= ts + time_diff)
-        ]
-        for _, neighbor in neighbors.iterrows():
-            new_row = row.copy()
-            new_row['Timestamp Prod'] = neighbor['Timestamp']
-            expanded_rows.append(new_row)
-
-    return pd.DataFrame(expanded_rows)
+    """One row per production timestamp within +-window_sec of 'Timestamp Prod' (see timestamp_alignment.py)."""
+    return expand_with_neighbors(result_df, production['Timestamp'], pd.Timedelta(seconds=window_sec))
 
 # =================== Main Pipeline ===================
 def main():
     log("Loading data ...")
     energy, axis, keyence, production = load_data(start_date, end_date)
+    if any(df is None for df in (energy, axis, keyence, production)):
+        log("[ERROR] Loading the data failed, aborting.")
+        return None, None
 
     for df, name in zip([energy, axis, keyence, production], ["energy", "axis", "keyence", "production"]):
         log(f"{name}: {df.shape}")
@@ -113,8 +97,8 @@ def main():
         "Measurement ToolID.209": 0,
     }
 
-    log("Computing deviation tuples ...")
-    result_df = generate_tool_tuples_with_deviation(keyence, upper_limits, lower_limits)
+    log("Computing deviations ...")
+    result_df = compute_deviations(keyence, upper_limits, lower_limits)
 
     log("Expanding with production timestamps ...")
     production["Timestamp"] = pd.to_datetime(production["Timestamp"])
@@ -123,29 +107,17 @@ def main():
     # Merge with energy data
     log("Merging with energy data ...")
     energy['Timestamp'] = pd.to_datetime(energy['Timestamp'])
-    df_merged = pd.merge_asof(
-        df_expanded.sort_values('Timestamp Prod'),
-        energy.sort_values('Timestamp'),
-        left_on='Timestamp Prod',
-        right_on='Timestamp',
-        direction='nearest'
-    )
+    df_merged = merge_nearest(df_expanded, energy, 'Timestamp Prod', direction='nearest')
 
     # Merge with axis data
     log("Merging with axis data ...")
     axis['Timestamp'] = pd.to_datetime(axis['Timestamp'])
-    df_merged = pd.merge_asof(
-        df_merged.sort_values('Timestamp Prod'),
-        axis.sort_values('Timestamp'),
-        left_on='Timestamp Prod',
-        right_on='Timestamp',
-        direction='backward'
-    )
+    df_merged = merge_nearest(df_merged, axis, 'Timestamp Prod', direction='backward')
 
     log("Splitting into T321 and T521 ...")
     base_columns = ['Timestamp Prod', 'Power (W)', 'Current (A)', 'Voltage (V)', 'Neue Achseneinstellung']
-    df_T321 = df_merged[['T321_Tupel'] + base_columns]
-    df_T521 = df_merged[['T521_Tupel'] + base_columns]
+    df_T321 = df_merged[deviation_columns('T321') + base_columns]
+    df_T521 = df_merged[deviation_columns('T521') + base_columns]
 
     if EXPORT_CSV:
         df_T321.to_csv('T321.csv', index=False)
@@ -1,8 +1,17 @@
 import os
+import sys
 import pandas as pd
-from datetime import datetime
 import numpy as np
 
+# ===================== Custom Paths & Imports =========================
+# Add relative path to the "Dataparser" folder to import the GEMVM trace and FFT readers
+parser_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Dataparser'))
+sys.path.append(parser_path)
+
+from gemvm_trace import read_trace
+from gemvm_fft import read_fft_file, read_spectra, load_index, STORE_DIR
+from gemvm_catalog import update_catalog, find_files
+
 # ==================== Configuration ====================
 DEBUG = True
 
@@ -11,6 +20,12 @@ CSV_TIMESTAMP_FILE = 'taster_train.csv'
 OUTPUT_FILE = '/out_taster.csv'
 # Folder with the temperatur files
 ROOT_FOLDER = 'training_folder'
+# File catalog of ROOT_FOLDER (see Dataparser/gemvm_catalog.py); only new files are added on later runs, None = scan every run
+CATALOG_FILE = 'gemvm_catalog.parquet'
+# Maximum distance between Production_Time and the timestamp in the file name (0 = exact, a few seconds absorb clock drift)
+MATCH_TOLERANCE = pd.Timedelta(0)
+# Spectrum store filled by Dataparser/gemvm_fft.py; spectra not found there are read from the CSV files
+FFT_STORE_DIR = STORE_DIR
 
 # ==================== Logging ====================
 def log(msg):
@@ -18,17 +33,8 @@ def log(msg):
         print(msg)
 
 # ==================== Helper Functions ====================
-def find_file_recursive(folder_path, prefix, timestamp):
-    formatted = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S").strftime("%Y-%m-%d_%H-%M-%S")
-    for root, _, files in os.walk(folder_path):
-        for filename in files:
-            if filename.startswith(prefix) and formatted in filename and not filename.endswith("E"):
-                return os.path.join(root, filename)
-    log(f"[WARN] No file found for {prefix} {formatted}")
-    return None
-
-def load_temperature_file(folder_path, timestamp):
-    file_path = find_file_recursive(folder_path, "GEMVM_Export_Trace_S1", timestamp)
+def load_temperature_file(file_path):
+    """Trace of the recording (file of the catalog), None if there is no file."""
     if file_path:
         try:
             
@@ -36,20 +42,29 @@ def load_temperature_file(folder_path, timestamp):
             # PLEASE INSERT YOUR COLUMNS IN HERE
             used_cols = ['YOUR COLUMNS HERE']
             col_names = ['YOUR COLUMNS HERE']
-            df = pd.read_csv(file_path, skiprows=5, delimiter=";", header=None, names=col_names)
-            return df[used_cols]
+            return read_trace(file_path, col_names, used_cols, parse_timestamps=False)
         except Exception as e:
             log(f"[ERROR] Failed to load temperature file: {e}")
     return None
 
-def load_frequency_file(folder_path, timestamp):
-    file_path = find_file_recursive(folder_path, "GEMVM_Export_Fft_S1", timestamp)
+def load_frequency_file(file_path, timestamp, fft_index=None):
+    """
+    Spectra of the recording as float32 DataFrame (one column per bin), from
+    the spectrum store if file_path (or, without a file, the timestamp) was
+    imported there, else from file_path.
+    """
+    if fft_index is not None:
+        # The catalog's file selects the store row if several exports share the timestamp
+        recording = read_spectra(timestamp, FFT_STORE_DIR, fft_index, source_file=file_path)
+        if recording is not None:
+            return pd.DataFrame(recording['Spectra'], columns=recording['Bins'])
+
+    if file_path is None:
+        log(f"[WARN] No file found for GEMVM_Export_Fft_S1 {timestamp}")
     if file_path:
         try:
-            df = pd.read_csv(file_path, skiprows=4, delimiter=";")
-            df = df.drop(df.iloc[:, 1:15], axis=1, errors='ignore')
-            df = df.drop(columns=['Version:1.3'], errors='ignore')
-            return df
+            spectra, bins = read_fft_file(file_path)
+            return pd.DataFrame(spectra, columns=bins)
         except Exception as e:
             log(f"[ERROR] Failed to load frequency file: {e}")
     return None
@@ -62,11 +77,19 @@ def main():
 
     temp_means = []
     freq_means = []
+    fft_index = load_index(FFT_STORE_DIR)
+
+    # One scan of ROOT_FOLDER (or the catalog of earlier runs) and one lookup per file type for all rows
+    catalog = update_catalog([ROOT_FOLDER], CATALOG_FILE)
+    trace_files = find_files(catalog, 'Trace', merged_df['Production_Time'], MATCH_TOLERANCE)['File']
+    fft_files = find_files(catalog, 'Fft', merged_df['Production_Time'], MATCH_TOLERANCE)['File']
 
     for idx, row in merged_df.iterrows():
         timestamp = row['Production_Time'].strftime("%Y-%m-%d %H:%M:%S")
-        temp_df = load_temperature_file(ROOT_FOLDER, timestamp)
-        freq_df = load_frequency_file(ROOT_FOLDER, timestamp)
+        if trace_files[idx] is None:
+            log(f"[WARN] No file found for GEMVM_Export_Trace_S1 {timestamp}")
+        temp_df = load_temperature_file(trace_files[idx])
+        freq_df = load_frequency_file(fft_files[idx], timestamp, fft_index)
 
         temp_means.append(temp_df.mean() if temp_df is not None else pd.Series(dtype=float))
         freq_means.append(freq_df.mean() if freq_df is not None else pd.Series(dtype=float))
@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+
+# =================== Configuration ===================
+
+DEBUG = True
+NAT = np.iinfo(np.int64).min
+
+# =================== Logging ===================
+
+def log(msg):
+    if DEBUG:
+        print(msg)
+
+# =================== Helper Functions ===================
+
+def _to_ns(values):
+    """Timestamps as int64 nanoseconds (NaT = int64 min); tz-aware values keep their wall time."""
+    index = pd.DatetimeIndex(values)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.as_unit('ns').asi8
+
+def _group_offsets(counts):
+    """0, 1, ..., counts[i] - 1 for every group, concatenated."""
+    starts = np.cumsum(counts) - counts
+    return np.arange(counts.sum()) - np.repeat(starts, counts)
+
+# =================== Neighbor Expansion ===================
+
+def neighbor_indices(timestamps, events, window):
+    """
+    All events within +-window (inclusive) of every timestamp.
+
+    The events are sorted once (sorted input is used as it is) and the
+    window bounds are found with np.searchsorted, so the cost is
+    O((n + k) log m) for n timestamps, m events and k pairs.
+
+    :return: (timestamp positions, event positions) as int64 arrays, grouped by
+             timestamp in input order and, within a group, in event order.
+    """
+    keys = _to_ns(timestamps)
+    values = _to_ns(events)
+    window = pd.Timedelta(window).value
+    valid = keys != NAT
+
+    steps = np.diff(values)
+    if (steps >= 0).all() and not (values == NAT).any():
+        order, reverse = None, False
+        sorted_values = values
+    elif (steps <= 0).all() and not (values == NAT).any():
+        # Descending events (e.g. production times read newest first): search the reversed view
+        order, reverse = None, True
+        sorted_values = values[::-1]
+    else:
+        order, reverse = np.argsort(values, kind='stable'), False
+        sorted_values = values[order]
+
+    lo = np.searchsorted(sorted_values, np.where(valid, keys - window, 0), side='left')
+    hi = np.searchsorted(sorted_values, np.where(valid, keys + window, 0), side='right')
+    counts = np.where(valid, hi - lo, 0)
+
+    rows = np.repeat(np.arange(len(keys)), counts)
+    offsets = _group_offsets(counts)
+    if reverse:
+        # Sorted positions hi-1, hi-2, ... are event positions in ascending order
+        positions = len(values) - np.repeat(hi, counts) + offsets
+    else:
+        positions = np.repeat(lo, counts) + offsets
+        if order is not None:
+            positions = order[positions]
+            # Restore the event order within every group
+            resort = np.lexsort((positions, rows))
+            positions = positions[resort]
+    return rows, positions
+
+def expand_with_neighbors(df, events, window, column='Timestamp Prod'):
+    """
+    Repeats every row of df once per event within +-window of df[column] and
+    sets df[column] to that event's timestamp. Rows without events (or with
+    NaT) are dropped. The result keeps the index labels of df and its column
+    dtypes; it is built with one fancy-indexing step instead of a row per
+    neighbor.
+
+    events: timestamps (Series, array or DatetimeIndex), e.g. production["Timestamp"]
+    """
+    event_values = pd.Series(events).to_numpy()
+    rows, positions = neighbor_indices(df[column], event_values, window)
+    expanded = df.iloc[rows].copy()
+    expanded[column] = event_values[positions]
+    log(f"{len(df)} rows expanded to {len(expanded)} rows (+-{pd.Timedelta(window)})")
+    return expanded
+
+# =================== Nearest Events ===================
+
+def nearest_indices(timestamps, events, direction='nearest', tolerance=None):
+    """
+    Position of the nearest event for every timestamp, with binary searches
+    on the sorted events instead of a scan per timestamp.
+
+    direction: 'backward' (event <= timestamp), 'forward' (event >= timestamp)
+               or 'nearest'; on equal distance the event that comes first in
+               events wins, like Series.idxmin()
+    tolerance: maximum distance (Timedelta), None = unlimited
+
+    :return: (event positions as int64, -1 if none; absolute distances as timedelta64[ns], NaT if none)
+    """
+    if direction not in ('backward', 'forward', 'nearest'):
+        raise ValueError("direction must be 'backward', 'forward' or 'nearest'")
+    keys = _to_ns(timestamps)
+    values = _to_ns(events)
+
+    order = np.argsort(values, kind='stable')
+    order = order[values[order] != NAT]
+    sorted_values = values[order]
+    count = len(sorted_values)
+    valid = keys != NAT
+
+    def candidate(position):
+        # First event (in input order) with the value at sorted position, and its distance
+        inside = valid & (position >= 0) & (position < count)
+        value = sorted_values[np.clip(position, 0, max(count - 1, 0))] if count else np.zeros(len(keys), dtype=np.int64)
+        first = np.searchsorted(sorted_values, value, side='left')
+        event = np.where(inside, order[np.minimum(first, max(count - 1, 0))] if count else -1, -1)
+        return event, np.where(inside, np.abs(keys - value), NAT), inside
+
+    backward = candidate(np.searchsorted(sorted_values, keys, side='right') - 1)
+    forward = candidate(np.searchsorted(sorted_values, keys, side='left'))
+
+    if direction == 'backward':
+        positions, distances, found = backward
+    elif direction == 'forward':
+        positions, distances, found = forward
+    else:
+        closer = forward[2] & (~backward[2] | (forward[1] < backward[1])
+                               | ((forward[1] == backward[1]) & (forward[0] < backward[0])))
+        positions = np.where(closer, forward[0], backward[0])
+        distances = np.where(closer, forward[1], backward[1])
+        found = backward[2] | forward[2]
+
+    if tolerance is not None:
+        found &= distances <= pd.Timedelta(tolerance).value
+    return np.where(found, positions, -1), np.where(found, distances, NAT).view('timedelta64[ns]')
+
+def merge_nearest(left, right, left_on, right_on='Timestamp', direction='nearest', tolerance=None, distance_column=None):
+    """
+    pd.merge_asof of left and right, both sorted by their timestamp columns
+    first; the result is ordered by left[left_on] like before. Rows farther
+    than tolerance from any right row get NaN. With distance_column, the
+    absolute distance to the matched row is added as that column.
+    """
+    left = left.sort_values(left_on, kind='stable')
+    right = right.sort_values(right_on, kind='stable')
+    merged = pd.merge_asof(left, right, left_on=left_on, right_on=right_on, direction=direction,
+                           tolerance=None if tolerance is None else pd.Timedelta(tolerance))
+    if distance_column is not None:
+        _, distances = nearest_indices(left[left_on], right[right_on], direction, tolerance)
+        merged[distance_column] = distances
+    return merged
@@ -8,6 +8,7 @@ from sklearn.metrics import mean_squared_error
 from tpot import TPOTRegressor
 import joblib
 import warnings
+from deviation_targets import load_targets
 
 warnings.filterwarnings("ignore", category=FutureWarning)
 
@@ -15,7 +16,7 @@ warnings.filterwarnings("ignore", category=FutureWarning)
 DATA_PATH = 'output_taster.csv'
 LOG_FILE = 'train_taster.log'
 MODEL_OUTPUT_PATH = "best_taster_model.pkl"
-TARGET_COLUMN = 'T321_Tupel'
+TARGET_TOOL = 'T321'         # Deviation columns of this tool are the targets (see deviation_targets.py)
 TPOT_GENERATIONS = 60
 TPOT_POP_SIZE = 40
 DEBUG = True
@@ -34,16 +35,11 @@ merged_df = pd.read_csv(DATA_PATH)
 merged_df['Timestamp Prod'] = pd.to_datetime(merged_df['Timestamp Prod'])
 
 # ======================== Prepare Target Column ========================
-log("[INFO] Preparing target column ...")
-y_raw = merged_df[TARGET_COLUMN]
-if isinstance(y_raw.iloc[0], str):
-    y_raw = y_raw.apply(eval)
-
-y_expanded = pd.DataFrame(y_raw.tolist(), columns=[f"dim_{i}" for i in range(len(y_raw.iloc[0]))])
-y = y_expanded['dim_0']  # Currently: only dim_0 is predicted
+log("[INFO] Preparing target columns ...")
+X, targets = load_targets(merged_df, TARGET_TOOL)
+y = pd.Series(targets[:, 0], index=X.index)  # Currently: only the first deviation is predicted
 
 # ======================== Prepare Feature Matrix ========================
-X = merged_df.drop(columns=[TARGET_COLUMN])
 X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
 # Drop missing values
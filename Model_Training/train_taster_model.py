@@ -9,6 +9,8 @@ db_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Databas
 sys.path.append(db_path)
 
 from get_data_from_Database import read_from_database
+from query_builder import read_time_range
+from timestamp_alignment import nearest_indices, merge_nearest
 
 # ======================== Configuration ========================
 DEBUG = True
@@ -17,6 +19,7 @@ START_DATE = "2025-03-10 00:00:00"
 END_DATE = "2025-03-12 06:59:59"
 TD_FILTER = '3211'
 ACHSE_FILTER = 'X'
+MAX_PRODUCTION_DISTANCE = None  # Taster events farther from any production timestamp get no Production_Time (None = no limit)
 
 # ======================== Logging ========================
 def log(msg):
@@ -34,12 +37,11 @@ def load_data():
     """
     energy = read_from_database(query_energy)
 
-    query_axis = f"""
-        SELECT * FROM "Achse" 
-        WHERE "TD" = '{TD_FILTER}' AND "Achse" = '{ACHSE_FILTER}' AND "Timestamp" > '2024-11-28' 
-        ORDER BY "Timestamp";
-    """
-    axis = read_from_database(query_axis)
+    axis = read_time_range(
+        "Achse", start="2024-11-28", inclusive="neither",
+        columns=["Neue Achseneinstellung"],
+        filters={"TD": TD_FILTER, "Achse": ACHSE_FILTER}
+    )
 
     query_taster = f"""
         SELECT * FROM "Taster" 
@@ -66,27 +68,18 @@ def main():
     production["Timestamp"] = pd.to_datetime(production["Timestamp"])
 
     log("[INFO] Finding closest production timestamps for taster events ...")
-    taster["Production_Time"] = taster["Timestamp"].apply(
-        lambda t: production.iloc[(production["Timestamp"] - t).abs().idxmin()]["Timestamp"]
-    )
+    positions, distances = nearest_indices(taster["Timestamp"], production["Timestamp"], tolerance=MAX_PRODUCTION_DISTANCE)
+    taster["Production_Time"] = production["Timestamp"].to_numpy()[positions]
+    taster.loc[positions < 0, "Production_Time"] = pd.NaT
+    log(f"[INFO] Distance to production: median {pd.Series(distances).median()}, max {pd.Series(distances).max()}, "
+        f"unmatched: {(positions < 0).sum()}")
+    taster = taster[taster["Production_Time"].notna()]
 
     log("[INFO] Merging axis data ...")
-    taster = pd.merge_asof(
-        taster.sort_values('Production_Time'),
-        axis[['Timestamp', 'Neue Achseneinstellung']].sort_values('Timestamp'),
-        left_on='Production_Time',
-        right_on='Timestamp',
-        direction='nearest'
-    )
+    taster = merge_nearest(taster, axis[['Timestamp', 'Neue Achseneinstellung']], 'Production_Time')
 
     log("[INFO] Merging energy data ...")
-    taster = pd.merge_asof(
-        taster.sort_values('Production_Time'),
-        energy[['Timestamp', 'Power (W)', 'Current (A)', 'Voltage (V)']].sort_values('Timestamp'),
-        left_on='Production_Time',
-        right_on='Timestamp',
-        direction='nearest'
-    )
+    taster = merge_nearest(taster, energy[['Timestamp', 'Power (W)', 'Current (A)', 'Voltage (V)']], 'Production_Time')
 
     log("[INFO] Creating final DataFrame ...")
     columns = [
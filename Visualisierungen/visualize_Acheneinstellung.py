@@ -9,7 +9,7 @@ sys.path.append(db_path)
 from get_data_from_Database import read_from_database
 
 def main():
-    query = "SELECT * FROM \"Achse\" WHERE \"Timestamp\"::timestamp BETWEEN '2024-11-04' AND '2026-11-12' ORDER BY \"Timestamp\";"
+    query = "SELECT * FROM \"Achse\" WHERE \"Timestamp\" BETWEEN '2024-11-04' AND '2026-11-12' ORDER BY \"Timestamp\";"
 
     try:
         result = read_from_database(query)
@@ -7,27 +7,27 @@ import numpy as np
 # Add the relative path to the Database folder
 db_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Database'))
 sys.path.append(db_path)
-from get_data_from_Database import read_from_database
+from query_builder import read_time_range
+from downsample import read_downsampled
 
 def main():
     start_time = "2025-01-19 20:00:00"
     end_time = "2025-01-19 23:15:00"
 
-    query = f"SELECT * FROM \"Temperatur Lang V2\" WHERE \"Timestamp\" BETWEEN '{start_time}' AND '{end_time}' ORDER BY \"Timestamp\";"
-    query_keyence = f"SELECT DISTINCT * FROM \"Keyence\" WHERE \"Timestamp\"::timestamp BETWEEN '{start_time}' AND '{end_time}' ORDER BY \"Timestamp\";"
+    measurement_columns = [
+        'Measurement ToolID.200', 'Measurement ToolID.202', 'Measurement ToolID.203',
+        'Measurement ToolID.204', 'Measurement ToolID.205', 'Measurement ToolID.206',
+        'Measurement ToolID.208', 'Measurement ToolID.209'
+    ]
 
     try:
-        # Load Keyence data
-        df_keyence = read_from_database(query_keyence)
-        df_keyence["Timestamp Prod"] = pd.to_datetime(df_keyence["Timestamp"])
-        columns_keyence = [
-            'Timestamp Prod', 'Measurement ToolID.200', 'Measurement ToolID.202', 'Measurement ToolID.203',
-            'Measurement ToolID.204', 'Measurement ToolID.205', 'Measurement ToolID.206',
-            'Measurement ToolID.208', 'Measurement ToolID.209'
-        ]
-        df_selected_keyence = df_keyence[columns_keyence].copy()
-        df_selected_keyence["Timestamp"] = pd.to_datetime(df_selected_keyence["Timestamp Prod"])
-        df_selected_keyence = df_selected_keyence[df_selected_keyence["Measurement ToolID.206"] > 0]
+        # Load Keyence data (only measurement columns, ToolID.206 > 0 filtered in the database)
+        df_selected_keyence = read_time_range(
+            "Keyence", start_time, end_time, inclusive="both", distinct=True,
+            columns=measurement_columns,
+            filters=[("Measurement ToolID.206", ">", 0)]
+        )
+        df_selected_keyence["Timestamp Prod"] = df_selected_keyence["Timestamp"]
 
         # Tolerance boundaries
         # WARNING: THIS LIMITS ARE ANONYMISED
@@ -41,12 +41,6 @@ def main():
             "4": 0, "5": 0, "6": 0, "7": 0
         }
 
-        measurement_columns = [
-            'Measurement ToolID.200', 'Measurement ToolID.202', 'Measurement ToolID.203',
-            'Measurement ToolID.204', 'Measurement ToolID.205', 'Measurement ToolID.206',
-            'Measurement ToolID.208', 'Measurement ToolID.209'
-        ]
-
         middle_values = {col: (upper_bounds[str(i)] + lower_bounds[str(i)]) / 2
                          for i, col in enumerate(measurement_columns)}
 
@@ -80,13 +74,11 @@ def main():
                                             value_name="Signed Distance to Middle Value")
 
         # Load temperature data (optional)
-        df = read_from_database(query)
+        # Mean temperature per time bucket, aggregated in the database
         columns = ["Timestamp", "Temperature 1 [°C]", "Temperature 2 [°C]", "Temperature 3 [°C]"]
-        df_selected = df[columns].copy()
-        df_selected["Timestamp"] = pd.to_datetime(df_selected["Timestamp"])
-        for col in columns[1:]:
-            df_selected[col] = pd.to_numeric(df_selected[col], errors="coerce")
-        df_selected = df_selected.iloc[::1000, :]
+        df_selected = read_downsampled("Temperatur Lang V2", columns[1:], start_time, end_time,
+                                       target_points=2000, aggregates=("mean",))
+        df_selected = df_selected.rename(columns={f"{col} mean": col for col in columns[1:]})[columns]
         temperature_data_available = not df_selected.empty
 
         if temperature_data_available:
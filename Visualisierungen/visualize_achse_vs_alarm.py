@@ -1,4 +1,3 @@
-from sqlalchemy import create_engine
 import matplotlib.pyplot as plt
 import random
 import seaborn as sns
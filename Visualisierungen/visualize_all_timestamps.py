@@ -7,6 +7,7 @@ import os
 db_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Database'))
 sys.path.append(db_path)
 from get_data_from_Database import read_from_database
+from downsample import read_downsampled
 from load_data_into_Database import write_to_database
 
 # Define start date
@@ -15,14 +16,14 @@ start_date = "2024-11-01"
 # Queries with WHERE clause to limit results to after the start date
 query_achse = f'SELECT * FROM "Achse" WHERE "Timestamp" > \'{start_date}\' ORDER BY "Timestamp";'
 query_alarm = f'SELECT * FROM "Alarm" WHERE "Timestamp" > \'{start_date}\' ORDER BY "Timestamp";'
-query_energy = f'SELECT * FROM "Energy" WHERE "Timestamp" > \'{start_date}\' ORDER BY "Timestamp";'
 query_keyence = f'SELECT * FROM "Keyence" WHERE "Timestamp" > \'{start_date}\' ORDER BY "Timestamp";'
 query_stoer = f'SELECT * FROM "Stoergruende" WHERE "Timestamp" > \'{start_date}\' ORDER BY "Timestamp";'
 
 # Load data from database
 df_achse = read_from_database(query_achse)
 df_alarm = read_from_database(query_alarm)
-df_energy = read_from_database(query_energy)
+# Energy is reduced to time buckets in the database, only the bucket timestamps are plotted
+df_energy = read_downsampled('Energy', ['Power (W)'], start=start_date, target_points=2000, aggregates=('last',))
 df_key = read_from_database(query_keyence)
 df_stoer = read_from_database(query_stoer)
 
@@ -33,12 +34,8 @@ df_energy['Source'] = 'Energy'
 df_key['Source'] = 'Keyence'
 df_stoer['Source'] = 'Stoergruende'
 
-# Mark every 10000th timestamp in Energy data
-df_energy['Marked'] = False
-df_energy.loc[df_energy.index % 10000 == 0, 'Marked'] = True
-
-# Filter marked timestamps only
-marked_timestamps = df_energy[df_energy['Marked'] == True]
+# One timestamp per Energy bucket
+marked_timestamps = df_energy
 
 # Combine all data into a single DataFrame
 df_combined = pd.concat([df_achse, df_alarm, marked_timestamps, df_key, df_stoer], ignore_index=True)
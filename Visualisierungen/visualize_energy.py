@@ -6,44 +6,40 @@ import os
 # Add the relative path to the Database folder
 db_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Database'))
 sys.path.append(db_path)
-from get_data_from_Database import read_from_database
+from downsample import read_downsampled
 
-# SQL query for Energy data within a specific date range
-query = "SELECT * FROM \"Energy\" WHERE \"Timestamp\" BETWEEN '2024-11-05' AND '2024-11-07';"
-df = read_from_database(query)
+# Energy data within a specific date range, aggregated in the database to about 2000 time buckets
+# (min/max per bucket keep short peaks that stride sampling would drop)
+columns = ['Power (W)', 'Current (A)', 'Voltage (V)']
+df_filtered = read_downsampled('Energy', columns, '2024-11-05', '2024-11-07', target_points=2000,
+                               aggregates=('min', 'max', 'mean'))
 
-if df is not None:
-    print(df.head())  # Show the first few rows of the DataFrame
-
-# Convert the 'Timestamp' column to datetime
-df['Timestamp'] = pd.to_datetime(df['Timestamp'])
-
-# Sort by timestamp
-df = df.sort_values(by='Timestamp')
-
-# Select every 1000th row to reduce data volume for plotting
-df_filtered = df.iloc[::1000]
+if df_filtered is not None:
+    print(df_filtered.head())  # Show the first few rows of the DataFrame
 
 # Plotting
 plt.figure(figsize=(10, 6))
 
 # Power plot
 plt.subplot(3, 1, 1)
-plt.plot(df_filtered['Timestamp'], df_filtered['power (W)'], label='Power (W)', color='tab:blue')
+plt.fill_between(df_filtered['Timestamp'], df_filtered['Power (W) min'], df_filtered['Power (W) max'], color='tab:blue', alpha=0.3)
+plt.plot(df_filtered['Timestamp'], df_filtered['Power (W) mean'], label='Power (W)', color='tab:blue')
 plt.title('Power over Time')
 plt.xlabel('Timestamp')
 plt.ylabel('Power (W)')
 
 # Current plot
 plt.subplot(3, 1, 2)
-plt.plot(df_filtered['Timestamp'], df_filtered['current (A)'], label='Current (A)', color='tab:green')
+plt.fill_between(df_filtered['Timestamp'], df_filtered['Current (A) min'], df_filtered['Current (A) max'], color='tab:green', alpha=0.3)
+plt.plot(df_filtered['Timestamp'], df_filtered['Current (A) mean'], label='Current (A)', color='tab:green')
 plt.title('Current over Time')
 plt.xlabel('Timestamp')
 plt.ylabel('Current (A)')
 
 # Voltage plot
 plt.subplot(3, 1, 3)
-plt.plot(df_filtered['Timestamp'], df_filtered['voltage (V)'], label='Voltage (V)', color='tab:red')
+plt.fill_between(df_filtered['Timestamp'], df_filtered['Voltage (V) min'], df_filtered['Voltage (V) max'], color='tab:red', alpha=0.3)
+plt.plot(df_filtered['Timestamp'], df_filtered['Voltage (V) mean'], label='Voltage (V)', color='tab:red')
 plt.title('Voltage over Time')
 plt.xlabel('Timestamp')
 plt.ylabel('Voltage (V)')